@@ -0,0 +1,427 @@
+import argparse
+import contextlib
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+from html_markdown_gui_3 import (
+    CONVERTERS,
+    EXPANSION_MODES,
+    FETCH_MODES,
+    LOAD_PROFILES,
+    ConsoleOutput,
+    ProcessingCancelled,
+    WarmBrowser,
+    browser_rss,
+    check_modes,
+    collect_links,
+    convert_loaded_page,
+    driver_alive,
+    kill_browser,
+    load_page,
+    page_time_bound,
+)
+import metrics
+from output_store import OutputStore
+from page_cache import PageCache
+from selector_profiles import SelectorProfiles
+from static_fetch import convert_static
+
+def read_url_list(path):
+    """Liest eine URL-Liste (eine URL pro Zeile, '#' leitet Kommentare ein)."""
+    urls = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(line)
+    return urls
+
+
+def url_to_filename(url):
+    """
+    Erzeugt aus einer URL einen sprechenden, dateisystemtauglichen Dateinamen.
+    Ein kurzer Hash der vollständigen URL hält Namen eindeutig, die nach dem
+    Ersetzen der Sonderzeichen oder dem Kürzen gleich aussehen würden.
+    """
+    parsed = urlparse(url)
+    name = f"{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        name += f"_{parsed.query}"
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_.')
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return f"{name[:150] or 'seite'}_{digest}.md"
+
+
+# Reserve der Zeitgrenze pro Seite für Extraktion, Umwandlung und Verweise
+PAGE_DEADLINE_MARGIN = 60
+
+
+def default_page_deadline(expansion="batch"):
+    """Harte Zeitgrenze pro Seite: Obergrenze der Browserphasen (page_time_bound) plus Reserve."""
+    return page_time_bound(expansion) + PAGE_DEADLINE_MARGIN
+
+
+def warn_without_psutil():
+    """Weist beim Start darauf hin, dass ohne psutil Speicherobergrenze und Prozessabbruch eingeschränkt sind."""
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        print("Warnung: psutil ist nicht installiert. Die Speicherobergrenze der Browser ist deaktiviert, "
+              "und beim Überschreiten der Zeitgrenze wird nur chromedriver beendet (Chrome-Prozesse können "
+              "zurückbleiben). Abhilfe: pip install psutil")
+        return False
+    return True
+
+
+class PageDeadlineExceeded(Exception):
+    """Eine Seite hat ihre harte Zeitgrenze überschritten; der Browser wurde beendet."""
+
+
+class WorkerBrowser(WarmBrowser):
+    """
+    Hält den headless Browser eines Worker-Threads. Er wird erst gestartet,
+    wenn eine Seite ihn braucht, zwischen zwei Seiten zurückgesetzt und nach
+    einem Absturz automatisch ersetzt.
+    Für lange Läufe überwacht run() den Browser: Nach max_pages Seiten oder
+    wenn seine Prozesse zusammen mehr als max_rss_mb belegen, wird er neu
+    gestartet. Jede Seite hat page_deadline Sekunden; danach wird der Browser
+    hart beendet und die Seite nach einer Wartezeit bis zu retries Mal mit
+    einem frischen Browser wiederholt, ebenso nach WebDriver-Fehlern oder einem
+    abgestürzten Browser. Fehler der Seite selbst (kein Inhalt, HTTP-Fehler)
+    werden nicht wiederholt. Ohne Angabe richtet sich die Zeitgrenze
+    nach den Phasen-Obergrenzen des Aufklappmodus expansion.
+    """
+
+    def __init__(self, load_profile="full", blocked_urls=(), max_pages=100, max_rss_mb=2048, page_deadline=None,
+                 retries=1, backoff=5, expansion="batch"):
+        super().__init__(headless=True, load_profile=load_profile, blocked_urls=blocked_urls)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.page_deadline = default_page_deadline(expansion) if page_deadline is None else page_deadline
+        self.retries = retries
+        self.backoff = backoff
+        self._pages = 0
+        self._counted_driver = None
+
+    def _recycle_reason(self):
+        if self.driver is None or self.driver is not self._counted_driver:
+            return None
+        if self.max_pages and self._pages >= self.max_pages:
+            return f"nach {self._pages} Seiten"
+        if self.max_rss_mb:
+            rss = browser_rss(self.driver)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                return f"Speicherbedarf {rss / (1024 * 1024):.0f} MB"
+        return None
+
+    def _acquire(self, output):
+        reason = self._recycle_reason()
+        if reason:
+            output.insert(None, f"Browser wird neu gestartet ({reason}).\n")
+            metrics.count("browser_recycles")
+            self.quit()
+        driver = self.get()
+        if driver is not self._counted_driver:
+            self._counted_driver = driver
+            self._pages = 0
+        self._pages += 1
+        return driver
+
+    def run(self, url, work, output):
+        """Führt work(driver) für url unter Aufsicht aus und gibt dessen Ergebnis zurück."""
+        from selenium.common.exceptions import WebDriverException
+
+        for attempt in range(self.retries + 1):
+            driver = self._acquire(output)
+            expired = threading.Event()
+
+            def on_deadline():
+                expired.set()
+                kill_browser(driver)
+
+            timer = threading.Timer(self.page_deadline, on_deadline) if self.page_deadline else None
+            if timer is not None:
+                timer.daemon = True
+                timer.start()
+            try:
+                return work(driver)
+            except ProcessingCancelled:
+                raise
+            except Exception as e:
+                error = e
+                if expired.is_set():
+                    metrics.count("deadline_kills")
+                    error = PageDeadlineExceeded(f"Zeitgrenze von {self.page_deadline} s überschritten: {url}")
+                elif not isinstance(e, WebDriverException) and driver_alive(driver):
+                    raise  # Ein frischer Browser würde am selben Fehler scheitern
+                if attempt >= self.retries:
+                    raise error from e
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            delay = self.backoff * (attempt + 1)
+            output.insert(None, f"Seite fehlgeschlagen ({error}), neuer Versuch in {delay} s "
+                                f"mit frischem Browser...\n")
+            metrics.count("page_retries")
+            self.quit()
+            time.sleep(delay)
+
+
+def convert_url(url, output, browser, fetch_mode="auto", cache=None, links=None, expansion="batch",
+                converter="dom", profiles=None):
+    """
+    Konvertiert eine URL über den gewählten Abrufweg.
+    Gibt (Titel, MarkdownDocument, statisch) zurück; statisch ist True, wenn kein
+    Browser benötigt wurde. Ist links eine Liste, werden die absoluten Ziele
+    aller Verweise der Seite angehängt. expansion wählt, wie der Browser
+    eingeklappte Inhalte öffnet (siehe EXPANSION_MODES), converter, wie daraus
+    Markdown wird (siehe CONVERTERS).
+    """
+    check_modes(fetch_mode=fetch_mode)
+    if fetch_mode != "browser":
+        # HTTP-Fehler, Zeitüberschreitungen und Nicht-HTML-Inhalte sind Fehler der Seite;
+        # der Browser wird nur für leere Ergebnisse und JS-Hüllen gestartet.
+        result = convert_static(url, output, cache=cache, links=links, converter=converter, profiles=profiles)
+        if result is not None:
+            return result[0], result[1], True
+        if fetch_mode == "static":
+            raise Exception("Statisches Ergebnis ist leer oder eine JS-Hülle.")
+        if links is not None:
+            del links[:]  # Verweise der JS-Hülle verwerfen, der Browser liefert die echten
+
+    def work(driver):
+        load_page(driver, url, output)
+        page = convert_loaded_page(driver, output, cache=cache, url=url, expansion=expansion, converter=converter,
+                                   profiles=profiles)
+        return page, collect_links(driver) if links is not None else None
+
+    (title, document), page_links = browser.run(url, work, output)
+    if links is not None:
+        links.extend(page_links)
+    return title, document, False
+
+
+def add_conversion_arguments(parser):
+    """CLI-Optionen für Abrufweg, Ladeprofil, Aufklappmodus, Konverter und Ablage der Seiten."""
+    parser.add_argument("-m", "--fetch-mode", choices=FETCH_MODES, default="auto",
+                        help="auto: statisch mit Browser-Fallback, static: nur HTTP, browser: nur Selenium")
+    parser.add_argument("-p", "--load-profile", choices=LOAD_PROFILES, default="full",
+                        help="Vom Browser blockierte Ressourcen: full (nichts), text+css, text-only")
+    parser.add_argument("-x", "--expansion", choices=EXPANSION_MODES, default="batch",
+                        help="batch: eingeklappte Inhalte per Skript stapelweise öffnen, click: Elemente einzeln klicken")
+    parser.add_argument("-c", "--converter", choices=CONVERTERS, default="dom",
+                        help="dom: Markdown aus dem HTML-Baum, text: Textextraktion mit Heuristiken")
+    parser.add_argument("--block", action="append", default=[], metavar="MUSTER",
+                        help="Zusätzlich blockiertes URL-Muster, z.B. '*ads.example.com*' (mehrfach möglich)")
+    parser.add_argument("--store", metavar="DATEI",
+                        help="Alle Seiten in diese SQLite-Datenbank schreiben statt einzelner .md-Dateien")
+    parser.add_argument("--selector-profiles", metavar="DATEI",
+                        help="JSON-Datei, in der pro Domain die bewährten Selektoren gelernt werden")
+
+
+def add_browser_arguments(parser):
+    """CLI-Optionen für die Überwachung der Worker-Browser (siehe WorkerBrowser)."""
+    parser.add_argument("--recycle-after", type=int, default=100, metavar="N",
+                        help="Browser nach N Seiten neu starten (0 = nie)")
+    parser.add_argument("--max-browser-mb", type=int, default=2048, metavar="MB",
+                        help="Browser neu starten, wenn seine Prozesse mehr Speicher belegen (0 = unbegrenzt)")
+    parser.add_argument("--page-deadline", type=float, metavar="SEK",
+                        help="Harte Zeitgrenze pro Seite im Browser (0 = keine; Standard: aus den Zeitlimits "
+                             "der Lade- und Aufklapp-Phasen abgeleitet)")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Wiederholungen einer hängenden oder abgestürzten Browser-Seite")
+
+
+def worker_browser_options(args):
+    """Optionen für WorkerBrowser aus den CLI-Argumenten von add_browser_arguments."""
+    return {"max_pages": args.recycle_after, "max_rss_mb": args.max_browser_mb,
+            "page_deadline": args.page_deadline, "retries": args.retries}
+
+
+def run_batch(urls, output_dir, workers=4, verbose=False, fetch_mode="auto", cache=None,
+              collector=None, profile_path=None, load_profile="full", blocked_urls=(), expansion="batch",
+              converter="dom", store=None, browser_options=None, profiles=None):
+    """
+    Konvertiert alle URLs ohne Dialoge nach output_dir (oder in store). Jeder
+    Worker-Thread holt Seiten aus einer gemeinsamen Warteschlange und verwendet
+    dafür höchstens einen headless WorkerBrowser (Optionen: browser_options).
+    Die übrigen Parameter entsprechen convert_url und den CLI-Optionen.
+    Gibt ein Dictionary mit Ergebnissen und Durchsatz zurück.
+    """
+    check_modes(fetch_mode=fetch_mode, load_profile=load_profile, expansion=expansion, converter=converter)
+    if store is None:
+        os.makedirs(output_dir, exist_ok=True)
+    if fetch_mode != "static":
+        warn_without_psutil()
+    url_queue = queue.Queue()
+    for url in urls:
+        url_queue.put(url)
+
+    results_lock = threading.Lock()
+    succeeded = []
+    failed = []
+    static_pages = []
+    profile_pending = [profile_path]
+
+    def claim_profile():
+        with results_lock:
+            path, profile_pending[0] = profile_pending[0], None
+            return path
+
+    def worker(worker_id):
+        output = ConsoleOutput(prefix=f"[W{worker_id}] ", verbose=verbose)
+        log = ConsoleOutput(prefix=f"[W{worker_id}] ")
+        browser = WorkerBrowser(load_profile, blocked_urls, expansion=expansion, **(browser_options or {}))
+        try:
+            while True:
+                try:
+                    url = url_queue.get_nowait()
+                except queue.Empty:
+                    break
+                profile = claim_profile()
+                page_metrics = None
+                try:
+                    with metrics.page_metrics(url) as page_metrics, \
+                            (metrics.profiled(profile) if profile else contextlib.nullcontext()):
+                        title, document, static = convert_url(url, output, browser, fetch_mode, cache,
+                                                              expansion=expansion, converter=converter,
+                                                              profiles=profiles)
+                        if store is not None:
+                            save_path = store.path
+                            with metrics.span("write"):
+                                markdown_text = document.text()
+                                store.store(url, title, markdown_text)
+                            metrics.count("bytes_written", len(markdown_text.encode("utf-8")))
+                        else:
+                            save_path = os.path.join(output_dir, url_to_filename(url))
+                            with metrics.span("write"):
+                                metrics.count("bytes_written", document.write(save_path))
+                    with results_lock:
+                        succeeded.append((url, save_path))
+                        if static:
+                            static_pages.append(url)
+                    log.insert(None, f"OK   {url} -> {save_path}\n")
+                except Exception as e:
+                    with results_lock:
+                        failed.append((url, str(e)))
+                    log.insert(None, f"FEHLER {url}: {e}\n")
+                finally:
+                    if collector is not None and page_metrics is not None:
+                        collector.add(page_metrics)
+        finally:
+            browser.quit()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i + 1,), daemon=True)
+               for i in range(max(1, min(workers, len(urls))))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if cache is not None:
+        cache.save()
+    if store is not None:
+        store.flush()
+    if profiles is not None:
+        profiles.save()
+
+    # Bricht ein Worker außerhalb der Fehlerbehandlung pro Seite ab, bleiben URLs liegen
+    while not url_queue.empty():
+        failed.append((url_queue.get_nowait(), "Nicht verarbeitet"))
+
+    pages_per_minute = len(succeeded) / elapsed * 60 if elapsed > 0 else 0.0
+    return {
+        "succeeded": succeeded,
+        "failed": failed,
+        "elapsed": elapsed,
+        "pages_per_minute": pages_per_minute,
+        "workers": len(threads),
+        "static_pages": len(static_pages),
+        "cache": cache.stats() if cache is not None else None,
+        "store": store.stats() if store is not None else None,
+        "profiles": profiles.stats() if profiles is not None else None,
+    }
+
+
+def print_summary(summary):
+    """Gibt die Durchsatz-Zusammenfassung eines Batch-Laufs aus."""
+    total = len(summary["succeeded"]) + len(summary["failed"])
+    print("\n=== Zusammenfassung ===")
+    print(f"Seiten gesamt:    {total}")
+    print(f"Erfolgreich:      {len(summary['succeeded'])}")
+    print(f"Fehlgeschlagen:   {len(summary['failed'])}")
+    print(f"Ohne Browser:     {summary['static_pages']}")
+    print(f"Worker:           {summary['workers']}")
+    print(f"Laufzeit:         {summary['elapsed']:.1f} s")
+    print(f"Durchsatz:        {summary['pages_per_minute']:.1f} Seiten/Minute")
+    if summary.get("cache"):
+        stats = summary["cache"]
+        print(f"Cache:            {stats['hits']} Treffer, {stats['misses']} Fehltreffer, "
+              f"{stats['bytes_saved'] / 1024:.0f} KiB eingespart, {stats['evictions']} verdrängt")
+    if summary.get("store"):
+        stats = summary["store"]
+        print(f"Datenbank:        {stats['pages']} Seiten, {stats['documents']} Dokumente, "
+              f"{stats['file_bytes'] / 1024:.0f} KiB")
+    if summary.get("profiles"):
+        print_profile_stats(summary["profiles"])
+    for url, reason in summary["failed"]:
+        print(f"  - {url}: {reason}")
+
+
+def print_profile_stats(stats):
+    print(f"Selektorprofile:  {stats['profiled_pages']} Seiten mit gelernten Selektoren, "
+          f"{stats['learned_pages']} zum Lernen, {stats['verified_pages']} zur Prüfung, "
+          f"{stats['relearned']} neu gelernt, {stats['domains']} Domains")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Konvertiert viele URLs parallel und ohne Dialoge in Markdown-Dateien."
+    )
+    parser.add_argument("url_list", help="Datei mit einer URL pro Zeile")
+    parser.add_argument("-o", "--output-dir", default="markdown_output", help="Zielverzeichnis für die .md-Dateien")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Anzahl paralleler Browser")
+    add_conversion_arguments(parser)
+    add_browser_arguments(parser)
+    parser.add_argument("--cache-dir", help="Verzeichnis des Seiten-Caches für inkrementelle Läufe")
+    parser.add_argument("--cache-max-mb", type=int, default=256, help="Maximale Größe des Caches in MB")
+    parser.add_argument("--metrics", help="JSON-Zeilen-Datei für Zeiten und Zähler jeder Seite")
+    parser.add_argument("--prometheus", help="Datei für aggregierte Metriken im Prometheus-Textformat")
+    parser.add_argument("--profile", help="Erste Seite mit cProfile profilieren und Statistik hierhin schreiben")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Detaillierte Statusmeldungen ausgeben")
+    args = parser.parse_args(argv)
+
+    urls = read_url_list(args.url_list)
+    if not urls:
+        print("Keine URLs in der Liste gefunden.")
+        return 1
+    cache = PageCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+    collector = metrics.MetricsCollector(args.metrics) if (args.metrics or args.prometheus) else None
+    store = OutputStore(args.store) if args.store else None
+    profiles = SelectorProfiles(args.selector_profiles) if args.selector_profiles else None
+    try:
+        summary = run_batch(urls, args.output_dir, workers=args.workers, verbose=args.verbose,
+                            fetch_mode=args.fetch_mode, cache=cache, collector=collector,
+                            profile_path=args.profile, load_profile=args.load_profile,
+                            blocked_urls=args.block, expansion=args.expansion,
+                            converter=args.converter, store=store, browser_options=worker_browser_options(args),
+                            profiles=profiles)
+    finally:
+        if collector is not None:
+            collector.close()
+        if store is not None:
+            store.close()
+    if collector is not None and args.prometheus:
+        collector.write_prometheus(args.prometheus)
+    print_summary(summary)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""
+Misst die Kosten der Spracherkennung pro Code-Block auf mehreren Megabyte Eingabe.
+Aufruf aus dem Projektverzeichnis: python benchmarks/bench_language_detection.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_markdown_gui_3 as app  # noqa: E402
+
+SNIPPETS = [
+    "import os\nimport sys\n\ndef main(args):\n    if not args:\n        return None\n    print(args)\n",
+    "import React from 'react';\nexport default function App() {\n  const x = 1;\n  console.log(x);\n}\n",
+    "SELECT id, name FROM users WHERE active = 1;\nINSERT INTO log VALUES (1);\n",
+    "version: '3.8'\nservices:\n  db:\n    image: postgres:15\n    restart: always\n",
+    "#include <iostream>\nint main() {\n  std::cout << \"hi\";\n}\n",
+    "public class Main {\n  @Override\n  public void run() { System.out.println(1); }\n}\n",
+    ".header {\n  margin: 0;\n  padding: 4px;\n}\n@media (max-width: 600px) {}\n",
+    "<!DOCTYPE html>\n<html><head></head><body><div>x</div></body></html>\n",
+]
+
+
+def make_blocks(total_bytes, unique_ratio=0.5, seed=42):
+    """Erzeugt Code-Blöcke mit insgesamt etwa total_bytes Zeichen."""
+    rng = random.Random(seed)
+    blocks = []
+    size = 0
+    while size < total_bytes:
+        base = rng.choice(SNIPPETS) * rng.randint(1, 40)
+        if rng.random() < unique_ratio:
+            base += f"\n# variante {len(blocks)}\n"
+        blocks.append(base)
+        size += len(base)
+    return blocks
+
+
+def run(total_mb=4):
+    blocks = make_blocks(total_mb * 1024 * 1024)
+    app._language_cache.clear()
+
+    start = time.perf_counter()
+    app.detect_languages(blocks)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    app.detect_languages(blocks)
+    warm = time.perf_counter() - start
+
+    # Bewertet wird jeder verschiedene Block höchstens bis LANGUAGE_SCAN_LIMIT
+    scanned_mb = sum(min(len(block), app.LANGUAGE_SCAN_LIMIT) for block in set(blocks)) / (1024 * 1024)
+    return {
+        "blocks": len(blocks),
+        "megabytes": total_mb,
+        "scanned_megabytes": scanned_mb,
+        "cold_us_per_block": cold / len(blocks) * 1e6,
+        "warm_us_per_block": warm / len(blocks) * 1e6,
+        "cold_scanned_mb_per_s": scanned_mb / cold if cold else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    for mb in (1, 4, 16):
+        r = run(mb)
+        print(f"{r['megabytes']:>3} MB, {r['blocks']:>6} Blöcke: "
+              f"{r['cold_us_per_block']:8.1f} µs/Block (kalt), "
+              f"{r['warm_us_per_block']:6.1f} µs/Block (Cache), "
+              f"{r['cold_scanned_mb_per_s']:6.1f} MB/s gelesen")
@@ -0,0 +1,142 @@
+"""
+Fixture-Seiten für die Benchmarks. Die Seiten werden deterministisch erzeugt,
+damit Messungen verschiedener Versionen dieselben Eingaben verwenden.
+"""
+import json
+import os
+import random
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>.hidden {{ display: none; }} .panel {{ padding: 4px; }}</style>
+</head>
+<body>
+<nav><a href="/">Start</a> <a href="/small.html">Klein</a></nav>
+<main>
+{body}
+</main>
+{script}
+</body>
+</html>
+"""
+
+WORDS = ("Server Container Proxmox Ansible Docker Compose Netzwerk Volume Backup Dienst "
+         "Konfiguration Umgebung Zugriff Rolle Datenbank Zertifikat Proxy Cluster Knoten").split()
+
+CODE_SAMPLES = [
+    ("python", "import os\nimport sys\n\ndef main(argv):\n    for arg in argv:\n        print(arg)\n    return 0\n"),
+    ("yaml", "version: '3.8'\nservices:\n  web:\n    image: nginx:latest\n    restart: always\n    ports:\n      - 80:80\n"),
+    ("javascript", "import express from 'express';\nconst app = express();\napp.get('/', (req, res) => res.send('ok'));\n"),
+    ("sql", "CREATE TABLE users (id INT PRIMARY KEY, name TEXT);\nSELECT name FROM users WHERE id = 1;\n"),
+    ("bash", "sudo apt-get update\nsudo apt-get install -y docker.io\nsystemctl enable --now docker\n"),
+]
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def small_page(rng):
+    body = "<h1>KURZANLEITUNG</h1>\n" + "\n".join(f"<p>{_sentence(rng)}</p>" for _ in range(5))
+    return PAGE_TEMPLATE.format(title="Kleine Seite", body=body, script="")
+
+
+def huge_page(rng, sections=2000, paragraphs_per_section=9):
+    parts = []
+    for i in range(sections):
+        parts.append(f"<h2>ABSCHNITT {i + 1}:</h2>" if i % 3 else f"<p>ABSCHNITT{chr(65 + i % 26)}</p>")
+        parts.extend(f"<p>{_sentence(rng, 16)}</p>" for _ in range(paragraphs_per_section))
+    return PAGE_TEMPLATE.format(title="Sehr große Seite", body="\n".join(parts), script="")
+
+
+def code_heavy_page(rng, blocks=300):
+    parts = []
+    for i in range(blocks):
+        lang, code = CODE_SAMPLES[i % len(CODE_SAMPLES)]
+        parts.append(f"<p>{_sentence(rng)}</p>")
+        parts.append("<p>Click to open code</p>")
+        # Typisches Syntax-Highlighting: mehrere Code-Selektoren treffen dasselbe Element
+        parts.append(f'<pre><code class="language-{lang} hljs">{_escape(code)}# Beispiel {i}\n</code></pre>')
+        parts.append(f"<p>Inline: <code>{lang}-{i}</code></p>")
+    return PAGE_TEMPLATE.format(title="Code-lastige Seite", body="\n".join(parts), script="")
+
+
+def accordion_page(rng, panels=60):
+    parts = []
+    for i in range(panels):
+        if i % 2:
+            parts.append(f"<details><summary>Details {i}</summary><p>{_sentence(rng, 20)}</p></details>")
+        else:
+            parts.append(
+                f'<div class="accordion"><button class="accordion-button" aria-expanded="false" '
+                f'data-target="panel-{i}">Abschnitt {i}</button>'
+                f'<div id="panel-{i}" class="panel hidden"><p>{_sentence(rng, 20)}</p></div></div>'
+            )
+    script = """<script>
+document.querySelectorAll('.accordion-button').forEach(function (button) {
+    button.addEventListener('click', function () {
+        var panel = document.getElementById(button.dataset.target);
+        setTimeout(function () {
+            panel.classList.toggle('hidden');
+            button.setAttribute('aria-expanded', panel.classList.contains('hidden') ? 'false' : 'true');
+        }, 50);
+    });
+});
+</script>"""
+    return PAGE_TEMPLATE.format(title="Akkordeon-Seite", body="\n".join(parts), script=script)
+
+
+def infinite_scroll_page(rng, batches=8, items_per_batch=25):
+    items = [_sentence(rng, 14) for _ in range(batches * items_per_batch)]
+    initial = "\n".join(f"<p>{text}</p>" for text in items[:items_per_batch])
+    script = """<script>
+var remaining = %s, perBatch = %d, loading = false;
+window.addEventListener('scroll', function () {
+    if (loading || !remaining.length) { return; }
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) { return; }
+    loading = true;
+    setTimeout(function () {
+        var main = document.querySelector('main');
+        remaining.splice(0, perBatch).forEach(function (text) {
+            var p = document.createElement('p');
+            p.textContent = text;
+            main.appendChild(p);
+        });
+        loading = false;
+    }, 100);
+});
+</script>""" % (json.dumps(items[items_per_batch:]), items_per_batch)
+    return PAGE_TEMPLATE.format(title="Endlos-Scroll-Seite", body=initial, script=script)
+
+
+FIXTURES = {
+    "small": small_page,
+    "huge": huge_page,
+    "code_heavy": code_heavy_page,
+    "accordion": accordion_page,
+    "infinite_scroll": infinite_scroll_page,
+}
+
+
+def build_fixture(name, seed=1234):
+    """Erzeugt das HTML einer Fixture-Seite."""
+    return FIXTURES[name](random.Random(seed))
+
+
+def write_fixtures(directory, seed=1234):
+    """Schreibt alle Fixture-Seiten als <name>.html in directory und gibt die Pfade zurück."""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name in FIXTURES:
+        path = os.path.join(directory, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build_fixture(name, seed))
+        paths[name] = path
+    return paths
@@ -0,0 +1,222 @@
+"""
+Offline-Benchmark-Suite: misst detect_language, identify_sections,
+create_markdown_document und die beiden Konverter (Text und DOM) einzeln
+sowie die vollständige Konvertierung der Fixture-Seiten über einen lokalen
+HTTP-Server (statisch und mit headless Chrome).
+Die Ergebnisse werden als JSON geschrieben; mit --compare wird gegen einen
+früheren Lauf verglichen und bei Durchsatzverlusten mit Exit-Code 1 beendet.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/run_benchmarks.py -o bench_results.json
+    python benchmarks/run_benchmarks.py --compare bench_results.json --skip-browser
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import dom_markdown  # noqa: E402
+import html_markdown_gui_3 as app  # noqa: E402
+import static_fetch  # noqa: E402
+from fixtures import FIXTURES, build_fixture, write_fixtures  # noqa: E402
+
+
+def best_time(func, repeat=5):
+    """Kürzeste Laufzeit aus repeat Wiederholungen in Sekunden."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def micro_benchmarks(repeat):
+    """Misst die reinen Python-Verarbeitungsschritte auf den extrahierten Fixture-Inhalten."""
+    quiet = app.ConsoleOutput(verbose=False)
+    results = {}
+    for name in FIXTURES:
+        html = build_fixture(name)
+        title, content, code_blocks = static_fetch.extract_from_html(html, quiet)
+        sections = app.identify_sections(content)
+        line_count = content.count("\n") + 1
+        code_texts = [block["text"] for block in code_blocks]
+
+        def text_pipeline():
+            extracted_title, extracted_content, extracted_blocks = static_fetch.extract_from_html(html, quiet)
+            app.create_markdown_document(extracted_title, extracted_content, extracted_blocks,
+                                         app.identify_sections(extracted_content))
+
+        def dom_pipeline():
+            app._language_cache.clear()
+            dom_markdown.render_markdown_document(*dom_markdown.convert_html(html))
+
+        def detect_cold():
+            app._language_cache.clear()
+            for text in code_texts:
+                app.detect_language(text)
+
+        entry = {
+            "lines": line_count,
+            "sections": len(sections),
+            "code_blocks": len(code_blocks),
+            "identify_sections_s": best_time(functools.partial(app.identify_sections, content), repeat),
+            "create_markdown_document_s": best_time(
+                functools.partial(app.create_markdown_document, title, content, code_blocks, sections), repeat),
+            "text_pipeline_s": best_time(text_pipeline, repeat),
+            "dom_pipeline_s": best_time(dom_pipeline, repeat),
+        }
+        if code_texts:
+            entry["detect_language_s"] = best_time(detect_cold, repeat)
+            entry["detect_language_per_block_us"] = entry["detect_language_s"] / len(code_texts) * 1e6
+        entry["render_lines_per_sec"] = line_count / entry["create_markdown_document_s"]
+        results[name] = entry
+    return results
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory):
+    """Startet einen lokalen HTTP-Server für directory und gibt (Server, Basis-URL) zurück."""
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def end_to_end_benchmarks(base_url, skip_browser, load_profile="full"):
+    """Misst die vollständige Konvertierung jeder Fixture-Seite über HTTP."""
+    quiet = app.ConsoleOutput(verbose=False)
+    results = {}
+    for name in FIXTURES:
+        url = f"{base_url}/{name}.html"
+        entry = {}
+        start = time.perf_counter()
+        static_result = static_fetch.convert_static(url, quiet)
+        if static_result is not None:
+            static_result[1].text()  # Das Dokument wird erst hier erzeugt
+        entry["static_s"] = time.perf_counter() - start
+        entry["static_used"] = static_result is not None
+        results[name] = entry
+
+    if skip_browser:
+        return results
+    try:
+        start = time.perf_counter()
+        driver = app.get_secure_driver(headless=True, load_profile=load_profile)
+        startup = time.perf_counter() - start
+    except Exception as e:
+        for entry in results.values():
+            entry["browser_error"] = f"Browserstart fehlgeschlagen: {e}"
+        return results
+    try:
+        for name in FIXTURES:
+            url = f"{base_url}/{name}.html"
+            entry = results[name]
+            entry["driver_startup_s"] = startup
+            try:
+                start = time.perf_counter()
+                app.load_page(driver, url, quiet)
+                markdown_text = app.convert_loaded_page(driver, quiet)[1].text()
+                entry["browser_s"] = time.perf_counter() - start
+                entry["markdown_bytes"] = len(markdown_text.encode("utf-8"))
+            except Exception as e:
+                entry["browser_error"] = str(e)
+    finally:
+        driver.quit()
+    return results
+
+
+def compare(current, baseline, tolerance):
+    """
+    Liefert Meldungen für alle Messwerte, die um mehr als tolerance langsamer
+    geworden sind: Dauern (Schlüssel auf _s) dürfen nicht steigen, Durchsätze
+    (Schlüssel auf _per_sec) nicht sinken.
+    """
+    regressions = []
+    for group in ("micro", "end_to_end"):
+        for name, entry in current.get(group, {}).items():
+            old_entry = baseline.get(group, {}).get(name, {})
+            for key, value in entry.items():
+                old = old_entry.get(key)
+                if not isinstance(value, float) or not isinstance(old, float) or old <= 0:
+                    continue
+                if key.endswith("_per_sec"):
+                    change = (old - value) / old
+                    if change > tolerance:
+                        regressions.append(f"{group}/{name}/{key}: {old:.1f}/s -> {value:.1f}/s (-{change:.0%})")
+                elif key.endswith("_s"):
+                    change = (value - old) / old
+                    if change > tolerance:
+                        regressions.append(f"{group}/{name}/{key}: {old:.4f}s -> {value:.4f}s (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite des Markdown-Extraktors")
+    parser.add_argument("-o", "--output", default="bench_results.json", help="Zieldatei für die JSON-Ergebnisse")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Wiederholungen der Mikro-Benchmarks")
+    parser.add_argument("--skip-browser", action="store_true", help="Ende-zu-Ende-Messung ohne Chrome")
+    parser.add_argument("-p", "--load-profile", choices=app.LOAD_PROFILES, default="full",
+                        help="Ladeprofil des Browsers für die Ende-zu-Ende-Messung")
+    parser.add_argument("--compare", help="Früheres Ergebnis, gegen das verglichen wird")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte Verlangsamung (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    results = {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "load_profile": args.load_profile,
+        "micro": micro_benchmarks(args.repeat),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        write_fixtures(directory)
+        server, base_url = serve_directory(directory)
+        try:
+            results["end_to_end"] = end_to_end_benchmarks(base_url, args.skip_browser, args.load_profile)
+        finally:
+            server.shutdown()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nLeistungsverschlechterungen gegenüber", args.compare)
+            for line in regressions:
+                print("  -", line)
+            return 1
+        print("\nKeine Leistungsverschlechterung gegenüber", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,385 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from batch_runner import (
+    WorkerBrowser,
+    add_browser_arguments,
+    add_conversion_arguments,
+    convert_url,
+    print_profile_stats,
+    url_to_filename,
+    warn_without_psutil,
+    worker_browser_options,
+)
+from html_markdown_gui_3 import ConsoleOutput, check_modes
+from output_store import OutputStore
+from selector_profiles import SelectorProfiles
+
+STATE_FILE = "crawl_state.json"
+JOURNAL_FILE = "crawl_journal.jsonl"
+INDEX_FILE = "index.md"
+# Nach so vielen abgeschlossenen Seiten werden sie ins Journal geschrieben
+SAVE_INTERVAL = 25
+SKIPPED_EXTENSIONS = (
+    ".pdf", ".zip", ".gz", ".tar", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".css", ".js", ".json", ".xml", ".mp4", ".mp3", ".woff", ".woff2", ".exe", ".dmg",
+)
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def normalize_url(url):
+    """
+    Vereinheitlicht eine URL für die Duplikaterkennung: Schema und Host klein,
+    ohne Standard-Port, ohne Fragment, Tracking-Parameter entfernt und die
+    übrigen Query-Parameter sortiert.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and not ((scheme == "http" and parsed.port == 80) or (scheme == "https" and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path or "/"
+    query = sorted((key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                   if not key.lower().startswith(TRACKING_PARAMS))
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+def same_origin(url, origin):
+    """Prüft, ob eine (normalisierte) URL zu Schema und Host des Startpunkts gehört."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" == origin
+
+
+class HostPoliteness:
+    """
+    Begrenzt pro Host die Anzahl gleichzeitiger Abrufe und hält einen
+    Mindestabstand zwischen zwei Anfragen an denselben Host ein.
+    """
+
+    def __init__(self, max_concurrent=2, min_delay=0.5):
+        self.max_concurrent = max_concurrent
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def acquire(self, host):
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.Semaphore(self.max_concurrent))
+        slot.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_delay
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host):
+        self._slots[host].release()
+
+
+class Crawler:
+    """
+    Spiegelt eine Website ab einer Start-URL: Gleiche-Herkunft-Verweise werden
+    normalisiert, dedupliziert und bis max_depth/max_pages von mehreren Workern
+    abgearbeitet. Der Zustand (Warteschlange, bekannte und erledigte Seiten)
+    liegt in crawl_state.json, sodass ein abgebrochener Lauf fortgesetzt
+    werden kann, ohne fertige Seiten erneut abzurufen. Während des Laufs
+    werden nur die Änderungen an crawl_journal.jsonl angehängt; zu Beginn
+    und am Ende wird beides zu einem neuen crawl_state.json zusammengefasst.
+    Mit einem OutputStore landen die Seiten in dessen Datenbank statt als einzelne Dateien; mit
+    SelectorProfiles werden die bewährten Selektoren der Website gelernt.
+    """
+
+    def __init__(self, seed_url, output_dir, workers=4, max_depth=3, max_pages=1000,
+                 fetch_mode="auto", politeness=None, verbose=False, load_profile="full", blocked_urls=(),
+                 expansion="batch", converter="dom", store=None, browser_options=None, profiles=None):
+        check_modes(fetch_mode=fetch_mode, load_profile=load_profile, expansion=expansion, converter=converter)
+        self.seed_url = normalize_url(seed_url)
+        parsed = urlparse(self.seed_url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        self.output_dir = output_dir
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.fetch_mode = fetch_mode
+        self.politeness = politeness or HostPoliteness()
+        self.verbose = verbose
+        self.load_profile = load_profile
+        self.blocked_urls = tuple(blocked_urls)
+        self.expansion = expansion
+        self.converter = converter
+        self.store = store
+        self.browser_options = browser_options or {}
+        self.profiles = profiles
+
+        self._condition = threading.Condition()
+        self._frontier = deque()
+        self._seen = set()
+        self._in_flight = {}
+        self._done = {}
+        self._failed = {}
+        self._journal_pending = []
+        self._journal_lock = threading.Lock()
+        self._stopped = False
+
+    @property
+    def state_path(self):
+        return os.path.join(self.output_dir, STATE_FILE)
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.output_dir, JOURNAL_FILE)
+
+    def load_state(self):
+        """Lädt einen gespeicherten Zustand. Gibt False zurück, wenn keiner passt."""
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("seed") != self.seed_url:
+            return False
+        frontier = [(url, depth) for url, depth in state["frontier"]]
+        self._done = state["done"]
+        self._failed = state.get("failed", {})
+        for entry in self._read_journal():
+            if "record" in entry:
+                self._done[entry["url"]] = entry["record"]
+            else:
+                self._failed[entry["url"]] = entry["error"]
+            frontier.extend((url, depth) for url, depth in entry["queued"])
+        # Seiten, die beim Abbruch noch liefen, stehen weiter in der Warteschlange
+        self._frontier = deque((url, depth) for url, depth in frontier
+                               if url not in self._done and url not in self._failed)
+        self._seen = set(self._done) | set(self._failed) | {url for url, _ in frontier}
+        return True
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # Beim Abbruch nur halb geschriebene letzte Zeile
+        return entries
+
+    def _save_state_locked(self):
+        """Schreibt den vollständigen Zustand und leert das Journal (nur ohne laufende Worker)."""
+        # Laufende Seiten zurück in die Warteschlange, damit sie nach einem Abbruch erneut drankommen
+        frontier = list(self._in_flight.items()) + list(self._frontier)
+        state = {"seed": self.seed_url, "frontier": frontier, "done": self._done, "failed": self._failed}
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        with self._journal_lock:
+            self._journal_pending = []
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    def _append_journal(self, entries):
+        """Hängt abgeschlossene Seiten an das Journal an; läuft außerhalb der Frontier-Sperre."""
+        with self._journal_lock:
+            if self.store is not None:
+                self.store.flush()  # Erst speichern, dann als erledigt festhalten
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+
+    def _enqueue_locked(self, url, depth):
+        """Nimmt eine URL in die Warteschlange auf; gibt zurück, ob sie neu war."""
+        if depth > self.max_depth or url in self._seen:
+            return False
+        if not same_origin(url, self.origin) or urlparse(url).path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+        self._seen.add(url)
+        self._frontier.append((url, depth))
+        self._condition.notify()
+        return True
+
+    def _next_url(self):
+        """Holt die nächste URL; None, wenn nichts mehr zu tun ist."""
+        with self._condition:
+            while True:
+                if self._stopped or len(self._done) + len(self._in_flight) >= self.max_pages:
+                    return None
+                if self._frontier:
+                    url, depth = self._frontier.popleft()
+                    self._in_flight[url] = depth
+                    return url, depth
+                if not self._in_flight:
+                    return None
+                self._condition.wait()
+
+    def _finish(self, url, depth, record=None, error=None, links=()):
+        entries = None
+        with self._condition:
+            del self._in_flight[url]
+            entry = {"url": url, "depth": depth, "queued": []}
+            if record is not None:
+                self._done[url] = record
+                entry["record"] = record
+                for link in links:
+                    link = normalize_url(urljoin(url, link))
+                    if self._enqueue_locked(link, depth + 1):
+                        entry["queued"].append((link, depth + 1))
+            else:
+                self._failed[url] = error
+                entry["error"] = error
+            self._journal_pending.append(entry)
+            if len(self._journal_pending) >= SAVE_INTERVAL:
+                entries, self._journal_pending = self._journal_pending, []
+            self._condition.notify_all()
+        if entries:
+            try:
+                self._append_journal(entries)
+            except Exception as e:
+                # Nichts als erledigt festhalten, was nicht gespeichert ist; beim nächsten Mal erneut versuchen
+                with self._condition:
+                    self._journal_pending[:0] = entries
+                print(f"Warnung: Fortschritt konnte nicht gespeichert werden: {e}")
+
+    def _write(self, url, title, document):
+        """Speichert eine Seite; gibt den Dateinamen zurück (None bei einem OutputStore)."""
+        if self.store is not None:
+            self.store.store(url, title, document.text())
+            return None
+        filename = url_to_filename(url)
+        document.write(os.path.join(self.output_dir, filename))
+        return filename
+
+    def _worker(self, worker_id):
+        output = ConsoleOutput(prefix=f"[W{worker_id}] ", verbose=self.verbose)
+        log = ConsoleOutput(prefix=f"[W{worker_id}] ")
+        browser = WorkerBrowser(self.load_profile, self.blocked_urls, expansion=self.expansion, **self.browser_options)
+        try:
+            while True:
+                item = self._next_url()
+                if item is None:
+                    break
+                url, depth = item
+                host = urlparse(url).netloc
+                links = []
+                self.politeness.acquire(host)
+                try:
+                    try:
+                        title, document, _ = convert_url(url, output, browser, self.fetch_mode, links=links,
+                                                         expansion=self.expansion, converter=self.converter,
+                                                         profiles=self.profiles)
+                    finally:
+                        self.politeness.release(host)
+                    filename = self._write(url, title, document)
+                except Exception as e:
+                    self._finish(url, depth, error=str(e))
+                    log.insert(None, f"FEHLER {url}: {e}\n")
+                    continue
+                self._finish(url, depth, record={"title": title, "file": filename, "depth": depth}, links=links)
+                log.insert(None, f"OK   [{depth}] {url} ({len(links)} Verweise)\n")
+        finally:
+            browser.quit()
+
+    def write_index(self):
+        """Schreibt index.md mit allen erfolgreich konvertierten Seiten."""
+        lines = [f"# Index: {self.seed_url}", ""]
+        for url, record in sorted(self._done.items(), key=lambda item: (item[1]["depth"], item[0])):
+            if record["file"]:
+                lines.append(f"- [{record['title'] or url}]({record['file']}) – {url}")
+            else:
+                lines.append(f"- {record['title'] or url} – {url}")
+        with open(os.path.join(self.output_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def stop(self):
+        """Beendet den Lauf nach den gerade bearbeiteten Seiten."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def run(self, resume=True):
+        """Führt den Crawl aus und gibt eine Zusammenfassung zurück."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.fetch_mode != "static":
+            warn_without_psutil()
+        resumed = resume and self.load_state()
+        with self._condition:
+            if not resumed:
+                self._enqueue_locked(self.seed_url, 0)
+            self._save_state_locked()  # Journal des letzten Laufs einarbeiten
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._worker, args=(i + 1,), daemon=True)
+                   for i in range(max(1, self.workers))]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                while t.is_alive():
+                    t.join(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            for t in threads:
+                t.join()
+        finally:
+            if self.store is not None:
+                self.store.flush()
+            if self.profiles is not None:
+                self.profiles.save()
+            with self._condition:
+                self._save_state_locked()
+            self.write_index()
+        elapsed = time.perf_counter() - start
+        return {
+            "done": len(self._done),
+            "failed": len(self._failed),
+            "pending": len(self._frontier),
+            "elapsed": elapsed,
+            "profiles": self.profiles.stats() if self.profiles is not None else None,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spiegelt eine Website (gleiche Herkunft) als Markdown-Dateien.")
+    parser.add_argument("seed_url", help="Start-URL")
+    parser.add_argument("-o", "--output-dir", default="crawl_output", help="Zielverzeichnis")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Anzahl paralleler Worker")
+    parser.add_argument("-d", "--max-depth", type=int, default=3, help="Maximale Link-Tiefe ab der Start-URL")
+    parser.add_argument("-n", "--max-pages", type=int, default=1000, help="Maximale Anzahl Seiten")
+    add_conversion_arguments(parser)
+    parser.add_argument("--per-host", type=int, default=2, help="Gleichzeitige Abrufe pro Host")
+    parser.add_argument("--delay", type=float, default=0.5, help="Mindestabstand zwischen Anfragen pro Host (s)")
+    add_browser_arguments(parser)
+    parser.add_argument("--restart", action="store_true", help="Gespeicherten Zustand ignorieren und neu beginnen")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Detaillierte Statusmeldungen ausgeben")
+    args = parser.parse_args(argv)
+
+    store = OutputStore(args.store) if args.store else None
+    profiles = SelectorProfiles(args.selector_profiles) if args.selector_profiles else None
+    crawler = Crawler(args.seed_url, args.output_dir, workers=args.workers, max_depth=args.max_depth,
+                      max_pages=args.max_pages, fetch_mode=args.fetch_mode,
+                      politeness=HostPoliteness(args.per_host, args.delay), verbose=args.verbose,
+                      load_profile=args.load_profile, blocked_urls=args.block, expansion=args.expansion,
+                      converter=args.converter, store=store, browser_options=worker_browser_options(args),
+                      profiles=profiles)
+    try:
+        summary = crawler.run(resume=not args.restart)
+    finally:
+        if store is not None:
+            store.close()
+    print("\n=== Zusammenfassung ===")
+    print(f"Konvertiert:      {summary['done']}")
+    print(f"Fehlgeschlagen:   {summary['failed']}")
+    print(f"Offen:            {summary['pending']}")
+    print(f"Laufzeit:         {summary['elapsed']:.1f} s")
+    if summary.get("profiles"):
+        print_profile_stats(summary["profiles"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,350 @@
+import re
+from urllib.parse import urljoin
+
+import lxml.html
+
+import metrics
+from html_markdown_gui_3 import CONTENT_SELECTORS, detect_language
+
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "head", "svg", "canvas", "iframe", "object", "embed",
+    "button", "select", "input", "textarea",
+}
+BLOCK_TAGS = {
+    "html", "body", "p", "div", "section", "article", "main", "header", "footer", "aside", "nav",
+    "figure", "figcaption", "form", "fieldset", "address", "details", "center", "dl", "dd",
+}
+# Elemente, die einen eigenen Block bilden; enthält ein unbekanntes Element eines davon, wird es nicht inline gerendert
+BLOCK_LEVEL_TAGS = BLOCK_TAGS | set(HEADING_TAGS) | {
+    "li", "pre", "ul", "ol", "table", "blockquote", "hr", "summary", "dt", "hgroup",
+}
+EMPHASIS_MARKERS = {"strong": "**", "b": "**", "em": "*", "i": "*", "del": "~~", "s": "~~"}
+CODE_TAGS = {"code", "kbd", "samp", "tt"}
+# Elemente, die eine Tabelle als Layout-Tabelle statt als Datentabelle ausweisen
+LAYOUT_TABLE_XPATH = ".//*[self::table or self::pre or self::ul or self::ol or self::h1 or self::h2 or self::h3]"
+DOCUMENT_INTRO = "Hier findest du das vollständige Proof-of-Concept als Markdown-Dokument mit korrekt eingerücktem Code:"
+
+_WHITESPACE = re.compile(r"\s+")
+_SPACES = re.compile(r" {2,}")
+_LANGUAGE_CLASS = re.compile(r"\b(?:language|lang)-([\w+#-]+)")
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def _selector_xpath(selector):
+    """Übersetzt die einfachen Selektoren aus CONTENT_SELECTORS (tag, #id, .klasse) in XPath."""
+    if selector.startswith("#"):
+        return f"//*[@id='{selector[1:]}']"
+    if selector.startswith("."):
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+    return f"//{selector}"
+
+
+CONTENT_XPATHS = {selector: _selector_xpath(selector) for selector in CONTENT_SELECTORS}
+
+
+def _is_hidden(element):
+    # data-rm-hidden setzt HTML_SNAPSHOT_JS im Browser für per CSS ausgeblendete Elemente
+    if element.get("hidden") is not None or element.get("data-rm-hidden") is not None:
+        return True
+    if element.get("aria-hidden") == "true":
+        return True
+    style = (element.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def _collapse(text):
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _wrap(text, marker):
+    """Umschließt text mit marker, ohne Leerzeichen am Rand in die Auszeichnung zu ziehen."""
+    inner = text.strip()
+    if not inner:
+        return text
+    lead = " " if text[:1].isspace() else ""
+    trail = " " if text[-1:].isspace() else ""
+    return f"{lead}{marker}{inner}{marker}{trail}"
+
+
+def _fence(code):
+    fence = "```"
+    while fence in code:
+        fence += "`"
+    return fence
+
+
+def slugify(text):
+    """Anker einer Überschrift wie bei GitHub: klein, ohne Satzzeichen, Leerzeichen als Bindestrich."""
+    return re.sub(r"[^\w\- ]", "", text.lower()).replace(" ", "-")
+
+
+class _Converter:
+    """
+    Wandelt einen Teilbaum in einem Durchlauf in Markdown-Blöcke um. Verschachtelte
+    Listen, Zitate und Tabellenzellen verwenden eigene Instanzen, teilen sich aber
+    die Liste der Überschriften und die vergebenen Anker.
+    """
+
+    def __init__(self, base_url, headings, anchors):
+        self.base_url = base_url
+        self.headings = headings
+        self.anchors = anchors
+        self.blocks = []
+        self.inline = []
+
+    def _child(self):
+        return _Converter(self.base_url, self.headings, self.anchors)
+
+    def flush(self):
+        """Schließt den laufenden Absatz ab."""
+        if not self.inline:
+            return
+        lines = (_SPACES.sub(" ", line).strip() for line in "".join(self.inline).split("\n"))
+        self.inline = []
+        paragraph = "\n".join(line for line in lines if line)
+        if paragraph:
+            self.blocks.append(paragraph)
+
+    def text(self, text):
+        if text:
+            self.inline.append(_WHITESPACE.sub(" ", text))
+
+    def walk_children(self, element):
+        self.text(element.text)
+        for child in element:
+            self.walk(child)
+
+    def walk(self, element):
+        tag = element.tag
+        # Kommentare und Verarbeitungsanweisungen haben keinen Tag-Namen, nur ihr Tail zählt
+        if isinstance(tag, str) and not (tag.lower() in SKIP_TAGS or _is_hidden(element)):
+            tag = tag.lower()
+            if tag in HEADING_TAGS:
+                self.heading(element, HEADING_TAGS[tag])
+            elif tag == "pre":
+                self.code_block(element)
+            elif tag in ("ul", "ol"):
+                self.list(element, ordered=tag == "ol")
+            elif tag == "table":
+                self.table(element)
+            elif tag == "blockquote":
+                self.blockquote(element)
+            elif tag == "hr":
+                self.flush()
+                self.blocks.append("---")
+            elif tag == "br":
+                self.inline.append("\n")
+            elif tag in ("summary", "dt"):
+                self.flush()
+                self.inline.append(_wrap(self.inline_text(element), "**"))
+                self.flush()
+            elif tag in BLOCK_TAGS or tag == "li":
+                self.flush()
+                self.walk_children(element)
+                self.flush()
+            elif next(element.iterdescendants(*BLOCK_LEVEL_TAGS), None) is not None:
+                # Eigene Elemente (Web Components), hgroup oder Verweise um ganze
+                # Abschnitte: durchlaufen, damit Überschriften, Listen und Code erhalten bleiben
+                self.walk_children(element)
+            else:
+                self.inline.append(self.inline_markup(element))
+        self.text(element.tail)
+
+    def inline_text(self, element):
+        """Inhalt eines Elements als Inline-Markdown (ohne dessen Tail)."""
+        parts = [_WHITESPACE.sub(" ", element.text or "")]
+        for child in element:
+            if isinstance(child.tag, str):
+                parts.append(self.inline_markup(child))
+            parts.append(_WHITESPACE.sub(" ", child.tail or ""))
+        return "".join(parts)
+
+    def inline_markup(self, element):
+        tag = element.tag.lower()
+        if tag in SKIP_TAGS or _is_hidden(element):
+            return ""
+        if tag == "br":
+            return "\n"
+        if tag in CODE_TAGS:
+            code = _collapse(element.text_content())
+            if not code:
+                return ""
+            ticks = "``" if "`" in code else "`"
+            return f"{ticks}{code}{ticks}"
+        inner = self.inline_text(element)
+        if tag == "a":
+            href = (element.get("href") or "").strip()
+            label = _collapse(inner)
+            if not label or not href or href.startswith("#") or href.lower().startswith("javascript:"):
+                return inner
+            label = label.replace("[", "\\[").replace("]", "\\]")
+            return f"[{label}]({urljoin(self.base_url, href).replace(' ', '%20')})"
+        if tag in EMPHASIS_MARKERS:
+            return _wrap(inner, EMPHASIS_MARKERS[tag])
+        if tag in BLOCK_TAGS or tag in HEADING_TAGS or tag in ("li", "pre", "table", "ul", "ol"):
+            return f" {inner} "
+        return inner
+
+    def heading(self, element, level):
+        self.flush()
+        title = _collapse(element.text_content())
+        if not title:
+            return
+        anchor = slugify(title)
+        if anchor in self.anchors:
+            self.anchors[anchor] += 1
+            anchor = f"{anchor}-{self.anchors[anchor]}"
+        else:
+            self.anchors[anchor] = 0
+        self.headings.append((level, title, anchor))
+        self.blocks.append(f"{'#' * level} {title}")
+
+    def code_block(self, element):
+        self.flush()
+        code = element.text_content()
+        if code.startswith("\n"):
+            code = code[1:]
+        code = code.rstrip()
+        if not code.strip():
+            return
+        classes = " ".join(filter(None, [element.get("class")] + [child.get("class") for child in element
+                                                                    if isinstance(child.tag, str)]))
+        match = _LANGUAGE_CLASS.search(classes)
+        language = match.group(1).lower() if match else detect_language(code)
+        fence = _fence(code)
+        metrics.count("code_blocks")
+        self.blocks.append(f"{fence}{language}\n{code}\n{fence}")
+
+    def list(self, element, ordered):
+        self.flush()
+        try:
+            number = int(element.get("start", 1))
+        except ValueError:
+            number = 1
+        lines = []
+        for item in element:
+            if not isinstance(item.tag, str) or item.tag.lower() != "li" or _is_hidden(item):
+                continue
+            sub = self._child()
+            sub.walk_children(item)
+            sub.flush()
+            if not sub.blocks:
+                continue
+            marker = f"{number}. " if ordered else "- "
+            number += 1
+            indent = " " * len(marker)
+            content = "\n".join(sub.blocks).split("\n")
+            lines.append(marker + content[0])
+            lines.extend(indent + line if line else line for line in content[1:])
+        if lines:
+            self.blocks.append("\n".join(lines))
+
+    def table(self, element):
+        self.flush()
+        rows = element.xpath("./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr")
+        cells = [row.xpath("./th | ./td") for row in rows]
+        width = max((sum(self._colspan(cell) for cell in row) for row in cells), default=0)
+        if width <= 1 or element.xpath(LAYOUT_TABLE_XPATH):
+            # Layout-Tabelle: Zellen wie gewöhnliche Blöcke behandeln
+            for row in cells:
+                for cell in row:
+                    self.walk_children(cell)
+                    self.flush()
+            return
+        lines = []
+        for index, row in enumerate(cells):
+            texts = []
+            for cell in row:
+                text = _collapse(self.inline_text(cell)).replace("|", "\\|")
+                texts.extend([text] + [""] * (self._colspan(cell) - 1))
+            texts.extend([""] * (width - len(texts)))
+            lines.append("| " + " | ".join(texts) + " |")
+            if index == 0:
+                lines.append("|" + " --- |" * width)
+        self.blocks.append("\n".join(lines))
+
+    @staticmethod
+    def _colspan(cell):
+        try:
+            return max(1, int(cell.get("colspan", 1)))
+        except ValueError:
+            return 1
+
+    def blockquote(self, element):
+        self.flush()
+        sub = self._child()
+        sub.walk_children(element)
+        sub.flush()
+        if sub.blocks:
+            lines = "\n\n".join(sub.blocks).split("\n")
+            self.blocks.append("\n".join(f"> {line}" if line else ">" for line in lines))
+
+
+def parse_html(html):
+    """Parst ein HTML-Dokument mit lxml und gibt das Wurzelelement zurück."""
+    html = _XML_DECLARATION.sub("", html, count=1)
+    if not html.strip():
+        html = "<html></html>"
+    return lxml.html.document_fromstring(html)
+
+
+def _content_roots(document, content_selectors=CONTENT_SELECTORS):
+    for selector in content_selectors:
+        elements = document.xpath(CONTENT_XPATHS[selector])
+        if elements:
+            # Nur äußerste Treffer, damit verschachtelte Bereiche nicht doppelt erscheinen
+            matched = set(elements)
+            return selector, [e for e in elements if not any(a in matched for a in e.iterancestors())]
+    return None, []
+
+
+def convert_html(html, base_url=None, selectors=None):
+    """
+    Wandelt ein HTML-Dokument in einem Durchlauf über den DOM-Baum in Markdown um:
+    Überschriften, Listen, Tabellen, Verweise, Hervorhebungen und <pre>-Blöcke
+    werden direkt abgebildet. Der Hauptinhalt wird wie bei der Textextraktion
+    über CONTENT_SELECTORS bestimmt, sonst der Body verwendet.
+    Gibt (Titel, Markdown des Inhalts, Überschriften) zurück; Überschriften sind
+    (Ebene, Text, Anker)-Tupel für das Inhaltsverzeichnis.
+    Mit PageSelectors (selector_profiles) werden deren Inhalts-Selektoren
+    verwendet und der getroffene gemeldet.
+    """
+    document = parse_html(html)
+    base = document.find(".//base[@href]")
+    if base is not None:
+        base_url = urljoin(base_url or "", base.get("href"))
+    title = _collapse(document.findtext(".//title") or "") or "Extrahierter Inhalt"
+
+    if selectors is None:
+        _, roots = _content_roots(document)
+    else:
+        matched, roots = _content_roots(document, selectors.content)
+        selectors.observe("content", [matched])
+    for candidates in (roots, [document.find("body") if document.find("body") is not None else document]):
+        headings = []
+        converter = _Converter(base_url, headings, {})
+        for root in candidates:
+            converter.walk_children(root)
+            converter.flush()
+        if converter.blocks:
+            return title, "\n\n".join(converter.blocks), headings
+    return title, "", []
+
+
+def render_markdown_document_chunks(title, body, headings):
+    """Titel, Inhaltsverzeichnis (ab drei Überschriften) und Inhalt als Folge von Text-Chunks."""
+    yield f"{DOCUMENT_INTRO}\n\n---\n\n# {title}\n\n---\n\n"
+    if len(headings) >= 3:
+        top_level = min(level for level, _, _ in headings)
+        yield "## Inhaltsverzeichnis\n\n"
+        for level, text, anchor in headings:
+            yield f"{'  ' * (level - top_level)}- [{text}](#{anchor})\n"
+        yield "\n---\n\n"
+    yield body
+    yield "\n\n---"
+
+
+def render_markdown_document(title, body, headings):
+    """Setzt Titel, Inhaltsverzeichnis (ab drei Überschriften) und Inhalt zum Dokument zusammen."""
+    return "".join(render_markdown_document_chunks(title, body, headings))
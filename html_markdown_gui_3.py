@@ -1,26 +1,398 @@
 import threading
 import time
+import queue
 import tkinter as tk
 import re
 import os
+import json
+import hashlib
+from collections import OrderedDict
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium und webdriver-manager werden erst beim ersten Browserstart importiert,
+# damit sich die Oberfläche und die Kommandozeilenwerkzeuge schneller öffnen.
+import metrics
+from page_cache import snapshot_hash
 
 
-def get_secure_driver():
+# Überwacht DOM-Mutationen sowie laufende fetch/XHR-Anfragen der Seite.
+# Wird vor jedem Dokument registriert und von wait_for_page_load ausgewertet.
+QUIESCENCE_MONITOR_JS = """
+(function () {
+    if (window.__rmQuiescence) { return; }
+    var state = window.__rmQuiescence = {pending: 0, last: performance.now()};
+    function touch() { state.last = performance.now(); }
+    new MutationObserver(touch).observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            touch();
+            return originalFetch.apply(this, arguments).finally(function () {
+                state.pending--;
+                touch();
+            });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        touch();
+        this.addEventListener('loadend', function () {
+            state.pending--;
+            touch();
+        });
+        try {
+            return originalSend.apply(this, arguments);
+        } catch (e) {
+            state.pending--;
+            throw e;
+        }
+    };
+})();
+"""
+
+# Wartet im Browser, bis für idle Millisekunden weder Mutationen noch offene
+# Anfragen aufgetreten sind, höchstens aber maxWait Millisekunden.
+WAIT_FOR_QUIESCENCE_JS = """
+var idle = arguments[0], maxWait = arguments[1], done = arguments[arguments.length - 1];
+var state = window.__rmQuiescence, start = performance.now();
+(function check() {
+    var now = performance.now();
+    if (state.pending <= 0 && now - state.last >= idle) { return done(true); }
+    if (now - start >= maxWait) { return done(false); }
+    setTimeout(check, 50);
+})();
+"""
+
+# Eine Runde des Stapel-Aufklappens (expand_page): Scrollt ab startAt bis zum
+# Seitenende und wartet dort jeweils, ob Nachladen scrollHeight vergrößert.
+# Danach werden alle eingeklappten Elemente und "Mehr laden"-Schaltflächen auf
+# einmal geöffnet und gewartet, bis die Seite wieder ruhig ist.
+# Liefert {expanded, grew, bottom}.
+EXPAND_PAGE_JS = """
+var idle = arguments[0], maxWait = arguments[1], startAt = arguments[2], done = arguments[arguments.length - 1];
+var TOGGLES = "[aria-expanded='false'], [data-toggle='collapse'].collapsed, [data-bs-toggle='collapse'].collapsed";
+var LOAD_MORE = ".load-more, .show-more, a.more, a.show-more, a.expand";
+var LOAD_MORE_TEXT = /^(mehr|weitere|alle) (laden|anzeigen)|^(load|show) (more|all)/i;
+var state = window.__rmQuiescence, deadline = performance.now() + maxWait;
+var root = document.scrollingElement || document.documentElement;
+var startHeight = root.scrollHeight, startCount = document.getElementsByTagName('*').length;
+
+function visible(el) { return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length); }
+function navigates(el) {
+    if (el.form && el.type === 'submit') { return true; }  // Klick würde das Formular absenden
+    var href = el.tagName === 'A' ? (el.getAttribute('href') || '') : '';
+    return href !== '' && href.charAt(0) !== '#' && href.indexOf('javascript:') !== 0;
+}
+function whenQuiet(next) {
+    var since = performance.now();
+    (function check() {
+        var now = performance.now();
+        var quiet = !state || (state.pending <= 0 && now - Math.max(state.last, since) >= idle);
+        if (quiet || now >= deadline) { return next(); }
+        setTimeout(check, 50);
+    })();
+}
+function scrollToEnd(pos, next) {
+    var step = Math.max(200, window.innerHeight);
+    (function advance() {
+        if (performance.now() >= deadline) { return next(pos); }
+        if (pos + window.innerHeight < root.scrollHeight) {
+            pos = Math.min(pos + step, root.scrollHeight);
+            window.scrollTo(0, pos);
+            return setTimeout(advance, 20);
+        }
+        var height = root.scrollHeight;
+        whenQuiet(function () { if (root.scrollHeight > height) { advance(); } else { next(pos); } });
+    })();
+}
+function expandAll() {
+    var count = 0;
+    document.querySelectorAll('details:not([open])').forEach(function (el) { el.open = true; count++; });
+    document.querySelectorAll(TOGGLES).forEach(function (el) {
+        if (el.hasAttribute('data-rm-expanded') || !visible(el) || navigates(el)) { return; }
+        el.setAttribute('data-rm-expanded', '');  // Umschalter nur einmal klicken, sonst klappen sie wieder zu
+        el.click();
+        count++;
+    });
+    document.querySelectorAll(LOAD_MORE + ', button').forEach(function (el) {
+        if (el.disabled || !visible(el) || navigates(el)) { return; }
+        if (!el.matches(LOAD_MORE) && !LOAD_MORE_TEXT.test((el.textContent || '').trim())) { return; }
+        el.click();
+        count++;
+    });
+    return count;
+}
+
+scrollToEnd(startAt, function (bottom) {
+    var expanded = expandAll();
+    whenQuiet(function () {
+        var grew = root.scrollHeight > startHeight || document.getElementsByTagName('*').length > startCount;
+        done({expanded: expanded, grew: grew, bottom: bottom});
+    });
+});
+"""
+# "batch": expand_page (Standard), "click": einzelnes Klicken mit click_interactive_elements
+EXPANSION_MODES = ("batch", "click")
+
+# Serialisiert das DOM für dom_markdown. Per CSS ausgeblendete Elemente werden
+# vorher mit data-rm-hidden markiert, da das HTML selbst die Sichtbarkeit nicht enthält.
+HTML_SNAPSHOT_JS = """
+var marked = [];
+var walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_ELEMENT, {
+    acceptNode: function (el) {
+        var style = getComputedStyle(el);
+        if (style.display !== 'none' && style.visibility !== 'hidden') { return NodeFilter.FILTER_ACCEPT; }
+        el.setAttribute('data-rm-hidden', '');
+        marked.push(el);
+        return NodeFilter.FILTER_REJECT;
+    }
+});
+while (walker.nextNode()) {}
+var html = document.documentElement.outerHTML;
+marked.forEach(function (el) { el.removeAttribute('data-rm-hidden'); });
+return html;
+"""
+# "dom": dom_markdown wandelt den HTML-Baum um (Standard), "text": Textextraktion mit Heuristiken
+CONVERTERS = ("dom", "text")
+
+
+CONTENT_SELECTORS = ["main", "#main", ".main-content", "article", ".content", "#content"]
+CODE_SELECTORS = ["pre", "code", ".code", ".hljs", ".syntax-highlighting", "[class*='language-']"]
+# Zeitlimits der Browserphasen in Sekunden (siehe page_time_bound)
+PAGE_LOAD_TIMEOUT = 30
+PAGE_SETTLE_TIME = 10
+EXPAND_ROUNDS = 10
+EXPAND_ROUND_TIMEOUT = 15
+CLICK_ELEMENTS_PER_SELECTOR = 15
+CLICK_PHASE_BUDGET = 180
+INTERACTIVE_SELECTORS = [
+    "button:not([disabled])", "a.more", "a.show-more", "a.expand",
+    ".toggle", ".accordion-header", ".accordion-button", "[aria-expanded='false']",
+    "[data-toggle='collapse']", ".btn", ".load-more", "details:not([open]) > summary"
+]
+
+# Sammelt Titel, Hauptinhalt und alle Code-Blöcke in einem einzigen
+# execute_script-Aufruf und liefert sie als JSON-Zeichenkette zurück.
+DOM_SNAPSHOT_JS = """
+var contentSelectors = arguments[0], codeSelectors = arguments[1];
+function visibleText(el) {
+    if (!el.getClientRects().length) { return ''; }
+    return (el.innerText || '').trim();
+}
+var snapshot = {title: document.title, content: '', contentSelector: null, bodyText: '',
+                codeBlocks: [], errors: []};
+for (var i = 0; i < contentSelectors.length; i++) {
+    try {
+        var elems = document.querySelectorAll(contentSelectors[i]);
+        if (elems.length) {
+            var parts = [];
+            for (var j = 0; j < elems.length; j++) { parts.push(visibleText(elems[j]) + '\\n\\n'); }
+            snapshot.content = parts.join('');
+            snapshot.contentSelector = contentSelectors[i];
+            break;
+        }
+    } catch (e) {}
+}
+if (!snapshot.content.trim() && document.body) { snapshot.bodyText = visibleText(document.body); }
+var all = document.getElementsByTagName('*'), positions = new Map();
+for (var k = 0; k < all.length; k++) { positions.set(all[k], k); }
+for (var s = 0; s < codeSelectors.length; s++) {
+    try {
+        var blocks = document.querySelectorAll(codeSelectors[s]);
+        for (var b = 0; b < blocks.length; b++) {
+            var text = visibleText(blocks[b]);
+            if (text) {
+                var position = positions.get(blocks[b]);
+                snapshot.codeBlocks.push({text: text, position: position, selector: codeSelectors[s],
+                                          end: position + blocks[b].getElementsByTagName('*').length});
+            }
+        }
+    } catch (e) {
+        snapshot.errors.push(codeSelectors[s] + ': ' + e.message);
+    }
+}
+return JSON.stringify(snapshot);
+"""
+
+
+class ProcessingCancelled(Exception):
+    """Wird ausgelöst, wenn der Nutzer die laufende Verarbeitung abbricht."""
+
+
+class NoTextContent(Exception):
+    """Die Seite enthält (noch) keinen Text, weder im Hauptinhalt noch im Body."""
+
+
+def check_cancelled(output_widget):
+    """Bricht die Verarbeitung ab, sobald über die Ausgabe ein Abbruch angefordert wurde."""
+    if output_widget.cancelled:
+        raise ProcessingCancelled()
+
+
+class ConsoleOutput:
+    """
+    Ersatz für das ScrolledText-Widget im Kommandozeilenbetrieb.
+    Bietet dieselben Methoden wie QueueOutput, schreibt aber auf stdout.
+    """
+    _print_lock = threading.Lock()
+    cancelled = False
+
+    def __init__(self, prefix="", verbose=True):
+        self.prefix = prefix
+        self.verbose = verbose
+
+    def progress(self, phase, value, maximum=1):
+        pass
+
+    def call_in_ui(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    def insert(self, index, text):
+        if not self.verbose:
+            return
+        with self._print_lock:
+            for line in text.rstrip("\n").split("\n"):
+                print(f"{self.prefix}{line}")
+
+    def delete(self, start, end=None):
+        pass
+
+    def update(self):
+        pass
+
+
+# Zwischengespeicherter Pfad des chromedriver für spätere Programmstarts
+CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".runasmart", "chromedriver_path")
+# Lokale Speicherarten, die reset_browser zwischen zwei Seiten löscht (der HTTP-Cache bleibt erhalten)
+RESET_STORAGE_TYPES = "cookies,local_storage,indexeddb,websql,service_workers,cache_storage,file_systems"
+
+
+
+def _extension_patterns(*extensions):
+    return [pattern for ext in extensions for pattern in (f"*.{ext}", f"*.{ext}?*")]
+
+
+# URL-Muster (Network.setBlockedURLs, "*" als Platzhalter) je Ressourcenart
+BLOCKED_RESOURCE_PATTERNS = {
+    "image": _extension_patterns("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": _extension_patterns("woff", "woff2", "ttf", "otf", "eot"),
+    "media": _extension_patterns("mp4", "webm", "ogg", "mp3", "wav", "m3u8", "mov"),
+    "stylesheet": _extension_patterns("css"),
+    "tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*connect.facebook.net*", "*hotjar.com*", "*segment.io*", "*clarity.ms*", "*scorecardresearch.com*",
+    ],
+}
+# Ladeprofile: welche Ressourcenarten der Browser gar nicht erst anfordert.
+# "text+css" für Seiten, deren Sichtbarkeit von Inhalten vom CSS abhängt.
+LOAD_PROFILES = {
+    "full": (),
+    "text+css": ("image", "font", "media", "tracker"),
+    "text-only": ("image", "font", "media", "tracker", "stylesheet"),
+}
+
+
+# "auto": statisch mit Browser-Fallback, "static": nur HTTP, "browser": nur Selenium
+FETCH_MODES = ("auto", "static", "browser")
+# Gültige Werte der Modus-Parameter und die Fehlermeldung für andere Werte
+_MODE_CHOICES = {
+    "fetch_mode": ("Unbekannter Abrufmodus", FETCH_MODES),
+    "load_profile": ("Unbekanntes Ladeprofil", LOAD_PROFILES),
+    "expansion": ("Unbekannter Aufklappmodus", EXPANSION_MODES),
+    "converter": ("Unbekannter Konverter", CONVERTERS),
+}
+
+
+def check_modes(**modes):
+    """Prüft Modus-Parameter (fetch_mode, load_profile, expansion, converter) und wirft ValueError."""
+    for name, value in modes.items():
+        message, choices = _MODE_CHOICES[name]
+        if value not in choices:
+            raise ValueError(f"{message}: {value}")
+
+
+def blocked_url_patterns(load_profile="full", extra_patterns=()):
+    """URL-Muster, die im Ladeprofil load_profile blockiert werden, ergänzt um extra_patterns."""
+    check_modes(load_profile=load_profile)
+    patterns = [pattern for kind in LOAD_PROFILES[load_profile] for pattern in BLOCKED_RESOURCE_PATTERNS[kind]]
+    return patterns + list(extra_patterns)
+
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def _read_cached_chromedriver_path():
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            path = f.read().strip()
+    except OSError:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def _write_cached_chromedriver_path(path):
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+        with open(CHROMEDRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError:
+        pass  # Ohne beschreibbares Home-Verzeichnis gilt der Cache nur für diesen Prozess
+
+
+def resolve_chromedriver_path(refresh=False):
+    """
+    Liefert den Pfad des chromedriver. Die Umgebungsvariable CHROMEDRIVER_PATH
+    hat Vorrang; sonst wird der Pfad nur einmal über webdriver-manager (mit
+    Netzwerkzugriff) ermittelt und im Prozess sowie in CHROMEDRIVER_CACHE_FILE
+    gespeichert. Mit refresh=True wird der gespeicherte Pfad verworfen.
+    """
+    global _chromedriver_path
+    override = os.environ.get("CHROMEDRIVER_PATH")
+    if override:
+        return override
+    with _chromedriver_lock:
+        if refresh:
+            _chromedriver_path = None
+        elif _chromedriver_path is None:
+            _chromedriver_path = _read_cached_chromedriver_path()
+        if _chromedriver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _chromedriver_path = ChromeDriverManager().install()
+            _write_cached_chromedriver_path(_chromedriver_path)
+        return _chromedriver_path
+
+
+def get_secure_driver(headless=False, load_profile="full", blocked_urls=()):
     """
     Konfiguriert einen Chrome-Webdriver mit optimalen Einstellungen
     für zuverlässiges Laden von Inhalten.
+    Mit headless=True läuft der Browser ohne Fenster (Batch-Betrieb).
+    load_profile (siehe LOAD_PROFILES) und blocked_urls legen fest, welche
+    Ressourcen nicht geladen werden; das spart Ladezeit und Speicher.
     """
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    patterns = blocked_url_patterns(load_profile, blocked_urls)
+    blocked_kinds = LOAD_PROFILES[load_profile]
+
     chrome_options = Options()
+    if "image" in blocked_kinds:
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    if "media" in blocked_kinds:
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--mute-audio")
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -33,16 +405,192 @@ def get_secure_driver():
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path()), options=chrome_options)
+    except WebDriverException:
+        if os.environ.get("CHROMEDRIVER_PATH"):
+            raise
+        # Der gespeicherte Treiber passt evtl. nicht mehr zur installierten Chrome-Version
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(refresh=True)), options=chrome_options)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": QUIESCENCE_MONITOR_JS})
+    except Exception:
+        pass  # Fallback: wait_for_page_load installiert den Monitor nachträglich
+    if patterns:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            print(f"Warnung: Ressourcen konnten nicht blockiert werden: {e}")
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    metrics.instrument_driver(driver)
     return driver
 
 
-def wait_for_page_load(driver, timeout=30):
+def driver_alive(driver):
+    """Prüft, ob die WebDriver-Sitzung noch benutzbar ist."""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def browser_processes(driver):
+    """chromedriver und alle von ihm gestarteten Chrome-Prozesse; leer ohne psutil."""
+    psutil = _psutil()
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if psutil is None or process is None:
+        return []
+    try:
+        root = psutil.Process(process.pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def browser_rss(driver):
+    """Arbeitsspeicher (RSS) aller Browserprozesse in Bytes oder None, wenn psutil fehlt."""
+    psutil = _psutil()
+    if psutil is None:
+        return None
+    total = 0
+    for process in browser_processes(driver):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def kill_browser(driver):
+    """
+    Beendet chromedriver und Chrome sofort, ohne auf die (möglicherweise
+    hängende) WebDriver-Sitzung zu warten. Ohne psutil wird nur chromedriver beendet.
+    """
+    processes = browser_processes(driver)
+    for process in reversed(processes):
+        try:
+            process.kill()
+        except Exception:
+            pass
+    if not processes:
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+
+def reset_browser(driver):
+    """
+    Setzt einen wiederverwendeten Browser zwischen zwei Seiten zurück: zusätzliche
+    Tabs werden geschlossen, Cookies und Website-Speicher gelöscht und der
+    verbleibende Tab auf about:blank gestellt.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    origin = driver.execute_script("return window.location.origin;")
+    driver.get("about:blank")
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    # "*" erfasst alle Ursprünge; der Ursprung der letzten Seite wird zur Sicherheit einzeln gelöscht
+    for target in ("*", origin):
+        if target and target != "null":
+            try:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                       {"origin": target, "storageTypes": RESET_STORAGE_TYPES})
+            except Exception:
+                pass
+
+
+class WarmBrowser:
+    """
+    Langlebiger Browser, der über viele Seiten hinweg wiederverwendet wird.
+    Er wird erst gestartet, wenn eine Seite ihn braucht (oder vorab mit
+    warm_up), vor jeder weiteren Seite mit reset_browser zurückgesetzt und
+    nach einem Absturz automatisch ersetzt.
+    """
+
+    def __init__(self, headless=False, load_profile="full", blocked_urls=()):
+        blocked_url_patterns(load_profile)  # unbekannte Profile sofort melden
+        self.headless = headless
+        self.load_profile = load_profile
+        self.blocked_urls = tuple(blocked_urls)
+        self.driver = None
+        self._used = False
+        self._lock = threading.Lock()
+
+    def _start_if_needed(self):
+        if self.driver is not None and driver_alive(self.driver):
+            return
+        self._quit()
+        with metrics.span("driver_startup"):
+            self.driver = get_secure_driver(headless=self.headless, load_profile=self.load_profile,
+                                            blocked_urls=self.blocked_urls)
+        self._used = False
+
+    def warm_up(self):
+        """Startet den Browser im Hintergrund, damit die erste Seite nicht auf Chrome warten muss."""
+        def start():
+            try:
+                with self._lock:
+                    self._start_if_needed()
+            except Exception:
+                pass  # get() versucht den Start erneut und meldet dann den Fehler
+
+        threading.Thread(target=start, daemon=True).start()
+
+    def get(self):
+        """Liefert einen sauberen, einsatzbereiten Browser für die nächste Seite."""
+        with self._lock:
+            if self.driver is not None and self._used:
+                try:
+                    with metrics.span("reset"):
+                        reset_browser(self.driver)
+                except Exception:
+                    self._quit()
+            self._start_if_needed()
+            self._used = True
+            return self.driver
+
+    def _quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def quit(self):
+        with self._lock:
+            self._quit()
+
+
+def wait_for_page_load(driver, timeout=PAGE_LOAD_TIMEOUT, idle_time=0.5, max_settle_time=PAGE_SETTLE_TIME):
     """
     Wartet, bis die Seite vollständig geladen ist, mit mehreren Überprüfungen.
+    Statt einer festen Wartezeit gilt die Seite als bereit, sobald für idle_time
+    Sekunden keine DOM-Mutationen und keine offenen fetch/XHR-Anfragen
+    beobachtet wurden (höchstens jedoch max_settle_time Sekunden).
     """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     try:
         WebDriverWait(driver, timeout).until(
             lambda d: d.execute_script("return document.readyState") == "complete"
@@ -53,22 +601,66 @@ def wait_for_page_load(driver, timeout=30):
         WebDriverWait(driver, timeout / 2).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
-        time.sleep(2)  # Zusätzliche Wartezeit für asynchrone Inhalte
-        return True
+        return wait_for_dom_quiescence(driver, idle_time, min(max_settle_time, timeout))
     except TimeoutException:
         print("Warnung: Timeout beim Warten auf vollständiges Laden der Seite.")
         return False
 
 
-def click_interactive_elements(driver, output_widget, max_attempts=3):
+def _wait_time_bound(timeout, max_settle_time=PAGE_SETTLE_TIME):
+    # readyState (timeout), jQuery und body (je timeout / 2), danach DOM-Ruhe
+    return 2 * timeout + min(max_settle_time, timeout)
+
+
+def page_time_bound(expansion="batch"):
+    """
+    Obergrenze in Sekunden, die load_page und die Aufklapp-Phase von
+    convert_loaded_page mit den Standard-Zeitlimits für eine Seite brauchen
+    können (ohne Extraktion und Umwandlung).
+    """
+    bound = PAGE_LOAD_TIMEOUT + _wait_time_bound(PAGE_LOAD_TIMEOUT)
+    if expansion == "click":
+        # Das Budget wird vor jedem Element geprüft; das letzte begonnene braucht höchstens
+        # Scrollen (1 s), drei Klickversuche (je 0,5 s) und Warten auf das Laden (5 s)
+        per_element = 1 + 3 * 0.5 + _wait_time_bound(5)
+        bound += CLICK_PHASE_BUDGET + per_element + 1
+    else:
+        # Jede Runde endet spätestens mit dem Skript-Timeout (round_timeout + 5)
+        bound += EXPAND_ROUNDS * (EXPAND_ROUND_TIMEOUT + 5)
+    return bound
+
+
+def wait_for_dom_quiescence(driver, idle_time=0.5, max_wait=10):
+    """
+    Wartet, bis im DOM Ruhe eingekehrt ist. Gibt False zurück, wenn die
+    Obergrenze max_wait erreicht wurde, ohne dass die Seite zur Ruhe kam.
+    """
+    driver.execute_script(QUIESCENCE_MONITOR_JS)
+    driver.set_script_timeout(max_wait + 5)
+    quiet = driver.execute_async_script(WAIT_FOR_QUIESCENCE_JS, int(idle_time * 1000), int(max_wait * 1000))
+    if not quiet:
+        print("Warnung: Seite wurde innerhalb der Obergrenze nicht vollständig ruhig.")
+    return bool(quiet)
+
+
+def _page_size(driver):
+    return tuple(driver.execute_script(
+        "return [document.getElementsByTagName('*').length, document.documentElement.scrollHeight];"))
+
+
+def click_interactive_elements(driver, output_widget, max_attempts=3, selectors=None, budget=CLICK_PHASE_BUDGET):
     """
     Klickt systematisch auf interaktive Elemente und wartet auf Inhaltsladung.
+    Mit PageSelectors (selector_profiles) werden nur deren Klick-Selektoren
+    verwendet und jene gemeldet, nach deren Klicks die Seite gewachsen ist.
+    Nach budget Sekunden werden keine weiteren Elemente mehr angeklickt.
     """
-    interactive_selectors = [
-        "button:not([disabled])", "a.more", "a.show-more", "a.expand",
-        ".toggle", ".accordion-header", ".accordion-button", "[aria-expanded='false']",
-        "[data-toggle='collapse']", ".btn", ".load-more", "details:not([open]) > summary"
-    ]
+    from selenium.common.exceptions import StaleElementReferenceException
+    from selenium.webdriver.common.by import By
+
+    interactive_selectors = selectors.click if selectors is not None else INTERACTIVE_SELECTORS
+    useful_selectors = []
+    deadline = time.monotonic() + budget
 
     try:
         viewport_height = driver.execute_script("return window.innerHeight")
@@ -76,21 +668,34 @@ def click_interactive_elements(driver, output_widget, max_attempts=3):
         scroll_step = viewport_height // 3
         output_widget.insert(tk.END, "Scrolle durch die Seite für dynamische Inhalte...\n")
         for scroll_pos in range(0, total_height, scroll_step):
+            check_cancelled(output_widget)
+            if time.monotonic() > deadline:
+                break
             driver.execute_script(f"window.scrollTo(0, {scroll_pos})")
             time.sleep(0.5)
         driver.execute_script("window.scrollTo(0, 0)")
+    except ProcessingCancelled:
+        raise
     except Exception as e:
         output_widget.insert(tk.END, f"Fehler beim Scrollen: {str(e)}\n")
 
     clicked_elements = set()
-    for selector in interactive_selectors:
+    for selector_idx, selector in enumerate(interactive_selectors):
+        check_cancelled(output_widget)
+        if time.monotonic() > deadline:
+            output_widget.insert(tk.END, "Zeitbudget für das Klicken erschöpft.\n")
+            break
+        output_widget.progress("click", selector_idx, len(interactive_selectors))
         output_widget.insert(tk.END, f"Suche nach Elementen: {selector}\n")
-        output_widget.update()
+        size_before = None
         try:
             elements = driver.find_elements(By.CSS_SELECTOR, selector)
             if elements:
                 output_widget.insert(tk.END, f"{len(elements)} Elemente mit '{selector}' gefunden.\n")
-                for elem in elements[:15]:
+                for elem in elements[:CLICK_ELEMENTS_PER_SELECTOR]:
+                    check_cancelled(output_widget)
+                    if time.monotonic() > deadline:
+                        break
                     try:
                         if not elem.is_displayed():
                             continue
@@ -100,6 +705,8 @@ def click_interactive_elements(driver, output_widget, max_attempts=3):
                         clicked_elements.add(elem_id)
                         driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", elem)
                         time.sleep(1)
+                        if selectors is not None and size_before is None:
+                            size_before = _page_size(driver)
                         success = False
                         for _ in range(max_attempts):
                             try:
@@ -110,40 +717,169 @@ def click_interactive_elements(driver, output_widget, max_attempts=3):
                                 time.sleep(0.5)
                         if success:
                             output_widget.insert(tk.END, "Element wurde erfolgreich geklickt.\n")
-                            time.sleep(2)
+                            metrics.count("elements_clicked")
                             wait_for_page_load(driver, timeout=5)
                         else:
                             output_widget.insert(tk.END, "Konnte Element nicht klicken.\n")
+                    except ProcessingCancelled:
+                        raise
                     except StaleElementReferenceException:
                         output_widget.insert(tk.END, "Element nicht mehr verfügbar (StaleElementReference).\n")
                         continue
                     except Exception as e:
                         output_widget.insert(tk.END, f"Fehler: {str(e)}\n")
                         continue
+            if size_before is not None and any(after > before for after, before in zip(_page_size(driver), size_before)):
+                useful_selectors.append(selector)
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             output_widget.insert(tk.END, f"Fehler bei Selector {selector}: {str(e)}\n")
 
+    if selectors is not None:
+        selectors.observe("click", useful_selectors)
+    output_widget.progress("click", 1)
     driver.execute_script("window.scrollTo(0, 0)")
     time.sleep(1)
 
 
+def expand_page(driver, output_widget, max_rounds=EXPAND_ROUNDS, idle_time=0.5, round_timeout=EXPAND_ROUND_TIMEOUT):
+    """
+    Öffnet eingeklappte Inhalte (details, aria-expanded='false', Collapse-Umschalter,
+    "Mehr laden"-Schaltflächen) stapelweise mit je einem Skriptaufruf pro Runde
+    und löst Nachladen beim Scrollen aus. Statt fester Wartezeiten wird auf
+    DOM-Ruhe und wachsende scrollHeight geachtet. Endet, sobald die Seite nicht
+    mehr wächst oder max_rounds erreicht ist; gibt die Zahl geöffneter Elemente zurück.
+    Scheitert eine Runde, etwa weil ein Klick doch eine Navigation auslöst, wird
+    das Aufklappen beendet und der bis dahin geladene Inhalt verwendet.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    start_url = driver.current_url
+    driver.execute_script(QUIESCENCE_MONITOR_JS)
+    driver.set_script_timeout(round_timeout + 5)
+    expanded = 0
+    position = 0
+    for round_idx in range(max_rounds):
+        check_cancelled(output_widget)
+        output_widget.progress("click", round_idx, max_rounds)
+        try:
+            result = driver.execute_async_script(EXPAND_PAGE_JS, int(idle_time * 1000),
+                                                 int(round_timeout * 1000), position)
+            position = max(0, result["bottom"] - driver.execute_script("return window.innerHeight"))
+        except WebDriverException as e:
+            output_widget.insert(tk.END, f"Aufklappen in Runde {round_idx + 1} abgebrochen: {e.msg or e}\n")
+            if driver.current_url != start_url:
+                output_widget.insert(tk.END, "Seite hat navigiert – kehre zur ursprünglichen Seite zurück.\n")
+                driver.back()
+                wait_for_page_load(driver, timeout=10)
+            break
+        expanded += result["expanded"]
+        output_widget.insert(tk.END, f"Runde {round_idx + 1}: {result['expanded']} Elemente geöffnet.\n")
+        if not result["grew"]:
+            break
+    driver.execute_script("window.scrollTo(0, 0)")
+    metrics.count("elements_clicked", expanded)
+    output_widget.progress("click", 1)
+    return expanded
+
+
+# (Sprache, Muster, Gewicht): Jeder Treffer erhöht die Punktzahl der Sprache.
+# Alle Muster beginnen mit einem festen Zeichen (Zeilenanfang als "\n"),
+# damit der kombinierte Ausdruck Positionen ohne möglichen Treffer schnell
+# überspringt. Wortgrenzen vor Buchstaben prüft _score_language selbst.
+LANGUAGE_PATTERNS = [
+    ('javascript', r'function\s+\w+\s*\(', 2),
+    ('javascript', r'(?:const|let|var)\s+\w+\s*=', 2),
+    ('javascript', r'import\s+.*?\s+from\s+[\'"]', 3),
+    ('javascript', r'export\s+(?:default|const|function|class)\b', 3),
+    ('javascript', r'console\.log\s*\(|document\.\w+|window\.\w+', 3),
+    ('javascript', r'===|!==|=>', 1),
+    ('python', r'\n[ \t]*def\s+\w+\s*\(.*\)\s*(?:->.*)?:', 3),
+    ('python', r'\n[ \t]*(?:from[ \t]+[\w.]+[ \t]+)?import[ \t]+[\w.]+(?:[ \t]+as[ \t]+\w+)?'
+               r'(?:[ \t]*,[ \t]*[\w.]+)*[ \t]*(?=\r?\n|\Z)', 2),
+    ('python', r'\n[ \t]*class[ \t]+\w+(?:\(.*\))?:[ \t]*(?=\r?\n|\Z)', 3),
+    ('python', r'self\.\w+|elif\b|None\b', 2),
+    ('python', r'\n[ \t]*(?:if|for|while|with|try|except|else)\b.*:[ \t]*(?=\r?\n|\Z)', 1),
+    ('html', r'<!(?i:DOCTYPE\s+html)', 4),
+    ('html', r'</?(?i:html|head|body|div|span|script|p|ul|li|a)\b[^>]*>', 2),
+    ('css', r'(?:margin|padding|font-family|font-size|color|display|background)\s*:\s*[^;{}\n]+;', 2),
+    ('css', r'@media\b|\n[ \t]*[.#][\w-]+\s*\{', 3),
+    ('sql', r'(?:SELECT|select)\b.+\b(?:FROM|from)\b|(?:INSERT|insert)\s+(?:INTO|into)\b'
+            r'|(?:DELETE|delete)\s+(?:FROM|from)\b|(?:CREATE|create)\s+(?:TABLE|table)\b', 4),
+    ('sql', r'(?:UPDATE|update)\s+\w+\s+(?:SET|set)\b|WHERE\b', 2),
+    ('yaml', r'\n[ \t]*(?:version|services|image|volumes|environment|restart|ports|networks|hosts|tasks):', 2),
+    ('yaml', r'\n[ \t]*-[ \t]+(?:name|hosts|import_tasks|include):', 2),
+    ('cpp', r'#include\s*[<"]', 4),
+    ('cpp', r'int\s+main\s*\(|std::|cout\s*<<|printf\s*\(', 3),
+    ('java', r'public\s+(?:static\s+)?(?:final\s+)?(?:class|interface|void)\b', 3),
+    ('java', r'@Override\b|System\.out\.print', 4),
+    ('java', r'(?:private|protected)\s+(?:static\s+)?\w+', 1),
+]
+# Mindestpunktzahl, ab der eine Sprache vergeben wird
+LANGUAGE_MIN_SCORE = 2
+# Vorsprung, ab dem die Bewertung vorzeitig beendet wird
+LANGUAGE_DECISIVE_LEAD = 12
+# Für die Erkennung genügt der Anfang sehr großer Blöcke
+LANGUAGE_SCAN_LIMIT = 8192
+LANGUAGE_CACHE_SIZE = 65536
+
+# Alle Muster in einem Ausdruck: Ein einziger Durchlauf über den Code liefert
+# über den Gruppennamen, welches Muster getroffen hat.
+_LANGUAGE_REGEX = re.compile(
+    "|".join(f"(?P<p{i}>{pattern})" for i, (_, pattern, _) in enumerate(LANGUAGE_PATTERNS))
+)
+_LANGUAGE_BY_GROUP = {f"p{i}": (lang, weight) for i, (lang, _, weight) in enumerate(LANGUAGE_PATTERNS)}
+_LANGUAGE_ORDER = list(dict.fromkeys(lang for lang, _, _ in LANGUAGE_PATTERNS))
+_language_cache = OrderedDict()
+_language_cache_lock = threading.Lock()
+
+
+def _score_language(code_text):
+    text = "\n" + code_text[:LANGUAGE_SCAN_LIMIT]
+    scores = dict.fromkeys(_LANGUAGE_ORDER, 0)
+    for match in _LANGUAGE_REGEX.finditer(text):
+        start = match.start()
+        if text[start].isalpha() and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            continue  # Treffer mitten in einem Wort
+        lang, weight = _LANGUAGE_BY_GROUP[match.lastgroup]
+        scores[lang] += weight
+        runner_up = max(score for other, score in scores.items() if other != lang)
+        if scores[lang] - runner_up >= LANGUAGE_DECISIVE_LEAD:
+            return lang  # Eindeutiger Vorsprung, der Rest des Blocks ändert nichts mehr
+    # Bei Gleichstand gewinnt die früher gelistete Sprache
+    best = max(_LANGUAGE_ORDER, key=lambda lang: scores[lang])
+    return best if scores[best] >= LANGUAGE_MIN_SCORE else ""
+
+
 def detect_language(code_text):
-    """Erkennt die Sprache eines Code-Blocks anhand typischer Muster."""
-    language_patterns = [
-        (r'function\s+\w+\s*\(|var\s+\w+\s*=|const\s+\w+\s*=|import\s+.*\s+from|export', 'javascript'),
-        (r'def\s+\w+\s*\(|import\s+\w+|class\s+\w+:|if\s+.*:', 'python'),
-        (r'<html|<body|<div|<script|<!DOCTYPE|<head', 'html'),
-        (r'body\s*{|margin:|padding:|font-family:|@media', 'css'),
-        (r'SELECT|INSERT INTO|UPDATE|DELETE FROM|CREATE TABLE', 'sql'),
-        (r'version:|services:|image:|volumes:|environment:|restart:', 'yaml'),
-        (r'#include|int\s+main|void\s+\w+\s*\(|printf|cout', 'cpp'),
-        (r'public\s+class|private\s+void|protected|@Override', 'java')
-    ]
+    """
+    Erkennt die Sprache eines Code-Blocks anhand typischer Muster.
+    Alle Sprachen werden in einem Durchlauf bewertet, die beste gewinnt.
+    Ergebnisse werden pro Inhalts-Hash in einem LRU-Cache gehalten.
+    """
+    key = hashlib.blake2b(code_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _language_cache_lock:
+        if key in _language_cache:
+            _language_cache.move_to_end(key)
+            return _language_cache[key]
+    language = _score_language(code_text)
+    with _language_cache_lock:
+        _language_cache[key] = language
+        if len(_language_cache) > LANGUAGE_CACHE_SIZE:
+            _language_cache.popitem(last=False)
+    return language
+
 
-    for pattern, lang in language_patterns:
-        if re.search(pattern, code_text, re.IGNORECASE):
-            return lang
-    return ""
+def detect_languages(code_texts):
+    """Erkennt die Sprachen vieler Code-Blöcke; identische Blöcke werden nur einmal bewertet."""
+    results = {}
+    languages = []
+    for text in code_texts:
+        if text not in results:
+            results[text] = detect_language(text)
+        languages.append(results[text])
+    return languages
 
 
 def identify_sections(text):
@@ -167,184 +903,408 @@ def identify_sections(text):
     return sections
 
 
-def create_markdown_document(title, content, code_blocks, sections):
-    """
-    Erstellt ein formatiertes Markdown-Dokument inklusive Inhaltsverzeichnis und Code-Blöcken.
-    Zusätzlich: Jede Zeile, die "click to open code" enthält, wird durch eine Codebox ersetzt.
-    """
-    markdown = "Hier findest du das vollständige Proof-of-Concept als Markdown-Dokument mit korrekt eingerücktem Code:\n\n"
-    markdown += "---\n\n"
-    markdown += f"# {title}\n\n"
+CODE_BLOCK_PLACEHOLDER = "<<<CODE_BLOCK_PLACEHOLDER>>>"
+_NEWLINE_RUN = re.compile(r'\n{4,}')
 
-    description_lines = []
-    for line in content.split('\n')[:10]:
-        line = line.strip()
-        if line and len(line) > 20:
-            description_lines.append(line)
-            if len(description_lines) >= 3:
-                break
-    if description_lines:
-        markdown += " ".join(description_lines) + "\n\n"
-    markdown += "---\n\n"
 
-    if len(sections) >= 3:
-        markdown += "## Inhaltsverzeichnis\n\n"
-        for idx, (_, sec_title) in enumerate(sections):
-            clean_title = sec_title.rstrip(':')
-            anchor = re.sub(r'[^a-z0-9\-]', '', clean_title.lower().replace(' ', '-'))
-            markdown += f"{idx + 1}. [{clean_title}](#{anchor})\n"
-        markdown += "\n---\n\n"
+def _iter_lines(text):
+    """Liefert die Zeilen eines Textes, ohne eine vollständige Zeilenliste anzulegen."""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _collapse_newlines(chunks):
+    """Begrenzt Folgen von Leerzeilen auf drei Umbrüche, auch über Chunk-Grenzen hinweg."""
+    pending = 0
+    for chunk in chunks:
+        body = chunk.lstrip("\n")
+        pending += len(chunk) - len(body)
+        if not body:
+            continue
+        text = body.rstrip("\n")
+        prefix = "\n" * (3 if pending >= 4 else pending)
+        yield prefix + _NEWLINE_RUN.sub("\n\n\n", text)
+        pending = len(body) - len(text)
+    if pending:
+        yield "\n" * (3 if pending >= 4 else pending)
 
-    processed_lines = []
-    lines = content.split('\n')
+
+def _content_lines(content, section_titles):
+    """
+    Wandelt den Fließtext zeilenweise um: Abschnittsüberschriften, Platzhalter
+    für "click to open code" und im Text erkannte Code-Blöcke.
+    """
     in_code = False
-    code_start = None
-    for i, line in enumerate(lines):
+    code_lines = []
+    for i, line in enumerate(_iter_lines(content)):
+        stripped = line.strip()
+        # Abschnittszeilen gehören auch leer zum Code-Block, nur eine andere Leerzeile beendet ihn
+        if in_code and (stripped or i in section_titles):
+            code_lines.append(line)
+
         # Falls die Zeile als Abschnitt erkannt wird, Überschrift hinzufügen
-        if any(i == idx for idx, _ in sections):
-            for idx, sec in sections:
-                if i == idx:
-                    processed_lines.append(f"## {sec.rstrip(':')}")
-                    processed_lines.append("")
-                    break
+        if i in section_titles:
+            yield f"## {section_titles[i].rstrip(':')}"
+            yield ""
             continue
 
         # Falls die Zeile den Marker "click to open code" enthält, Platzhalter einfügen
         if "click to open code" in line.lower():
-            processed_lines.append("<<<CODE_BLOCK_PLACEHOLDER>>>")
+            yield CODE_BLOCK_PLACEHOLDER
             continue
 
         # Optional: Erkennung von Code-Blöcken im Fließtext (z.B. bei "def", "import", "class")
-        if not in_code and (line.strip().startswith("def ") or
-                            line.strip().startswith("import ") or
-                            line.strip().startswith("class ")):
+        if not in_code and stripped.startswith(("def ", "import ", "class ")):
             in_code = True
-            code_start = i
+            code_lines = [line]
             continue
         elif in_code:
-            if not line.strip():
+            if not stripped:
                 in_code = False
-                code_text = "\n".join(lines[code_start:i])
-                language = detect_language(code_text)
-                processed_lines.append(f"```{language}")
-                processed_lines.append(code_text)
-                processed_lines.append("```")
-                processed_lines.append("")
+                code_text = "\n".join(code_lines)
+                yield f"```{detect_language(code_text)}"
+                yield code_text
+                yield "```"
+                yield ""
                 continue
-        processed_lines.append(line)
+        yield line
+
+
+def render_markdown_chunks(title, content, code_blocks, sections):
+    """
+    Erzeugt das Markdown-Dokument in einem Durchlauf als Folge von Text-Chunks,
+    die direkt in eine Datei geschrieben werden können.
+    Abschnitte werden über einen Index nach Zeilennummer nachgeschlagen.
+    """
+    return _collapse_newlines(_render_markdown_chunks(title, content, code_blocks, sections))
 
-    # Ersetze Platzhalter durch die extrahierten Code-Blöcke
-    final_lines = []
+
+def _render_markdown_chunks(title, content, code_blocks, sections):
+    yield "Hier findest du das vollständige Proof-of-Concept als Markdown-Dokument mit korrekt eingerücktem Code:\n\n"
+    yield "---\n\n"
+    yield f"# {title}\n\n"
+
+    description_lines = []
+    for i, line in enumerate(_iter_lines(content)):
+        if i >= 10:
+            break
+        line = line.strip()
+        if line and len(line) > 20:
+            description_lines.append(line)
+            if len(description_lines) >= 3:
+                break
+    if description_lines:
+        yield " ".join(description_lines) + "\n\n"
+    yield "---\n\n"
+
+    if len(sections) >= 3:
+        yield "## Inhaltsverzeichnis\n\n"
+        for idx, (_, sec_title) in enumerate(sections):
+            clean_title = sec_title.rstrip(':')
+            anchor = re.sub(r'[^a-z0-9\-]', '', clean_title.lower().replace(' ', '-'))
+            yield f"{idx + 1}. [{clean_title}](#{anchor})\n"
+        yield "\n---\n\n"
+
+    section_titles = {}
+    for idx, sec in sections:
+        section_titles.setdefault(idx, sec)
+
+    # Platzhalter direkt durch die extrahierten Code-Blöcke ersetzen
     code_idx = 0
-    for line in processed_lines:
-        if line.strip() == "<<<CODE_BLOCK_PLACEHOLDER>>>":
+    separator = ""
+    for line in _content_lines(content, section_titles):
+        if line.strip() == CODE_BLOCK_PLACEHOLDER:
             if code_idx < len(code_blocks):
-                code_text = code_blocks[code_idx]["text"]
-                language = code_blocks[code_idx]["language"]
-                final_lines.append(f"```{language}")
-                final_lines.append(code_text)
-                final_lines.append("```")
-                final_lines.append("")
+                block = code_blocks[code_idx]
+                yield f"{separator}```{block['language']}\n{block['text']}\n```\n"
                 code_idx += 1
             else:
-                final_lines.append("`Kein Code gefunden`")
+                yield f"{separator}`Kein Code gefunden`"
         else:
-            final_lines.append(line)
-
-    markdown += "\n".join(final_lines)
+            yield separator + line
+        separator = "\n"
 
     # Hänge alle noch nicht eingebetteten Code-Blöcke ans Ende an
-    for idx in range(code_idx, len(code_blocks)):
-        code_text = code_blocks[idx]["text"]
-        language = code_blocks[idx]["language"]
-        markdown += f"\n\n```{language}\n{code_text}\n```"
+    for block in code_blocks[code_idx:]:
+        yield f"\n\n```{block['language']}\n{block['text']}\n```"
 
-    markdown += "\n\n---"
-    markdown = re.sub(r'\n{4,}', '\n\n\n', markdown)
-    return markdown
+    yield "\n\n---"
 
 
-def extract_content_with_code_blocks(driver, output_widget):
+def create_markdown_document(title, content, code_blocks, sections):
     """
-    Extrahiert Titel, Hauptinhalt und alle Code-Blöcke von der Seite.
+    Erstellt ein formatiertes Markdown-Dokument inklusive Inhaltsverzeichnis und Code-Blöcken.
+    Zusätzlich: Jede Zeile, die "click to open code" enthält, wird durch eine Codebox ersetzt.
     """
-    try:
-        title = driver.title or "Extrahierter Inhalt"
-        output_widget.insert(tk.END, f"Seitentitel: {title}\n")
-    except Exception:
-        title = "Extrahierter Inhalt"
-        output_widget.insert(tk.END, "Konnte den Seitentitel nicht ermitteln.\n")
+    return "".join(render_markdown_chunks(title, content, code_blocks, sections))
 
-    main_content = ""
-    selectors = ["main", "#main", ".main-content", "article", ".content", "#content"]
-    for selector in selectors:
-        try:
-            elems = driver.find_elements(By.CSS_SELECTOR, selector)
-            if elems:
-                for elem in elems:
-                    main_content += elem.text + "\n\n"
-                output_widget.insert(tk.END, f"Hauptinhalt mit Selector '{selector}' gefunden.\n")
+
+class MarkdownDocument:
+    """
+    Ein extrahiertes Dokument, dessen Markdown erst bei Bedarf erzeugt wird.
+    render(*args) liefert die Text-Chunks; write() streamt sie direkt in eine
+    Datei, sodass das fertige Dokument nie vollständig im Speicher liegt.
+    """
+
+    def __init__(self, render, *args):
+        self._render = render
+        self._args = args
+
+    @classmethod
+    def from_text(cls, markdown_text):
+        """Ein bereits fertiges Markdown (z.B. aus dem Cache)."""
+        return cls(lambda text: (text,), markdown_text)
+
+    def chunks(self):
+        return self._render(*self._args)
+
+    def text(self):
+        return "".join(self.chunks())
+
+    def preview(self, limit=2000):
+        """Die ersten limit Zeichen; längere Dokumente werden nur so weit erzeugt."""
+        parts, length = [], 0
+        for chunk in self.chunks():
+            parts.append(chunk)
+            length += len(chunk)
+            if length >= limit:
                 break
-        except Exception:
+        text = "".join(parts)
+        return text if len(text) < limit else text[:limit] + "\n...(gekürzt)"
+
+    def write(self, path):
+        """Schreibt das Dokument chunkweise nach path und gibt die Anzahl Bytes zurück."""
+        written = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in self.chunks():
+                f.write(chunk)
+                written += len(chunk.encode("utf-8"))
+        return written
+
+
+def deduplicate_code_blocks(code_blocks):
+    """
+    Entfernt verschachtelte und wiederholte Code-Blöcke und erhält die Dokumentreihenfolge.
+    Jeder Block trägt position/end (Index des Elements und seines letzten
+    Nachfahren in Dokumentreihenfolge). Liegt ein Block innerhalb eines
+    früheren Treffers, etwa <code> in <pre>, wird er verworfen, ebenso Blöcke,
+    deren whitespace-normalisierter Inhalt bereits vorkam.
+    """
+    # Äußere Elemente vor inneren, Blöcke ohne Position ans Ende
+    ordered = sorted(code_blocks, key=lambda block: (
+        block.get("position") is None,
+        block.get("position") or 0,
+        -(block.get("end") or 0),
+    ))
+    unique = []
+    seen_hashes = set()
+    container_end = -1
+    for block in ordered:
+        position = block.get("position")
+        if position is not None:
+            if position <= container_end:
+                continue
+            container_end = block.get("end", position)
+        normalized = " ".join(block["text"].split())
+        digest = hashlib.blake2b(normalized.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        if digest in seen_hashes:
             continue
+        seen_hashes.add(digest)
+        unique.append(dict(block))
+    return unique
+
+
+def extract_content_with_code_blocks(driver, output_widget, selectors=None):
+    """
+    Extrahiert Titel, Hauptinhalt und alle Code-Blöcke von der Seite.
+    Der Browser liefert alle Daten in einem einzigen Aufruf (DOM_SNAPSHOT_JS);
+    hier wird nur noch das JSON-Ergebnis ausgewertet.
+    Mit PageSelectors werden deren Listen verwendet und die Treffer gemeldet.
+    """
+    if selectors is None:
+        content_selectors, code_selectors = CONTENT_SELECTORS, CODE_SELECTORS
+    else:
+        content_selectors, code_selectors = selectors.content, selectors.code
+    snapshot = json.loads(driver.execute_script(DOM_SNAPSHOT_JS, content_selectors, code_selectors))
+
+    title = snapshot.get("title") or "Extrahierter Inhalt"
+    output_widget.insert(tk.END, f"Seitentitel: {title}\n")
+
+    main_content = snapshot.get("content", "")
+    if snapshot.get("contentSelector"):
+        output_widget.insert(tk.END, f"Hauptinhalt mit Selector '{snapshot['contentSelector']}' gefunden.\n")
     if not main_content.strip():
-        try:
-            main_content = driver.find_element(By.TAG_NAME, "body").text
-            output_widget.insert(tk.END, "Kein spezifischer Hauptinhalt gefunden – Body-Text verwendet.\n")
-        except Exception:
-            raise Exception("Kein Textinhalt gefunden.")
+        main_content = snapshot.get("bodyText", "")
+        if not main_content.strip():
+            raise NoTextContent("Kein Textinhalt gefunden.")
+        output_widget.insert(tk.END, "Kein spezifischer Hauptinhalt gefunden – Body-Text verwendet.\n")
 
-    code_blocks = []
-    code_selectors = ["pre", "code", ".code", ".hljs", ".syntax-highlighting", "[class*='language-']"]
     output_widget.insert(tk.END, "Suche nach Code-Blöcken...\n")
-    for selector in code_selectors:
-        try:
-            elems = driver.find_elements(By.CSS_SELECTOR, selector)
-            for elem in elems:
-                text = elem.text.strip()
-                if text:
-                    language = detect_language(text)
-                    code_blocks.append({"text": text, "language": language})
-        except Exception as e:
-            output_widget.insert(tk.END, f"Fehler bei Code-Selector {selector}: {str(e)}\n")
-    output_widget.insert(tk.END, f"Insgesamt {len(code_blocks)} Code-Blöcke extrahiert.\n")
+    for error in snapshot.get("errors", []):
+        output_widget.insert(tk.END, f"Fehler bei Code-Selector {error}\n")
+    raw_blocks = snapshot.get("codeBlocks", [])
+    code_blocks = deduplicate_code_blocks(raw_blocks)
+    languages = detect_languages([block["text"] for block in code_blocks])
+    for block, language in zip(code_blocks, languages):
+        block["language"] = language
+    output_widget.insert(tk.END, f"Insgesamt {len(code_blocks)} Code-Blöcke extrahiert "
+                                 f"({len(raw_blocks) - len(code_blocks)} Duplikate entfernt).\n")
+    if selectors is not None:
+        selectors.observe("content", [snapshot.get("contentSelector")])
+        selectors.observe("code", [block["selector"] for block in code_blocks])
     return title, main_content, code_blocks
 
 
-def process_page(url, output_widget):
+def load_page(driver, url, output_widget):
+    """
+    Lädt die URL im bestehenden Browser und wartet auf das vollständige Laden.
+    Dauert das Laden länger als das Seitenlade-Limit des Browsers, wird es
+    abgebrochen und mit dem bis dahin geladenen Inhalt weitergearbeitet.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    output_widget.progress("load", 0)
+    with metrics.span("navigate"):
+        try:
+            driver.get(url)
+        except TimeoutException:
+            output_widget.insert(tk.END, "Seite lädt zu lange – verwende den bisher geladenen Inhalt.\n")
+            driver.execute_script("window.stop();")
+    output_widget.insert(tk.END, "Warte auf vollständiges Laden der Seite...\n")
+    with metrics.span("wait"):
+        loaded = wait_for_page_load(driver)
+    if loaded:
+        output_widget.insert(tk.END, "Seite wurde erfolgreich geladen.\n")
+    else:
+        output_widget.insert(tk.END, "Seite wurde geladen, aber möglicherweise nicht vollständig.\n")
+    output_widget.progress("load", 1)
+
+
+def convert_loaded_page(driver, output_widget, cache=None, url=None, expansion="batch", converter="dom",
+                        profiles=None):
+    """
+    Klickt interaktive Elemente, extrahiert die Inhalte der geladenen Seite
+    und gibt (Titel, MarkdownDocument) zurück. Öffnet keine Dialoge.
+    Mit einem PageCache wird vor dem Klicken ein Schnappschuss erstellt:
+    Stimmt sein Hash mit dem gespeicherten überein, wird das zwischengespeicherte
+    Markdown ohne Klick-Phase wiederverwendet.
+    expansion wählt, wie eingeklappte Inhalte geöffnet werden (siehe EXPANSION_MODES),
+    converter, wie daraus Markdown wird (siehe CONVERTERS).
+    Mit SelectorProfiles werden nur die für die Domain bewährten Selektoren
+    verwendet und die Beobachtungen der Seite ins Profil übernommen.
+    """
+    check_modes(expansion=expansion, converter=converter)
+    selectors = profiles.selectors(url) if profiles is not None else None
+    digest = None
+    if cache is not None:
+        try:
+            with metrics.span("extract"):
+                digest = snapshot_hash(*extract_content_with_code_blocks(driver, output_widget, selectors),
+                                       variant=converter if converter != "text" else None)
+        except NoTextContent:
+            # Text erscheint erst nach dem Aufklappen: kein Vergleich möglich, wie ein Fehltreffer behandeln
+            output_widget.insert(tk.END, "Noch kein Text vor dem Aufklappen – Cache wird übersprungen.\n")
+        entry = cache.entry(url)
+        if digest is not None and entry and entry.get("snapshot_hash") == digest:
+            cached = cache.reuse(url)
+            if cached is not None:
+                output_widget.insert(tk.END, "Inhalt unverändert – Ergebnis aus dem Cache übernommen.\n")
+                return cached[0], MarkdownDocument.from_text(cached[1])
+
+    with metrics.span("interact"):
+        if expansion == "click":
+            output_widget.insert(tk.END, "Starte automatisches Klicken auf interaktive Elemente...\n")
+            click_interactive_elements(driver, output_widget, selectors=selectors)
+        else:
+            output_widget.insert(tk.END, "Öffne eingeklappte und nachgeladene Inhalte...\n")
+            expand_page(driver, output_widget)
+
+    check_cancelled(output_widget)
+    output_widget.insert(tk.END, "Extrahiere Inhalte und Code-Blöcke...\n")
+    output_widget.progress("extract", 0)
+    if converter == "dom":
+        from dom_markdown import convert_html, render_markdown_document_chunks
+
+        with metrics.span("extract"):
+            html = driver.execute_script(HTML_SNAPSHOT_JS)
+            title, body, headings = convert_html(html, driver.current_url, selectors)
+        output_widget.progress("extract", 1)
+        output_widget.progress("render", 0)
+        document = MarkdownDocument(render_markdown_document_chunks, title, body, headings)
+        output_widget.insert(tk.END, f"{len(headings)} Überschriften übernommen.\n")
+    else:
+        with metrics.span("extract"):
+            title, content, code_blocks = extract_content_with_code_blocks(driver, output_widget, selectors)
+        output_widget.progress("extract", 1)
+        metrics.count("code_blocks", len(code_blocks))
+
+        output_widget.progress("render", 0)
+        with metrics.span("render"):
+            sections = identify_sections(content)
+        document = MarkdownDocument(render_markdown_chunks, title, content, code_blocks, sections)
+        output_widget.insert(tk.END, f"{len(sections)} Abschnitte identifiziert.\n")
+    output_widget.progress("render", 1)
+    if profiles is not None:
+        profiles.record(url, selectors)
+    if cache is not None:
+        with metrics.span("render"):
+            markdown_text = document.text()  # Der Cache speichert das fertige Markdown
+        cache.store(url, title, markdown_text, digest, source="browser")
+        document = MarkdownDocument.from_text(markdown_text)
+    return title, document
+
+
+def collect_links(driver):
+    """Liefert die absoluten Ziele aller Verweise der geladenen Seite in einem Aufruf."""
+    return driver.execute_script("return Array.from(document.links, function (a) { return a.href; });") or []
+
+
+def process_page(url, output_widget, browser=None):
     """
     Hauptfunktion: Lädt die Seite, interagiert, extrahiert Inhalte und speichert das Markdown.
+    Mit einem WarmBrowser wird dessen Browser wiederverwendet und bleibt danach
+    geöffnet; ohne wird ein eigener gestartet und am Ende geschlossen.
+    Ist die Umgebungsvariable RUNASMART_PROFILE gesetzt, wird der Lauf mit
+    cProfile profiliert und die Statistik in diese Datei geschrieben.
     """
-    driver = None
+    profile_path = os.environ.get("RUNASMART_PROFILE")
+    with metrics.page_metrics(url) as page_metrics:
+        if profile_path:
+            with metrics.profiled(profile_path):
+                _process_page(url, output_widget, browser)
+            output_widget.insert(tk.END, f"Profil wurde nach {profile_path} geschrieben.\n")
+        else:
+            _process_page(url, output_widget, browser)
+    output_widget.insert(tk.END, f"\n{page_metrics.summary()}\n")
+
+
+def _process_page(url, output_widget, browser=None):
+    own_browser = browser is None
+    if own_browser:
+        browser = WarmBrowser()
     try:
         output_widget.delete(1.0, tk.END)
-        output_widget.insert(tk.END, f"Starte Browser und lade Seite: {url}\n")
-        driver = get_secure_driver()
-        driver.get(url)
-        output_widget.insert(tk.END, "Warte auf vollständiges Laden der Seite...\n")
-        if wait_for_page_load(driver):
-            output_widget.insert(tk.END, "Seite wurde erfolgreich geladen.\n")
-        else:
-            output_widget.insert(tk.END, "Seite wurde geladen, aber möglicherweise nicht vollständig.\n")
+        output_widget.insert(tk.END, f"Bereite Browser vor und lade Seite: {url}\n")
+        driver = browser.get()
+        load_page(driver, url, output_widget)
 
-        if not messagebox.askokcancel("Manuelle Eingabe",
-                                      "Bitte schließe störende Popups und führe notwendige Aktionen durch. Klicke OK, wenn alles bereit ist."):
+        if not output_widget.call_in_ui(
+                messagebox.askokcancel, "Manuelle Eingabe",
+                "Bitte schließe störende Popups und führe notwendige Aktionen durch. Klicke OK, wenn alles bereit ist."):
             output_widget.insert(tk.END, "Prozess wurde vom Nutzer abgebrochen.\n")
             return
 
-        output_widget.insert(tk.END, "Starte automatisches Klicken auf interaktive Elemente...\n")
-        click_interactive_elements(driver, output_widget)
-
-        output_widget.insert(tk.END, "Extrahiere Inhalte und Code-Blöcke...\n")
-        title, content, code_blocks = extract_content_with_code_blocks(driver, output_widget)
-
-        sections = identify_sections(content)
-        output_widget.insert(tk.END, f"{len(sections)} Abschnitte identifiziert.\n")
-
-        markdown_text = create_markdown_document(title, content, code_blocks, sections)
+        title, document = convert_loaded_page(driver, output_widget)
 
         # Datei speichern
-        save_path = filedialog.asksaveasfilename(
+        save_path = output_widget.call_in_ui(
+            filedialog.asksaveasfilename,
             defaultextension=".md",
             filetypes=[("Markdown Dateien", "*.md"), ("Alle Dateien", "*.*")],
             title="Speicherort für Markdown-Dokument wählen"
@@ -353,37 +1313,168 @@ def process_page(url, output_widget):
             output_widget.insert(tk.END, "Speicheraktion abgebrochen.\n")
             return
 
-        with open(save_path, "w", encoding="utf-8") as f:
-            f.write(markdown_text)
+        output_widget.progress("save", 0)
+        with metrics.span("write"):
+            metrics.count("bytes_written", document.write(save_path))
+        output_widget.progress("save", 1)
 
         output_widget.insert(tk.END, "\n--- Vorschau des generierten Markdown-Dokuments ---\n\n")
-        preview = markdown_text if len(markdown_text) < 2000 else markdown_text[:2000] + "\n...(gekürzt)"
-        output_widget.insert(tk.END, preview)
+        output_widget.insert(tk.END, document.preview(2000))
 
         output_widget.insert(tk.END, "\n\nFeedback: Markdown-Dokument wurde erfolgreich erstellt und in die Datei gespeichert!\n")
-        messagebox.showinfo("Erfolg", f"Das Markdown-Dokument wurde erfolgreich unter {save_path} gespeichert!")
+        output_widget.call_in_ui(messagebox.showinfo, "Erfolg",
+                                 f"Das Markdown-Dokument wurde erfolgreich unter {save_path} gespeichert!")
+    except ProcessingCancelled:
+        output_widget.insert(tk.END, "\nVerarbeitung wurde abgebrochen.\n")
     except Exception as e:
         err_msg = f"Fehler bei der Verarbeitung: {str(e)}"
         output_widget.insert(tk.END, f"\nFEHLER: {err_msg}\n")
-        messagebox.showerror("Fehler", err_msg)
+        output_widget.call_in_ui(messagebox.showerror, "Fehler", err_msg)
     finally:
-        if driver:
+        if own_browser and browser.driver is not None:
+            browser.quit()
+            output_widget.insert(tk.END, "\nBrowser wurde geschlossen.\n")
+
+
+PHASES = [
+    ("load", "Seite laden"),
+    ("click", "Interaktive Elemente"),
+    ("extract", "Extraktion"),
+    ("render", "Markdown erstellen"),
+    ("save", "Speichern"),
+]
+
+
+class QueueOutput:
+    """
+    Thread-sichere Ausgabe für den Worker-Thread. Statt das Tk-Widget direkt
+    zu verändern, landen alle Meldungen in einer Warteschlange, die LogPump
+    im Tk-Hauptthread abarbeitet.
+    """
+
+    def __init__(self, message_queue):
+        self._queue = message_queue
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def insert(self, index, text):
+        self._queue.put(("text", text))
+
+    def delete(self, start, end=None):
+        self._queue.put(("clear",))
+
+    def update(self):
+        pass
+
+    def progress(self, phase, value, maximum=1):
+        self._queue.put(("progress", phase, value, maximum))
+
+    def finished(self):
+        self._queue.put(("finished",))
+
+    def call_in_ui(self, func, *args, **kwargs):
+        """Führt func (z.B. einen Dialog) im Tk-Hauptthread aus und wartet auf das Ergebnis."""
+        result = {}
+        done = threading.Event()
+        self._queue.put(("call", func, args, kwargs, result, done))
+        done.wait()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+
+class LogPump:
+    """
+    Leert die Meldungs-Warteschlange im Tk-Hauptthread per after() in Stapeln:
+    Text wird gesammelt und mit einem einzigen insert eingefügt, die
+    Scrollback-Länge ist auf max_lines begrenzt.
+    """
+
+    def __init__(self, root, text_widget, progress_bars, interval_ms=50, batch_size=500, max_lines=5000,
+                 on_finished=None):
+        self.root = root
+        self.text_widget = text_widget
+        self.progress_bars = progress_bars
+        self.interval_ms = interval_ms
+        self.batch_size = batch_size
+        self.max_lines = max_lines
+        self.on_finished = on_finished
+        self.queue = queue.Queue()
+        self.root.after(self.interval_ms, self._drain)
+
+    def new_output(self):
+        """Erzeugt die Ausgabe für einen neuen Verarbeitungslauf."""
+        for bar in self.progress_bars.values():
+            bar["value"] = 0
+        return QueueOutput(self.queue)
+
+    def _flush_text(self, parts):
+        if not parts:
+            return
+        self.text_widget.insert(tk.END, "".join(parts))
+        parts.clear()
+        line_count = int(self.text_widget.index("end-1c").split(".")[0])
+        if line_count > self.max_lines:
+            self.text_widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+        self.text_widget.see(tk.END)
+
+    def _drain(self):
+        parts = []
+        for _ in range(self.batch_size):
             try:
-                driver.quit()
-                output_widget.insert(tk.END, "\nBrowser wurde geschlossen.\n")
-            except Exception:
-                pass
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "text":
+                parts.append(message[1])
+                continue
+            self._flush_text(parts)
+            if kind == "clear":
+                self.text_widget.delete("1.0", tk.END)
+            elif kind == "progress":
+                _, phase, value, maximum = message
+                bar = self.progress_bars.get(phase)
+                if bar is not None:
+                    bar["value"] = 100.0 * value / maximum if maximum else 100.0
+            elif kind == "call":
+                _, func, args, kwargs, result, done = message
+                try:
+                    result["value"] = func(*args, **kwargs)
+                except Exception as e:
+                    result["error"] = e
+                finally:
+                    done.set()
+            elif kind == "finished" and self.on_finished:
+                self.on_finished()
+        self._flush_text(parts)
+        self.root.after(self.interval_ms, self._drain)
 
 
-def start_processing(url_entry, output_widget):
-    """Startet den Verarbeitungsprozess in einem separaten Thread."""
+def _run_and_finish(url, output, browser):
+    try:
+        process_page(url, output, browser)
+    finally:
+        output.finished()
+
+
+def start_processing(url_entry, log_pump, browser=None):
+    """Startet den Verarbeitungsprozess in einem separaten Thread und gibt dessen Ausgabe zurück."""
     url = url_entry.get().strip()
     if not url:
         messagebox.showwarning("Warnung", "Bitte eine URL eingeben.")
-        return
-    thread = threading.Thread(target=process_page, args=(url, output_widget))
+        return None
+    output = log_pump.new_output()
+    thread = threading.Thread(target=_run_and_finish, args=(url, output, browser))
     thread.daemon = True
     thread.start()
+    return output
 
 
 def create_ui():
@@ -402,12 +1493,43 @@ def create_ui():
     url_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
     url_entry.insert(0, "https://example.com")
 
-    start_button = ttk.Button(
-        url_frame,
-        text="Seite laden und verarbeiten",
-        command=lambda: start_processing(url_entry, output_text)
-    )
+    current = {"output": None}
+    # Bleibt über alle Läufe geöffnet und wird schon beim Start im Hintergrund hochgefahren
+    browser = WarmBrowser()
+    browser.warm_up()
+
+    def on_start():
+        output = start_processing(url_entry, log_pump, browser)
+        if output is not None:
+            current["output"] = output
+            start_button.state(["disabled"])
+            cancel_button.state(["!disabled"])
+
+    def on_cancel():
+        if current["output"] is not None:
+            current["output"].cancel()
+            cancel_button.state(["disabled"])
+
+    def on_finished():
+        current["output"] = None
+        start_button.state(["!disabled"])
+        cancel_button.state(["disabled"])
+
+    start_button = ttk.Button(url_frame, text="Seite laden und verarbeiten", command=on_start)
     start_button.pack(side=tk.LEFT, padx=5)
+    cancel_button = ttk.Button(url_frame, text="Abbrechen", command=on_cancel)
+    cancel_button.pack(side=tk.LEFT, padx=5)
+    cancel_button.state(["disabled"])
+
+    progress_frame = ttk.LabelFrame(mainframe, text="Fortschritt")
+    progress_frame.pack(fill=tk.X, pady=5)
+    progress_bars = {}
+    for row, (phase, label) in enumerate(PHASES):
+        ttk.Label(progress_frame, text=label).grid(row=row, column=0, sticky=tk.W, padx=5, pady=1)
+        bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
+        bar.grid(row=row, column=1, sticky=tk.EW, padx=5, pady=1)
+        progress_bars[phase] = bar
+    progress_frame.columnconfigure(1, weight=1)
 
     output_frame = ttk.LabelFrame(mainframe, text="Status und Vorschau")
     output_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -417,12 +1539,17 @@ def create_ui():
     output_text.insert(tk.END,
                        "=== Markdown-Extraktor gestartet ===\n\nBitte gib die URL der Seite ein und klicke auf 'Seite laden und verarbeiten'.\n")
 
+    log_pump = LogPump(root, output_text, progress_bars, on_finished=on_finished)
+
     def on_close():
         if messagebox.askokcancel("Beenden", "Möchtest du das Programm wirklich beenden?"):
+            if current["output"] is not None:
+                current["output"].cancel()
             root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
+    browser.quit()
 
 
 if __name__ == "__main__":
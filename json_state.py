@@ -0,0 +1,47 @@
+import json
+import os
+
+
+def read_json_state(path):
+    """Liest eine mit JsonStateFile geschriebene Datei; fehlt sie oder ist sie defekt, ein leeres Dictionary."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class JsonStateFile:
+    """
+    Mixin für Klassen, die ihren Zustand in einer JSON-Datei halten.
+    _mark_dirty() zählt Änderungen; nach save_interval Änderungen wird die
+    Datei über eine .tmp-Datei atomar neu geschrieben. Die Klasse setzt
+    state_path, save_interval, self._lock und self._dirty und liefert den
+    Dateiinhalt über _state(); _mark_dirty und _save_locked laufen unter self._lock.
+    """
+
+    save_interval = 50
+    state_indent = None
+
+    def _state(self):
+        raise NotImplementedError
+
+    def _mark_dirty(self):
+        self._dirty += 1
+        if self._dirty >= self.save_interval:
+            self._save_locked()
+
+    def _save_locked(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state(), f, indent=self.state_indent)
+        os.replace(tmp_path, self.state_path)
+        self._dirty = 0
+
+    def save(self):
+        """Schreibt den Zustand auf die Festplatte."""
+        with self._lock:
+            self._save_locked()
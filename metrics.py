@@ -0,0 +1,185 @@
+import contextlib
+import cProfile
+import json
+import threading
+import time
+
+PROMETHEUS_PREFIX = "runasmart"
+
+_current = threading.local()
+
+
+class PageMetrics:
+    """
+    Zeiten und Zähler einer einzelnen Seitenkonvertierung.
+    Zeitspannen (z.B. navigate, wait, interact, extract, render, write) werden
+    in Sekunden aufsummiert, Zähler (z.B. webdriver_calls, elements_clicked,
+    code_blocks, bytes_written) als ganze Zahlen.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.started = time.time()
+        self.spans = {}
+        self.counters = {}
+        self.error = None
+        self._start = time.perf_counter()
+        self.total = None
+
+    def add_span(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def finish(self, error=None):
+        self.total = time.perf_counter() - self._start
+        self.error = error
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "started": self.started,
+            "total_s": self.total,
+            "spans_s": self.spans,
+            "counters": self.counters,
+            "error": self.error,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def summary(self):
+        """Kurze, lesbare Zusammenfassung für das Statusfenster."""
+        spans = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.spans.items())
+        counters = ", ".join(f"{name} {value}" for name, value in self.counters.items())
+        return f"Zeiten: {spans or '-'}\nZähler: {counters or '-'}"
+
+
+def current():
+    """Die PageMetrics der Seite, die der aktuelle Thread gerade verarbeitet (oder None)."""
+    return getattr(_current, "metrics", None)
+
+
+@contextlib.contextmanager
+def page_metrics(url):
+    """Erfasst alle Zeitspannen und Zähler dieses Threads für die Seite url."""
+    metrics = PageMetrics(url)
+    previous = current()
+    _current.metrics = metrics
+    try:
+        yield metrics
+    except BaseException as e:
+        metrics.finish(error=str(e) or type(e).__name__)
+        raise
+    else:
+        metrics.finish()
+    finally:
+        _current.metrics = previous
+
+
+@contextlib.contextmanager
+def span(name):
+    """Misst die Dauer des Blocks als Zeitspanne name der aktuellen Seite."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = current()
+        if metrics is not None:
+            metrics.add_span(name, time.perf_counter() - start)
+
+
+def count(name, amount=1):
+    """Erhöht den Zähler name der aktuellen Seite; ohne aktive Messung wirkungslos."""
+    metrics = current()
+    if metrics is not None:
+        metrics.count(name, amount)
+
+
+def instrument_driver(driver):
+    """
+    Zählt jeden WebDriver-Befehl als webdriver_calls. Auch WebElement-Aufrufe
+    (text, click, is_displayed, ...) laufen über driver.execute und werden erfasst.
+    """
+    if getattr(driver, "_runasmart_instrumented", False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        count("webdriver_calls")
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    driver._runasmart_instrumented = True
+    return driver
+
+
+class MetricsCollector:
+    """Sammelt die PageMetrics eines Laufs, schreibt JSON-Zeilen und Prometheus-Text."""
+
+    def __init__(self, jsonl_path=None):
+        self._lock = threading.Lock()
+        self._records = []
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+
+    def add(self, metrics):
+        with self._lock:
+            self._records.append(metrics)
+            if self._jsonl is not None:
+                self._jsonl.write(metrics.to_json() + "\n")
+                self._jsonl.flush()
+
+    def close(self):
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+    def to_prometheus(self):
+        """Aggregierte Werte aller Seiten im Prometheus-Textformat."""
+        with self._lock:
+            records = list(self._records)
+        span_sums, span_counts, counter_sums = {}, {}, {}
+        for record in records:
+            for name, seconds in record.spans.items():
+                span_sums[name] = span_sums.get(name, 0.0) + seconds
+                span_counts[name] = span_counts.get(name, 0) + 1
+            for name, value in record.counters.items():
+                counter_sums[name] = counter_sums.get(name, 0) + value
+        failed = sum(1 for record in records if record.error)
+
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_pages_total Verarbeitete Seiten.",
+            f"# TYPE {p}_pages_total counter",
+            f'{p}_pages_total{{result="ok"}} {len(records) - failed}',
+            f'{p}_pages_total{{result="error"}} {failed}',
+            f"# HELP {p}_phase_seconds Dauer der Verarbeitungsphasen.",
+            f"# TYPE {p}_phase_seconds summary",
+        ]
+        for name in sorted(span_sums):
+            lines.append(f'{p}_phase_seconds_sum{{phase="{name}"}} {span_sums[name]:.6f}')
+            lines.append(f'{p}_phase_seconds_count{{phase="{name}"}} {span_counts[name]}')
+        for name in sorted(counter_sums):
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {counter_sums[name]}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """
+    Profiliert den Block mit cProfile im aktuellen Thread und schreibt die
+    Statistik nach path (auswertbar mit python -m pstats path).
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    markdown TEXT NOT NULL,
+    code_blocks TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_document ON pages(document_id);
+"""
+# Volltextindex über Titel und Markdown; Inhalte liegen nur einmal in documents
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS document_search
+USING fts5(title, markdown, content='documents', content_rowid='id')
+"""
+_CODE_FENCE = re.compile(r"^([ \t]*)(`{3,})([\w+#-]*)[ \t]*\n(.*?)\n\1\2[ \t]*$", re.MULTILINE | re.DOTALL)
+
+
+def content_hash(markdown_text):
+    return hashlib.sha256(markdown_text.encode("utf-8")).hexdigest()
+
+
+def extract_code_blocks(markdown_text):
+    """Liefert die umzäunten Code-Blöcke eines Markdown-Dokuments als [{"language", "text"}]."""
+    blocks = []
+    for match in _CODE_FENCE.finditer(markdown_text):
+        indent = match.group(1)
+        lines = match.group(4).split("\n")
+        if indent:
+            lines = [line[len(indent):] if line.startswith(indent) else line for line in lines]
+        blocks.append({"language": match.group(3), "text": "\n".join(lines)})
+    return blocks
+
+
+class OutputStore:
+    """
+    Speichert alle konvertierten Seiten in einer SQLite-Datenbank statt in
+    einzelnen Dateien. Seiten werden gepuffert und in Sammel-Transaktionen zu
+    je batch_size Einträgen geschrieben. Identische Dokumente (gleicher Hash des
+    Markdowns) liegen nur einmal in der Datenbank, auch wenn mehrere URLs oder
+    erneute Konvertierungen darauf verweisen. Über Titel und Markdown wird ein
+    FTS5-Volltextindex gepflegt, sofern SQLite ihn unterstützt.
+    """
+
+    def __init__(self, path, batch_size=200):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = []
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.execute(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self.full_text = False  # SQLite ohne FTS5: Speichern funktioniert, Suche nicht
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def store(self, url, title, markdown_text, fetched_at=None):
+        """Merkt eine Seite zum Speichern vor; geschrieben wird gesammelt."""
+        record = (url, title, markdown_text, fetched_at or time.time())
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        # Erst nach dem Commit verwerfen: Scheitert die Transaktion, bleibt der Stapel gepuffert
+        with self._conn:
+            for url, title, markdown_text, fetched_at in self._pending:
+                self._write(url, title, markdown_text, fetched_at)
+        self._pending = []
+
+    def _write(self, url, title, markdown_text, fetched_at):
+        digest = content_hash(markdown_text)
+        row = self._conn.execute("SELECT id FROM documents WHERE hash = ?", (digest,)).fetchone()
+        if row:
+            document_id = row[0]
+        else:
+            document_id = self._conn.execute(
+                "INSERT INTO documents (hash, title, markdown, code_blocks) VALUES (?, ?, ?, ?)",
+                (digest, title, markdown_text, json.dumps(extract_code_blocks(markdown_text), ensure_ascii=False)),
+            ).lastrowid
+            if self.full_text:
+                self._conn.execute("INSERT INTO document_search (rowid, title, markdown) VALUES (?, ?, ?)",
+                                   (document_id, title, markdown_text))
+        previous = self._conn.execute("SELECT document_id FROM pages WHERE url = ?", (url,)).fetchone()
+        self._conn.execute(
+            "INSERT INTO pages (url, document_id, fetched_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET document_id = excluded.document_id, fetched_at = excluded.fetched_at",
+            (url, document_id, fetched_at),
+        )
+        if previous and previous[0] != document_id:
+            self._drop_if_unused(previous[0])
+
+    def _drop_if_unused(self, document_id):
+        if self._conn.execute("SELECT 1 FROM pages WHERE document_id = ? LIMIT 1", (document_id,)).fetchone():
+            return
+        if self.full_text:
+            title, markdown_text = self._conn.execute(
+                "SELECT title, markdown FROM documents WHERE id = ?", (document_id,)).fetchone()
+            self._conn.execute(
+                "INSERT INTO document_search (document_search, rowid, title, markdown) VALUES ('delete', ?, ?, ?)",
+                (document_id, title, markdown_text))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+
+    def get(self, url):
+        """Gibt (Titel, Markdown) einer gespeicherten URL zurück oder None."""
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT d.title, d.markdown FROM pages p JOIN documents d ON d.id = p.document_id WHERE p.url = ?",
+                (url,)).fetchone()
+
+    def code_blocks(self, url):
+        """Die Code-Blöcke einer gespeicherten URL als [{"language", "text"}]."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT d.code_blocks FROM pages p JOIN documents d ON d.id = p.document_id WHERE p.url = ?",
+                (url,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def search(self, query, limit=20):
+        """Volltextsuche (FTS5-Syntax); liefert [(URL, Titel, Ausschnitt)] nach Relevanz."""
+        if not self.full_text:
+            raise RuntimeError("Diese SQLite-Version unterstützt keine FTS5-Volltextsuche.")
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT p.url, d.title, snippet(document_search, 1, '[', ']', '…', 12) "
+                "FROM document_search JOIN documents d ON d.id = document_search.rowid "
+                "JOIN pages p ON p.document_id = d.id "
+                "WHERE document_search MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit)).fetchall()
+
+    def iter_pages(self, chunk_size=100):
+        """
+        Liefert (URL, Titel, Markdown, Abrufzeit) aller Seiten über eine eigene
+        Leseverbindung in Portionen, ohne die Datenbank in den Speicher zu laden.
+        """
+        self.flush()
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(
+                "SELECT p.url, d.title, d.markdown, p.fetched_at FROM pages p "
+                "JOIN documents d ON d.id = p.document_id ORDER BY p.url")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def export(self, directory, filename_for=None):
+        """Schreibt jede gespeicherte Seite als .md-Datei nach directory; gibt die Anzahl zurück."""
+        if filename_for is None:
+            from batch_runner import url_to_filename as filename_for
+        os.makedirs(directory, exist_ok=True)
+        count = 0
+        for url, _, markdown_text, _ in self.iter_pages():
+            with open(os.path.join(directory, filename_for(url)), "w", encoding="utf-8") as f:
+                f.write(markdown_text)
+            count += 1
+        return count
+
+    def stats(self):
+        self.flush()
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            documents, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(markdown AS BLOB))), 0) FROM documents").fetchone()
+        file_bytes = sum(os.path.getsize(path) for path in (self.path, self.path + "-wal") if os.path.exists(path))
+        return {"pages": pages, "documents": documents, "markdown_bytes": size, "file_bytes": file_bytes}
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durchsucht und exportiert eine Markdown-Datenbank.")
+    parser.add_argument("database", help="SQLite-Datei (z.B. aus batch_runner --store)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Alle Seiten als .md-Dateien in ein Verzeichnis schreiben")
+    export_parser.add_argument("output_dir", help="Zielverzeichnis")
+    search_parser = commands.add_parser("search", help="Volltextsuche über Titel und Inhalt")
+    search_parser.add_argument("query", help="Suchbegriff (FTS5-Syntax)")
+    search_parser.add_argument("-n", "--limit", type=int, default=20, help="Maximale Anzahl Treffer")
+    commands.add_parser("stats", help="Anzahl Seiten, Dokumente und Größe anzeigen")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"Datenbank nicht gefunden: {args.database}")
+        return 1
+    with OutputStore(args.database) as store:
+        if args.command == "export":
+            count = store.export(args.output_dir)
+            print(f"{count} Seiten nach {args.output_dir} exportiert.")
+        elif args.command == "search":
+            for url, title, snippet in store.search(args.query, args.limit):
+                print(f"{title} – {url}\n    {snippet}")
+        else:
+            stats = store.stats()
+            print(f"Seiten:      {stats['pages']}")
+            print(f"Dokumente:   {stats['documents']}")
+            print(f"Markdown:    {stats['markdown_bytes'] / 1024:.0f} KiB")
+            print(f"Dateigröße:  {stats['file_bytes'] / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
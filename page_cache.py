@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from json_state import JsonStateFile, read_json_state
+
+INDEX_FILE = "index.json"
+# Nach so vielen Änderungen wird der Index zwischendurch gespeichert
+SAVE_INTERVAL = 50
+
+
+def snapshot_hash(title, content, code_blocks, variant=None):
+    """
+    Hash über die extrahierten Inhalte einer Seite (Titel, Text, Code-Blöcke).
+    variant unterscheidet Ergebnisse verschiedener Konverter für dieselben Inhalte.
+    """
+    items = [title, content, [block["text"] for block in code_blocks]]
+    if variant:
+        items.append(variant)
+    payload = json.dumps(items, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PageCache(JsonStateFile):
+    """
+    Persistenter Cache pro URL für die inkrementelle Neukonvertierung.
+    Speichert die HTTP-Validatoren (ETag, Last-Modified), den Hash der
+    extrahierten Inhalte und das erzeugte Markdown. Das Markdown liegt in
+    einzelnen Dateien, der Index in index.json. Überschreitet der Cache
+    max_bytes, werden die am längsten nicht genutzten Einträge entfernt.
+    """
+
+    save_interval = SAVE_INTERVAL
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.state_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._dirty = 0
+        os.makedirs(directory, exist_ok=True)
+        self._stats = {"hits": 0, "misses": 0, "bytes_saved": 0, "evictions": 0}
+        # In Reihenfolge der letzten Nutzung: der älteste Eintrag steht vorn
+        entries = read_json_state(self.state_path).get("entries", {})
+        self._entries = OrderedDict(sorted(entries.items(), key=lambda item: item[1]["last_access"]))
+        self._total_bytes = sum(entry["size"] for entry in self._entries.values())
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def _markdown_path(self, key):
+        return os.path.join(self.directory, f"{key}.md")
+
+    def entry(self, url):
+        """Gibt den Index-Eintrag einer URL zurück (ohne Statistik zu verändern)."""
+        with self._lock:
+            entry = self._entries.get(self._key(url))
+            return dict(entry) if entry else None
+
+    def conditional_headers(self, url):
+        """Header für einen bedingten GET, sofern der Eintrag aus dem statischen Abruf stammt."""
+        entry = self.entry(url)
+        headers = {}
+        if entry and entry.get("source") == "static":
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def reuse(self, url):
+        """
+        Gibt (Titel, Markdown-Text) aus dem Cache zurück und zählt einen Treffer.
+        Gibt None zurück, wenn kein verwendbarer Eintrag existiert.
+        """
+        key = self._key(url)
+        try:
+            with open(self._markdown_path(key), "r", encoding="utf-8") as f:
+                markdown_text = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += entry["size"]
+            self._mark_dirty()
+            return entry.get("title", ""), markdown_text
+
+    def store(self, url, title, markdown_text, snapshot_digest, source, etag=None, last_modified=None):
+        """Speichert ein neu erzeugtes Ergebnis und zählt einen Fehltreffer."""
+        key = self._key(url)
+        data = markdown_text.encode("utf-8")
+        tmp_path = f"{self._markdown_path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._markdown_path(key))
+        with self._lock:
+            old = self._entries.get(key)
+            if old:
+                self._total_bytes -= old["size"]
+            self._entries[key] = {
+                "url": url,
+                "title": title,
+                "etag": etag,
+                "last_modified": last_modified,
+                "snapshot_hash": snapshot_digest,
+                "source": source,
+                "size": len(data),
+                "fetched": time.time(),
+                "last_access": time.time(),
+            }
+            self._entries.move_to_end(key)
+            self._total_bytes += len(data)
+            self._stats["misses"] += 1
+            self._evict()
+            self._mark_dirty()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            try:
+                os.remove(self._markdown_path(key))
+            except OSError:
+                pass
+            self._total_bytes -= entry["size"]
+            self._stats["evictions"] += 1
+
+    def _state(self):
+        return {"entries": self._entries}
+
+    def stats(self):
+        """Liefert Treffer, Fehltreffer und eingesparte Bytes dieses Laufs sowie die Cache-Größe."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["size_bytes"] = self._total_bytes
+            return stats
@@ -0,0 +1,140 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from html_markdown_gui_3 import CODE_SELECTORS, CONTENT_SELECTORS, INTERACTIVE_SELECTORS
+from json_state import JsonStateFile, read_json_state
+
+# Selektorlisten je Art: Hauptinhalt, Code-Blöcke, Klick-Elemente
+SELECTOR_KINDS = {
+    "content": CONTENT_SELECTORS,
+    "code": CODE_SELECTORS,
+    "click": INTERACTIVE_SELECTORS,
+}
+# Nach so vielen Änderungen wird die Profildatei zwischendurch gespeichert
+SAVE_INTERVAL = 20
+
+
+class PageSelectors:
+    """
+    Die Selektoren für eine einzelne Seite und was davon tatsächlich gewirkt hat.
+    content, code und click sind die zu verwendenden Listen. Die Extraktions-
+    und Klickfunktionen melden über observe(), welche Selektoren getroffen
+    haben (Hauptinhalt gefunden, Code-Blöcke geliefert, neuer Inhalt nach Klick).
+    learned enthält die Arten, für die ein gelerntes Profil verwendet wird;
+    verify markiert eine Prüfseite, die trotz Profil alle Selektoren verwendet.
+    """
+
+    def __init__(self, content=None, code=None, click=None, learned=(), verify=False):
+        self.content = list(CONTENT_SELECTORS if content is None else content)
+        self.code = list(CODE_SELECTORS if code is None else code)
+        self.click = list(INTERACTIVE_SELECTORS if click is None else click)
+        self.learned = set(learned)
+        self.verify = verify
+        self.observed = {}
+
+    def observe(self, kind, matched):
+        """Merkt die wirksamen Selektoren einer Art; mehrere Aufrufe werden zusammengeführt."""
+        self.observed.setdefault(kind, set()).update(selector for selector in matched if selector)
+
+
+def domain_of(url):
+    return (urlparse(url).hostname or "").lower()
+
+
+class SelectorProfiles(JsonStateFile):
+    """
+    Lernt pro Domain, welche der Inhalts-, Code- und Klick-Selektoren auf der
+    Website tatsächlich wirken, und speichert das in einer JSON-Datei.
+    Die ersten learn_pages Seiten einer Domain verwenden alle Selektoren; danach
+    nur noch die bewährten; solange ein Selektortyp nie getroffen hat, bleiben
+    alle Selektoren dieses Typs aktiv. Findet keiner der gelernten Inhalts-Selektoren mehr
+    etwas, wird das Profil sofort verworfen und neu gelernt. Jede verify_every-te
+    Seite ist eine Prüfseite mit allen Selektoren; treffen dort Code- oder
+    Klick-Selektoren, die das Profil nicht kennt, wird es ebenfalls neu gelernt.
+    """
+
+    save_interval = SAVE_INTERVAL
+    state_indent = 1
+
+    def __init__(self, path, learn_pages=3, verify_every=25):
+        self.state_path = path
+        self.learn_pages = learn_pages
+        self.verify_every = verify_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._stats = {"learned_pages": 0, "profiled_pages": 0, "verified_pages": 0, "relearned": 0}
+        self._profiles = read_json_state(path).get("domains", {})
+
+    def _ready(self, profile, kind):
+        return profile.get(kind, {}).get("pages", 0) >= self.learn_pages
+
+    def selectors(self, url):
+        """Die PageSelectors für url: gelernte Listen, sofern die Domain ausreichend bekannt ist."""
+        with self._lock:
+            profile = self._profiles.get(domain_of(url), {})
+            ready = [kind for kind in SELECTOR_KINDS if self._ready(profile, kind)]
+            if ready and self.verify_every and profile["pages"] % self.verify_every == self.verify_every - 1:
+                return PageSelectors(verify=True)
+            lists, learned = {}, []
+            for kind in ready:
+                defaults = SELECTOR_KINDS[kind]
+                hits = profile[kind]["hits"]
+                useful = [selector for selector in defaults if selector in hits]
+                if not useful:
+                    continue  # Noch kein Treffer dieser Art: weiter alle Selektoren verwenden
+                if kind == "content":
+                    # Bewährte Selektoren zuerst, die übrigen nur, falls diese nichts mehr finden
+                    useful += [selector for selector in defaults if selector not in hits]
+                lists[kind] = useful
+                learned.append(kind)
+            return PageSelectors(learned=learned, **lists)
+
+    def record(self, url, selectors):
+        """Übernimmt die Beobachtungen einer verarbeiteten Seite in das Profil ihrer Domain."""
+        domain = domain_of(url)
+        with self._lock:
+            profile = self._profiles.setdefault(domain, {"pages": 0})
+            profile["pages"] += 1
+            if selectors.learned:
+                self._stats["profiled_pages"] += 1
+            elif selectors.verify:
+                self._stats["verified_pages"] += 1
+            else:
+                self._stats["learned_pages"] += 1
+            if self._mismatch(profile, selectors):
+                self._relearn(domain)
+                return
+            for kind, matched in selectors.observed.items():
+                if kind in selectors.learned:
+                    continue
+                entry = profile.setdefault(kind, {"pages": 0, "hits": {}})
+                entry["pages"] += 1
+                for selector in matched:
+                    entry["hits"][selector] = entry["hits"].get(selector, 0) + 1
+            profile["updated"] = time.time()
+            self._mark_dirty()
+
+    def _mismatch(self, profile, selectors):
+        """Prüft, ob das gelernte Profil auf dieser Seite nicht mehr gepasst hat."""
+        checked = SELECTOR_KINDS if selectors.verify else ("content",) if "content" in selectors.learned else ()
+        for kind in checked:
+            matched = selectors.observed.get(kind)
+            if matched and self._ready(profile, kind) and matched - profile[kind]["hits"].keys():
+                return True  # Ein Selektor außerhalb des Profils hat getroffen
+        return False
+
+    def _relearn(self, domain):
+        del self._profiles[domain]
+        self._stats["relearned"] += 1
+        self._mark_dirty()
+
+    def _state(self):
+        return {"domains": self._profiles}
+
+    def stats(self):
+        """Lern-, Profil- und Prüfseiten, Neulernvorgänge und bekannte Domains."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["domains"] = len(self._profiles)
+        return stats
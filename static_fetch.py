@@ -0,0 +1,277 @@
+import html as html_lib
+import re
+import threading
+import tkinter as tk
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from bs4.dammit import EncodingDetector
+from bs4.element import NavigableString, PreformattedString
+
+import metrics
+from dom_markdown import convert_html, render_markdown_document_chunks
+from page_cache import snapshot_hash
+from html_markdown_gui_3 import (
+    CODE_SELECTORS,
+    CONTENT_SELECTORS,
+    MarkdownDocument,
+    check_modes,
+    deduplicate_code_blocks,
+    detect_languages,
+    identify_sections,
+    render_markdown_chunks,
+)
+
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+# Ab dieser Textlänge gilt ein statisches Ergebnis als brauchbar
+MIN_STATIC_TEXT_LENGTH = 200
+# Unterhalb dieser Länge deuten typische SPA-Marker auf eine reine JS-Hülle hin
+SHELL_SUSPECT_TEXT_LENGTH = 1500
+JS_SHELL_MARKERS = [
+    re.compile(r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.IGNORECASE),
+    re.compile(r'<noscript[^>]*>[^<]*(?:enable|aktivieren)[^<]*javascript', re.IGNORECASE),
+    re.compile(r'<noscript[^>]*>[^<]*javascript[^<]*(?:enable|aktivieren)', re.IGNORECASE),
+]
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "head", "svg"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5",
+    "h6", "header", "hr", "li", "main", "nav", "ol", "p", "section", "summary",
+    "table", "tr", "ul",
+}
+_LINK_PATTERN = re.compile(r'<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_BASE_PATTERN = re.compile(r'<base\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_BLOCK_END = object()
+_WHITESPACE = re.compile(r'[ \t\r\f\v\n]+')
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size=16):
+    """
+    Gibt die gemeinsame HTTP-Session zurück. Sie hält Verbindungen pro Host
+    offen (Keep-Alive), sodass Folgeanfragen ohne neuen TCP/TLS-Aufbau laufen.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"})
+            _session = session
+        return _session
+
+
+def fetch_static(url, timeout=15, headers=None):
+    """
+    Lädt eine Seite ohne Browser und gibt den Response zurück.
+    Bei bedingten Anfragen (headers) kann der Status 304 zurückkommen.
+    """
+    response = get_http_session().get(url, timeout=timeout, headers=headers)
+    response.raise_for_status()
+    if response.status_code == 304:
+        return response
+    content_type = response.headers.get("Content-Type", "")
+    if "html" not in content_type.lower():
+        raise Exception(f"Kein HTML-Dokument ({content_type or 'unbekannter Typ'}).")
+    return response
+
+
+def _is_hidden(tag):
+    if tag.has_attr("hidden") or tag.get("aria-hidden") == "true":
+        return True
+    style = tag.get("style", "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def element_text(element):
+    """
+    Liefert den sichtbaren Text eines Elements ähnlich wie innerText im Browser:
+    Block-Elemente beginnen eine neue Zeile, <pre> behält seine Umbrüche.
+    """
+    parts = []
+    stack = [element]
+    while stack:
+        node = stack.pop()
+        if node is _BLOCK_END:
+            parts.append("\n")
+            continue
+        if isinstance(node, NavigableString):
+            if not isinstance(node, PreformattedString):
+                parts.append(_WHITESPACE.sub(" ", str(node)))
+            continue
+        if node.name in SKIP_TAGS or _is_hidden(node):
+            continue
+        if node.name == "br":
+            parts.append("\n")
+            continue
+        if node.name == "pre":
+            parts.append("\n" + node.get_text() + "\n")
+            continue
+        if node.name in BLOCK_TAGS:
+            parts.append("\n")
+            stack.append(_BLOCK_END)
+        stack.extend(reversed(node.contents))
+
+    lines = []
+    for line in "".join(parts).split("\n"):
+        line = line.strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def extract_from_html(html, output_widget, selectors=None):
+    """
+    Entspricht extract_content_with_code_blocks, arbeitet aber auf statischem HTML.
+    Gibt (Titel, Hauptinhalt, Code-Blöcke) zurück.
+    """
+    if selectors is None:
+        content_selectors, code_selectors = CONTENT_SELECTORS, CODE_SELECTORS
+    else:
+        content_selectors, code_selectors = selectors.content, selectors.code
+    soup = BeautifulSoup(html, "html.parser")
+
+    title = soup.title.get_text().strip() if soup.title else ""
+    title = title or "Extrahierter Inhalt"
+    output_widget.insert(tk.END, f"Seitentitel: {title}\n")
+
+    main_content = ""
+    content_selector = None
+    for selector in content_selectors:
+        elems = soup.select(selector)
+        if elems:
+            content_selector = selector
+            main_content = "".join(element_text(elem) + "\n\n" for elem in elems)
+            output_widget.insert(tk.END, f"Hauptinhalt mit Selector '{selector}' gefunden.\n")
+            break
+    if not main_content.strip():
+        main_content = element_text(soup.body) if soup.body else ""
+        output_widget.insert(tk.END, "Kein spezifischer Hauptinhalt gefunden – Body-Text verwendet.\n")
+
+    positions = {id(tag): index for index, tag in enumerate(soup.find_all(True))}
+    raw_blocks = []
+    for selector in code_selectors:
+        for elem in soup.select(selector):
+            if _is_hidden(elem):
+                continue
+            text = elem.get_text().strip()
+            if text:
+                position = positions.get(id(elem))
+                raw_blocks.append({"text": text, "position": position, "selector": selector,
+                                   "end": position + len(elem.find_all(True))})
+    code_blocks = deduplicate_code_blocks(raw_blocks)
+    languages = detect_languages([block["text"] for block in code_blocks])
+    for block, language in zip(code_blocks, languages):
+        block["language"] = language
+    output_widget.insert(tk.END, f"Insgesamt {len(code_blocks)} Code-Blöcke extrahiert "
+                                 f"({len(raw_blocks) - len(code_blocks)} Duplikate entfernt).\n")
+    if selectors is not None:
+        selectors.observe("content", [content_selector])
+        selectors.observe("code", [block["selector"] for block in code_blocks])
+    return title, main_content, code_blocks
+
+
+def extract_links(html, base_url):
+    """Liefert die absoluten Ziele aller <a href>-Verweise eines HTML-Dokuments."""
+    base = _BASE_PATTERN.search(html)
+    if base:
+        base_url = urljoin(base_url, html_lib.unescape(base.group(1)))
+    links = []
+    for match in _LINK_PATTERN.finditer(html):
+        href = html_lib.unescape(next(group for group in match.groups() if group is not None)).strip()
+        if href and not href.lower().startswith(("javascript:", "mailto:", "tel:", "data:")):
+            links.append(urljoin(base_url, href))
+    return links
+
+
+def looks_like_js_shell(html, content):
+    """Erkennt leere Ergebnisse und Seiten, die ihren Inhalt erst per JavaScript rendern."""
+    text_length = len(content.strip())
+    if text_length < MIN_STATIC_TEXT_LENGTH:
+        return True
+    if text_length < SHELL_SUSPECT_TEXT_LENGTH:
+        return any(marker.search(html) for marker in JS_SHELL_MARKERS)
+    return False
+
+
+def convert_static(url, output_widget, timeout=15, cache=None, links=None, converter="dom", profiles=None):
+    """
+    Konvertiert eine Seite ohne Browser. Gibt (Titel, MarkdownDocument) zurück
+    oder None, wenn das Ergebnis leer ist oder nach einer JS-Hülle aussieht
+    und die Seite daher über Selenium geladen werden sollte.
+    Mit einem PageCache wird bedingt abgerufen (ETag/Last-Modified); bei 304
+    oder unverändertem Inhalts-Hash wird das gespeicherte Markdown verwendet.
+    Ist links eine Liste, werden die absoluten Ziele aller Verweise angehängt.
+    converter wählt die Umwandlung in Markdown (siehe CONVERTERS).
+    """
+    check_modes(converter=converter)
+    output_widget.insert(tk.END, f"Lade Seite statisch: {url}\n")
+    headers = cache.conditional_headers(url) if cache is not None else None
+    with metrics.span("fetch"):
+        response = fetch_static(url, timeout=timeout, headers=headers)
+    metrics.count("http_requests")
+    if response.status_code == 304:
+        cached = cache.reuse(url)
+        if cached is not None:
+            output_widget.insert(tk.END, "Seite nicht geändert (304) – Ergebnis aus dem Cache übernommen.\n")
+            return cached[0], MarkdownDocument.from_text(cached[1])
+        with metrics.span("fetch"):
+            response = fetch_static(url, timeout=timeout)
+        metrics.count("http_requests")
+    metrics.count("bytes_fetched", len(response.content))
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        html = response.text
+    else:
+        encoding = EncodingDetector.find_declared_encoding(response.content, is_html=True) or "utf-8"
+        html = response.content.decode(encoding, errors="replace")
+    if links is not None:
+        links.extend(extract_links(html, response.url))
+
+    selectors = profiles.selectors(url) if profiles is not None else None
+    with metrics.span("extract"):
+        if converter == "dom":
+            title, content, headings = convert_html(html, response.url, selectors)
+            code_blocks = []
+        else:
+            title, content, code_blocks = extract_from_html(html, output_widget, selectors)
+    if looks_like_js_shell(html, content):
+        output_widget.insert(tk.END, "Statisches Ergebnis ist leer oder eine JS-Hülle – Browser wird benötigt.\n")
+        return None
+    if profiles is not None:
+        profiles.record(url, selectors)
+
+    digest = None
+    if cache is not None:
+        digest = snapshot_hash(title, content, code_blocks, variant=converter if converter != "text" else None)
+        entry = cache.entry(url)
+        if entry and entry.get("snapshot_hash") == digest:
+            cached = cache.reuse(url)
+            if cached is not None:
+                output_widget.insert(tk.END, "Inhalt unverändert – Ergebnis aus dem Cache übernommen.\n")
+                return cached[0], MarkdownDocument.from_text(cached[1])
+
+    if converter == "dom":
+        document = MarkdownDocument(render_markdown_document_chunks, title, content, headings)
+        output_widget.insert(tk.END, f"{len(headings)} Überschriften übernommen.\n")
+    else:
+        metrics.count("code_blocks", len(code_blocks))
+        with metrics.span("render"):
+            sections = identify_sections(content)
+        document = MarkdownDocument(render_markdown_chunks, title, content, code_blocks, sections)
+        output_widget.insert(tk.END, f"{len(sections)} Abschnitte identifiziert.\n")
+    if cache is not None:
+        with metrics.span("render"):
+            markdown_text = document.text()  # Der Cache speichert das fertige Markdown
+        cache.store(url, title, markdown_text, digest, source="static",
+                    etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+        document = MarkdownDocument.from_text(markdown_text)
+    return title, document
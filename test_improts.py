@@ -35,6 +35,12 @@ try:
 except ImportError:
     print("❌ beautifulsoup4 nicht gefunden")
 
+try:
+    import lxml.html
+    print("✅ lxml importiert")
+except ImportError:
+    print("❌ lxml nicht gefunden")
+
 try:
     from PIL import Image, ImageTk
     print("✅ Pillow (PIL) importiert")
@@ -53,6 +59,12 @@ try:
 except ImportError as e:
     print(f"❌ selenium Fehler: {e}")
 
+try:
+    import psutil
+    print("✅ psutil importiert")
+except ImportError:
+    print("❌ psutil nicht gefunden (Speicherobergrenze und Beenden hängender Browser im Batch-Betrieb)")
+
 try:
     from webdriver_manager.chrome import ChromeDriverManager
     print("✅ webdriver-manager importiert")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Die Module liegen flach im Projektverzeichnis, die Benchmark-Hilfen unter benchmarks/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,104 @@
+import argparse
+
+import pytest
+import requests
+
+from batch_runner import add_conversion_arguments, convert_url, run_batch, url_to_filename
+from crawler import Crawler
+from html_markdown_gui_3 import ConsoleOutput, MarkdownDocument
+from run_benchmarks import serve_directory
+
+
+def test_filenames_are_readable():
+    name = url_to_filename("https://docs.example.test/guide/install?lang=de")
+    assert name.startswith("docs.example.test_guide_install_lang_de_")
+    assert name.endswith(".md")
+
+
+def test_similar_urls_get_distinct_filenames():
+    urls = [
+        "https://x.org/docs/page",
+        "https://x.org/docs/page/",
+        "https://x.org/docs/page?a=1",
+        "https://x.org/docs/page_a=1",
+        "https://x.org/" + "a" * 200 + "/eins",
+        "https://x.org/" + "a" * 200 + "/zwei",
+    ]
+    names = [url_to_filename(url) for url in urls]
+    assert len(set(names)) == len(urls)
+    assert all(len(name) < 180 for name in names)
+    assert url_to_filename(urls[0]) == names[0]
+
+
+class RecordingBrowser:
+    def __init__(self):
+        self.urls = []
+
+    def run(self, url, work, output):
+        self.urls.append(url)
+        return ("Browser", MarkdownDocument.from_text("# Browser\n")), []
+
+
+class RecordingCollector:
+    def __init__(self):
+        self.pages = []
+
+    def add(self, page_metrics):
+        self.pages.append(page_metrics)
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "shell.html").write_text('<html><body><div id="root"></div></body></html>', encoding="utf-8")
+    (tmp_path / "daten.bin").write_bytes(b"\x00\x01\x02")
+    (tmp_path / "seite.html").write_text("<html><body><main><h1>Seite</h1>" + "<p>Ein Absatz mit Text.</p>" * 20
+                                         + "</main></body></html>", encoding="utf-8")
+    server, base_url = serve_directory(str(tmp_path))
+    yield base_url
+    server.shutdown()
+
+
+def test_http_errors_and_non_html_fail_without_browser(site):
+    browser = RecordingBrowser()
+    output = ConsoleOutput(verbose=False)
+    with pytest.raises(requests.HTTPError):
+        convert_url(f"{site}/fehlt.html", output, browser)
+    with pytest.raises(Exception, match="Kein HTML"):
+        convert_url(f"{site}/daten.bin", output, browser)
+    assert browser.urls == []
+
+
+def test_js_shell_falls_back_to_browser(site):
+    browser = RecordingBrowser()
+    title, _, static = convert_url(f"{site}/shell.html", ConsoleOutput(verbose=False), browser)
+    assert (title, static) == ("Browser", False)
+    assert browser.urls == [f"{site}/shell.html"]
+
+
+def test_batch_streams_documents_into_files(site, tmp_path):
+    url = f"{site}/seite.html"
+    collector = RecordingCollector()
+    result = run_batch([url], str(tmp_path / "out"), workers=1, fetch_mode="static", collector=collector)
+    assert result["failed"] == []
+    path = result["succeeded"][0][1]
+    expected = convert_url(url, ConsoleOutput(verbose=False), None, "static")[1].text()
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == expected
+    assert collector.pages[0].counters["bytes_written"] == len(expected.encode("utf-8"))
+
+
+def test_modes_are_checked_in_one_place():
+    with pytest.raises(ValueError, match="Unbekannter Konverter: html"):
+        run_batch(["https://example.test/"], "unbenutzt", converter="html")
+    with pytest.raises(ValueError, match="Unbekanntes Ladeprofil: schnell"):
+        Crawler("https://example.test/", "unbenutzt", load_profile="schnell")
+    with pytest.raises(ValueError, match="Unbekannter Abrufmodus: ftp"):
+        convert_url("https://example.test/", ConsoleOutput(verbose=False), None, "ftp")
+
+
+def test_both_clis_share_the_conversion_options():
+    parser = argparse.ArgumentParser()
+    add_conversion_arguments(parser)
+    args = parser.parse_args(["-m", "static", "-x", "click", "-c", "text", "--block", "*ads*", "--store", "x.db"])
+    assert (args.fetch_mode, args.load_profile, args.expansion, args.converter) == ("static", "full", "click", "text")
+    assert (args.block, args.store, args.selector_profiles) == (["*ads*"], "x.db", None)
@@ -0,0 +1,20 @@
+from run_benchmarks import compare
+
+
+def result(render_s, lines_per_sec):
+    return {"micro": {"huge": {"create_markdown_document_s": render_s, "render_lines_per_sec": lines_per_sec}}}
+
+
+def test_speedup_is_not_a_regression():
+    assert compare(result(0.5, 20000.0), result(1.0, 10000.0), 0.2) == []
+
+
+def test_slowdown_is_reported_for_durations_and_throughput():
+    regressions = compare(result(2.0, 5000.0), result(1.0, 10000.0), 0.2)
+    assert len(regressions) == 2
+    assert any("create_markdown_document_s" in line and "+100%" in line for line in regressions)
+    assert any("render_lines_per_sec" in line and "-50%" in line for line in regressions)
+
+
+def test_changes_within_tolerance_pass():
+    assert compare(result(1.1, 9500.0), result(1.0, 10000.0), 0.2) == []
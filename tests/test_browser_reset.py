@@ -0,0 +1,111 @@
+import os
+import sys
+import types
+
+import pytest
+
+import html_markdown_gui_3 as app
+
+
+class ResetDriver:
+    """Zeichnet die Aufrufe von reset_browser auf."""
+
+    def __init__(self, handles=("main",), origin="https://example.com", failing=()):
+        self.window_handles = list(handles)
+        self.origin = origin
+        self.failing = set(failing)
+        self.calls = []
+        self.switch_to = types.SimpleNamespace(window=lambda handle: self.calls.append(("switch", handle)))
+
+    def close(self):
+        self.calls.append(("close",))
+
+    def execute_script(self, script):
+        return self.origin
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append(("cdp", cmd, params.get("origin")))
+        if params.get("origin") in self.failing:
+            raise RuntimeError("CDP nicht verfügbar")
+
+
+def cdp_calls(driver):
+    return [call[1:] for call in driver.calls if call[0] == "cdp"]
+
+
+def test_reset_closes_extra_tabs_and_clears_storage():
+    driver = ResetDriver(handles=("main", "popup"))
+    app.reset_browser(driver)
+    assert driver.calls[:4] == [("switch", "popup"), ("close",), ("switch", "main"), ("get", "about:blank")]
+    assert cdp_calls(driver) == [
+        ("Network.clearBrowserCookies", None),
+        ("Storage.clearDataForOrigin", "*"),
+        ("Storage.clearDataForOrigin", "https://example.com"),
+    ]
+
+
+@pytest.mark.parametrize("origin", [None, "", "null"])
+def test_reset_skips_opaque_last_origin(origin):
+    driver = ResetDriver(origin=origin)
+    app.reset_browser(driver)
+    assert cdp_calls(driver)[1:] == [("Storage.clearDataForOrigin", "*")]
+
+
+def test_reset_ignores_failing_storage_cleanup():
+    driver = ResetDriver(failing={"*"})
+    app.reset_browser(driver)
+    assert cdp_calls(driver)[-1] == ("Storage.clearDataForOrigin", "https://example.com")
+
+
+@pytest.fixture
+def driver_manager(tmp_path, monkeypatch):
+    """Ersetzt webdriver-manager und die Cache-Datei; zählt die Installationen."""
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    installs = []
+
+    class ChromeDriverManager:
+        def install(self):
+            installs.append(True)
+            return str(binary)
+
+    module = types.ModuleType("webdriver_manager.chrome")
+    module.ChromeDriverManager = ChromeDriverManager
+    monkeypatch.setitem(sys.modules, "webdriver_manager", types.ModuleType("webdriver_manager"))
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", module)
+    monkeypatch.setattr(app, "CHROMEDRIVER_CACHE_FILE", str(tmp_path / "cache" / "chromedriver_path"))
+    monkeypatch.setattr(app, "_chromedriver_path", None)
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    return binary, installs
+
+
+def test_chromedriver_path_is_resolved_once_and_persisted(driver_manager, monkeypatch):
+    binary, installs = driver_manager
+    assert app.resolve_chromedriver_path() == str(binary)
+    assert app.resolve_chromedriver_path() == str(binary)
+    assert len(installs) == 1
+    # Ein neuer Prozess liest den Pfad aus der Cache-Datei
+    monkeypatch.setattr(app, "_chromedriver_path", None)
+    assert app.resolve_chromedriver_path() == str(binary)
+    assert len(installs) == 1
+    app.resolve_chromedriver_path(refresh=True)
+    assert len(installs) == 2
+
+
+def test_stale_cached_chromedriver_path_is_reinstalled(driver_manager):
+    binary, installs = driver_manager
+    os.makedirs(os.path.dirname(app.CHROMEDRIVER_CACHE_FILE))
+    with open(app.CHROMEDRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+        f.write(str(binary) + ".fehlt")
+    assert app.resolve_chromedriver_path() == str(binary)
+    assert len(installs) == 1
+
+
+def test_chromedriver_path_override(driver_manager, monkeypatch):
+    _, installs = driver_manager
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/chromedriver")
+    assert app.resolve_chromedriver_path() == "/opt/chromedriver"
+    assert installs == []
@@ -0,0 +1,30 @@
+from html_markdown_gui_3 import ConsoleOutput, deduplicate_code_blocks
+from static_fetch import extract_from_html
+
+
+def block(text, position=None, end=None):
+    result = {"text": text, "language": ""}
+    if position is not None:
+        result.update(position=position, end=end if end is not None else position)
+    return result
+
+
+def test_nested_matches_are_dropped_in_document_order():
+    blocks = [block("inner", 3, 3), block("zweiter", 10, 12), block("outer", 2, 4), block("danach", 5)]
+    assert [b["text"] for b in deduplicate_code_blocks(blocks)] == ["outer", "danach", "zweiter"]
+
+
+def test_repeated_content_is_dropped_ignoring_whitespace():
+    blocks = [block("a = 1\n  b = 2", 1), block("a = 1 b = 2", 5), block("ohne Position"), block("ohne  Position")]
+    unique = deduplicate_code_blocks(blocks)
+    assert [b["text"] for b in unique] == ["a = 1\n  b = 2", "ohne Position"]
+    assert unique[0] is not blocks[0]
+
+
+def test_static_extraction_reports_each_snippet_once():
+    html = ("<html><body><article><p>Beispiel</p>"
+            '<pre class="hljs"><code class="language-python">print(1)</code></pre>'
+            "<p>Noch einmal</p><pre><code>print(1)</code></pre>"
+            "<pre><code>SELECT 1;</code></pre></article></body></html>")
+    _, _, code_blocks = extract_from_html(html, ConsoleOutput(verbose=False))
+    assert [b["text"] for b in code_blocks] == ["print(1)", "SELECT 1;"]
@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+
+import crawler
+from crawler import Crawler, HostPoliteness, normalize_url
+from html_markdown_gui_3 import MarkdownDocument
+from output_store import OutputStore
+
+SITE = {
+    "http://example.test/": ["/a", "/b"],
+    "http://example.test/a": ["/"],
+    "http://example.test/b": ["/a"],
+}
+
+
+def fake_convert_url(url, output, browser, fetch_mode="auto", cache=None, links=None, **kwargs):
+    links.extend(SITE[url])
+    return f"Titel {url}", MarkdownDocument.from_text(f"# {url}\n"), True
+
+
+class FailingStore:
+    def __init__(self, failing_url):
+        self.failing_url = failing_url
+        self.pages = {}
+
+    def store(self, url, title, markdown_text):
+        if url == self.failing_url:
+            raise OSError("Datenträger voll")
+        self.pages[url] = markdown_text
+
+    def flush(self):
+        pass
+
+
+def run_crawl(crawl, timeout=10):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(crawl.run(resume=False)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "Crawl hängt"
+    return result
+
+
+def test_write_error_marks_page_failed_instead_of_hanging(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawler, "convert_url", fake_convert_url)
+    store = FailingStore("http://example.test/b")
+    crawl = Crawler("http://example.test/", str(tmp_path), workers=2, politeness=HostPoliteness(2, 0), store=store)
+    summary = run_crawl(crawl)
+    assert summary["done"] == 2
+    assert summary["failed"] == 1
+    assert "Datenträger voll" in crawl._failed["http://example.test/b"]
+    assert not crawl._in_flight
+
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.TEST:80/a?b=2&a=1&utm_source=x#frag") == "http://example.test/a?a=1&b=2"
+    assert normalize_url("https://example.test:8443") == "https://example.test:8443/"
+    assert normalize_url("https://example.test/?fbclid=1") == "https://example.test/"
+
+
+def test_pages_recorded_as_done_are_committed_to_the_store(tmp_path, monkeypatch):
+    # Kette von 60 Seiten; bei jedem Abruf wird geprüft, dass der auf der Platte
+    # festgehaltene Zustand nur Seiten enthält, die bereits in der Datenbank stehen.
+    site = {f"http://example.test/{i}": [f"/{i + 1}"] if i < 59 else [] for i in range(60)}
+    output_dir = str(tmp_path / "crawl")
+    database = str(tmp_path / "pages.db")
+    checks = []
+
+    def durable_done_pages():
+        resumed = Crawler("http://example.test/0", output_dir)
+        if not resumed.load_state():
+            return set()
+        return set(resumed._done)
+
+    def convert(url, output, browser, fetch_mode="auto", cache=None, links=None, **kwargs):
+        done = durable_done_pages()
+        with sqlite3.connect(database) as conn:
+            stored = {row[0] for row in conn.execute("SELECT url FROM pages")}
+        checks.append(len(done))
+        assert done <= stored
+        links.extend(site[url])
+        return url, MarkdownDocument.from_text(f"# {url}\n"), True
+
+    monkeypatch.setattr(crawler, "convert_url", convert)
+    monkeypatch.setattr(crawler, "SAVE_INTERVAL", 5)
+    with OutputStore(database, batch_size=1000) as store:
+        crawl = Crawler("http://example.test/0", output_dir, workers=1, max_depth=100, politeness=HostPoliteness(1, 0),
+                        store=store)
+        assert run_crawl(crawl)["done"] == 60
+    assert max(checks) >= 50
+
+
+def test_progress_is_journaled_and_resumable(tmp_path, monkeypatch):
+    site = {f"http://example.test/{i}": [f"/{i + 1}"] if i < 19 else [] for i in range(20)}
+    output_dir = str(tmp_path)
+    snapshots = []
+
+    def convert(url, output, browser, fetch_mode="auto", cache=None, links=None, **kwargs):
+        if url == "http://example.test/12":
+            # Stand nach einem Absturz an dieser Stelle
+            with open(os.path.join(output_dir, crawler.STATE_FILE), encoding="utf-8") as f:
+                snapshots.append(f.read())
+            resumed = Crawler("http://example.test/0", output_dir)
+            assert resumed.load_state()
+            snapshots.append((set(resumed._done), list(resumed._frontier)))
+        links.extend(site[url])
+        return url, MarkdownDocument.from_text(f"# {url}\n"), True
+
+    monkeypatch.setattr(crawler, "convert_url", convert)
+    monkeypatch.setattr(crawler, "SAVE_INTERVAL", 5)
+    crawl = Crawler("http://example.test/0", output_dir, workers=1, max_depth=100, politeness=HostPoliteness(1, 0))
+    assert run_crawl(crawl)["done"] == 20
+    initial_state, (done, frontier) = snapshots
+    assert '"done": {}' in initial_state  # Während des Laufs nicht neu geschrieben
+    assert done == {f"http://example.test/{i}" for i in range(10)}
+    assert frontier == [("http://example.test/10", 10)]
+    assert not os.path.exists(crawl.journal_path)
+    resumed = Crawler("http://example.test/0", output_dir)
+    assert resumed.load_state() and len(resumed._done) == 20 and not resumed._frontier
+
+
+def test_failed_store_flush_keeps_pages_out_of_the_journal(tmp_path, monkeypatch):
+    class FlakyStore(FailingStore):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+            if self.flushes == 1:
+                raise OSError("Datenträger voll")
+
+    site = {f"http://example.test/{i}": [f"/{i + 1}"] if i < 11 else [] for i in range(12)}
+
+    def convert(url, output, browser, fetch_mode="auto", cache=None, links=None, **kwargs):
+        links.extend(site[url])
+        return url, MarkdownDocument.from_text(f"# {url}\n"), True
+
+    monkeypatch.setattr(crawler, "convert_url", convert)
+    monkeypatch.setattr(crawler, "SAVE_INTERVAL", 5)
+    store = FlakyStore(None)
+    crawl = Crawler("http://example.test/0", str(tmp_path), workers=1, max_depth=100,
+                    politeness=HostPoliteness(1, 0), store=store)
+    assert run_crawl(crawl)["done"] == 12
+    assert store.flushes >= 2
@@ -0,0 +1,39 @@
+from dom_markdown import convert_html, render_markdown_document, slugify
+
+
+def test_custom_elements_keep_their_block_structure():
+    html = ("<main><app-doc><h2>Install</h2><p>Run this:</p>"
+            "<pre><code>pip install x\npip install y</code></pre>"
+            "<ul><li>one</li><li>two</li></ul></app-doc></main>")
+    _, body, headings = convert_html(html)
+    assert body.split("\n\n") == ["## Install", "Run this:", "```\npip install x\npip install y\n```", "- one\n- two"]
+    assert headings == [(2, "Install", "install")]
+
+
+def test_links_around_sections_and_hgroup_are_walked():
+    html = ('<main><a href="/karte"><div><h3>Karte</h3><p>Text</p></div></a>'
+            "<hgroup><h1>Titel</h1><p>Untertitel</p></hgroup></main>")
+    _, body, _ = convert_html(html, "https://example.test/")
+    assert body.split("\n\n") == ["### Karte", "Text", "# Titel", "Untertitel"]
+
+
+def test_inline_elements_stay_in_the_paragraph():
+    html = '<main><p>Ein <span>kurzer <b>Satz</b></span> mit <a href="/x">Link</a> und <code>code</code>.</p></main>'
+    _, body, _ = convert_html(html, "https://example.test/doc/")
+    assert body == "Ein kurzer **Satz** mit [Link](https://example.test/x) und `code`."
+
+
+def test_hidden_elements_and_layout_tables_are_handled():
+    html = ('<main><p hidden>weg</p><div data-rm-hidden>auch weg</div>'
+            "<table><tr><td><h2>Layout</h2></td></tr></table>"
+            "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table></main>")
+    _, body, _ = convert_html(html)
+    assert body == "## Layout\n\n| A | B |\n| --- | --- |\n| 1 | 2 |"
+
+
+def test_document_gets_toc_from_three_headings():
+    _, body, headings = convert_html("<main><h1>A</h1><h2>B</h2><h2>B</h2></main>")
+    assert [anchor for _, _, anchor in headings] == ["a", "b", "b-1"]
+    document = render_markdown_document("Titel", body, headings)
+    assert "## Inhaltsverzeichnis\n\n- [A](#a)\n  - [B](#b)\n  - [B](#b-1)\n" in document
+    assert slugify("Hallo, Welt!") == "hallo-welt"
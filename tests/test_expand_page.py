@@ -0,0 +1,142 @@
+import json
+import types
+
+from selenium.common.exceptions import JavascriptException
+
+import html_markdown_gui_3 as app
+from page_cache import PageCache
+
+
+class NavigatingDriver:
+    """Zweite Aufklapp-Runde löst eine Navigation aus."""
+
+    def __init__(self, navigate=True):
+        self.current_url = "https://example.test/seite"
+        self.navigate = navigate
+        self.rounds = 0
+        self.went_back = False
+
+    def execute_script(self, script, *args):
+        if "innerHeight" in script:
+            return 800
+        return None
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        if "arguments[2]" in script:
+            self.rounds += 1
+            if self.rounds == 2:
+                if self.navigate:
+                    self.current_url = "https://example.test/danke"
+                raise JavascriptException("javascript error: document unloaded while waiting for result")
+            return {"expanded": 3, "grew": True, "bottom": 2000}
+        return True
+
+    def back(self):
+        self.went_back = True
+        self.current_url = "https://example.test/seite"
+
+
+def test_failed_round_stops_expansion_and_keeps_content(monkeypatch):
+    monkeypatch.setattr(app, "wait_for_page_load", lambda driver, timeout=30: True)
+    driver = NavigatingDriver()
+    assert app.expand_page(driver, app.ConsoleOutput(verbose=False)) == 3
+    assert driver.rounds == 2
+    assert driver.went_back
+
+
+def test_failed_round_without_navigation_stays_on_page():
+    driver = NavigatingDriver(navigate=False)
+    assert app.expand_page(driver, app.ConsoleOutput(verbose=False)) == 3
+    assert not driver.went_back
+
+
+def test_load_page_continues_after_page_load_timeout(monkeypatch):
+    from selenium.common.exceptions import TimeoutException
+
+    class SlowDriver:
+        scripts = []
+
+        def get(self, url):
+            raise TimeoutException("timeout: Timed out receiving message from renderer")
+
+        def execute_script(self, script, *args):
+            self.scripts.append(script)
+
+    monkeypatch.setattr(app, "wait_for_page_load", lambda driver: True)
+    driver = SlowDriver()
+    app.load_page(driver, "https://example.test/", app.ConsoleOutput(verbose=False))
+    assert driver.scripts == ["window.stop();"]
+
+
+class ClickableElement:
+    def __init__(self, index):
+        self.text = f"Mehr {index}"
+        self.location = {"x": 0, "y": index}
+
+    def is_displayed(self):
+        return True
+
+
+class ClickDriver:
+    def __init__(self):
+        self.clicks = 0
+
+    def execute_script(self, script, *args):
+        if "innerHeight" in script:
+            return 800
+        if "scrollHeight" in script:
+            return 800
+        if "click()" in script:
+            self.clicks += 1
+        return None
+
+    def find_elements(self, by, selector):
+        return [ClickableElement(i) for i in range(100)]
+
+
+def test_click_phase_stops_when_its_budget_is_spent(monkeypatch):
+    clock = [0.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    def wait_for_page_load(driver, timeout=30):
+        clock[0] += timeout
+
+    monkeypatch.setattr(app, "time", types.SimpleNamespace(monotonic=lambda: clock[0], sleep=sleep))
+    monkeypatch.setattr(app, "wait_for_page_load", wait_for_page_load)
+    driver = ClickDriver()
+    app.click_interactive_elements(driver, app.ConsoleOutput(verbose=False), budget=60)
+    assert driver.clicks == 10  # je 6 s pro Element
+    assert clock[0] <= 60 + 6 + 1
+
+
+def test_click_mode_deadline_stays_within_minutes():
+    assert app.page_time_bound("click") < 10 * 60
+
+
+class LateContentDriver:
+    """Liefert erst nach dem Aufklappen Text."""
+
+    current_url = "https://example.test/seite"
+
+    def __init__(self):
+        self.expanded = False
+
+    def execute_script(self, script, *args):
+        text = "Text, der erst nach dem Aufklappen erscheint." if self.expanded else ""
+        return json.dumps({"title": "Seite", "content": text, "bodyText": text, "codeBlocks": []})
+
+
+def test_empty_page_before_expansion_is_a_cache_miss(tmp_path, monkeypatch):
+    driver = LateContentDriver()
+    monkeypatch.setattr(app, "expand_page", lambda driver, output: setattr(driver, "expanded", True))
+    cache = PageCache(str(tmp_path))
+    title, document = app.convert_loaded_page(driver, app.ConsoleOutput(verbose=False), cache=cache,
+                                              url=driver.current_url, converter="text")
+    assert title == "Seite"
+    assert "erst nach dem Aufklappen" in document.text()
+    assert cache.entry(driver.current_url)["snapshot_hash"] is None
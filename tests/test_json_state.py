@@ -0,0 +1,59 @@
+import os
+import threading
+
+import page_cache
+import selector_profiles
+from json_state import JsonStateFile, read_json_state
+from page_cache import PageCache
+from selector_profiles import PageSelectors, SelectorProfiles
+
+
+class Counter(JsonStateFile):
+    save_interval = 3
+
+    def __init__(self, path):
+        self.state_path = path
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.value = read_json_state(path).get("value", 0)
+
+    def increment(self):
+        with self._lock:
+            self.value += 1
+            self._mark_dirty()
+
+    def _state(self):
+        return {"value": self.value}
+
+
+def test_state_is_written_after_save_interval_changes(tmp_path):
+    path = str(tmp_path / "sub" / "state.json")
+    counter = Counter(path)
+    counter.increment()
+    counter.increment()
+    assert not os.path.exists(path)
+    counter.increment()
+    assert read_json_state(path) == {"value": 3}
+    counter.increment()
+    counter.save()
+    assert Counter(path).value == 4
+    assert os.listdir(tmp_path / "sub") == ["state.json"]
+
+
+def test_missing_or_broken_files_read_as_empty(tmp_path):
+    assert read_json_state(str(tmp_path / "fehlt.json")) == {}
+    broken = tmp_path / "kaputt.json"
+    broken.write_text("{nicht json", encoding="utf-8")
+    assert read_json_state(str(broken)) == {}
+
+
+def test_cache_and_profiles_use_their_own_intervals(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"))
+    for i in range(page_cache.SAVE_INTERVAL):
+        cache.store(f"https://example.test/{i}", "T", "# T\n", None, source="static")
+    assert len(read_json_state(cache.state_path)["entries"]) == page_cache.SAVE_INTERVAL
+
+    profiles = SelectorProfiles(str(tmp_path / "profile.json"))
+    for i in range(selector_profiles.SAVE_INTERVAL):
+        profiles.record(f"https://example.test/{i}", PageSelectors())
+    assert read_json_state(profiles.state_path)["domains"]["example.test"]["pages"] == selector_profiles.SAVE_INTERVAL
@@ -0,0 +1,57 @@
+import pytest
+
+import html_markdown_gui_3 as app
+
+
+@pytest.mark.parametrize("code, language", [
+    ("import os\n\ndef main():\n    return None\n", "python"),
+    ("class Foo(Base):\n    def run(self):\n        self.x = 1\n", "python"),
+    ("function add(a, b) {\n  console.log(a);\n  return a + b;\n}\n", "javascript"),
+    ("public class Main {\n  @Override\n  public String toString() { return \"\"; }\n}\n", "java"),
+    ("#include <iostream>\nint main() { std::cout << 1; }\n", "cpp"),
+    ("SELECT id, name FROM users WHERE active = 1;", "sql"),
+    (".header {\n  margin: 0;\n  padding: 4px;\n}\n", "css"),
+    ("<!DOCTYPE html>\n<html><body><div>x</div></body></html>", "html"),
+    ("version: '3.8'\nservices:\n  db:\n    image: postgres:15\n", "yaml"),
+])
+def test_common_languages(code, language):
+    assert app.detect_language(code) == language
+
+
+@pytest.mark.parametrize("code, language", [
+    ("import os", "python"),
+    ("from collections import OrderedDict\n", "python"),
+    ("import React from 'react';\nconst x = 1;\n", "javascript"),
+    ("import { useState } from 'react';", "javascript"),
+    ("import java.util.List;\n\npublic class Main {\n}\n", "java"),
+    ("class Foo(Base):\n    pass\n", "python"),
+    ("class Foo extends Bar {\n  constructor() { super(); }\n}\n", ""),
+])
+def test_ambiguous_import_and_class(code, language):
+    assert app.detect_language(code) == language
+
+
+@pytest.mark.parametrize("code", ["", "Das ist nur ein Satz ohne Code.", "reimport os", "x = 1"])
+def test_unknown_code_falls_back_to_empty(code):
+    assert app.detect_language(code) == ""
+
+
+def test_only_the_beginning_of_large_blocks_is_scanned():
+    filler = "x = 1\n" * (app.LANGUAGE_SCAN_LIMIT // 6 + 1)
+    assert app.detect_language(filler + "def f():\n    pass\n") == ""
+    assert app.detect_language("def f():\n    pass\n" + filler) == "python"
+
+
+def test_decisive_lead_stops_early():
+    javascript = "console.log(1);\n" * 10
+    assert app.detect_language(javascript + "def f(self):\n    self.x = None\n" * 20) == "javascript"
+
+
+def test_repeated_blocks_are_scored_once(monkeypatch):
+    app._language_cache.clear()
+    scored = []
+    score = app._score_language
+    monkeypatch.setattr(app, "_score_language", lambda text: scored.append(text) or score(text))
+    assert app.detect_languages(["import os", "SELECT 1 FROM t", "import os"]) == ["python", "sql", "python"]
+    assert app.detect_languages(["import os"]) == ["python"]
+    assert scored == ["import os", "SELECT 1 FROM t"]
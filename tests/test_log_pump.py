@@ -0,0 +1,119 @@
+import threading
+
+import html_markdown_gui_3 as app
+
+
+class FakeRoot:
+    """Ersatz für Tk: after() merkt sich den Rückruf, run() führt ihn aus."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, func):
+        self.callbacks.append(func)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for func in callbacks:
+            func()
+
+
+class FakeText:
+    """Minimaler Ersatz für tk.Text mit Zeilen-Indizes."""
+
+    def __init__(self):
+        self.text = ""
+        self.inserts = 0
+
+    def insert(self, index, text):
+        self.text += text
+        self.inserts += 1
+
+    def index(self, index):
+        return f"{self.text.count(chr(10)) + 1}.0"
+
+    def delete(self, start, end):
+        if end == app.tk.END:
+            self.text = ""
+        else:
+            drop = int(end.split(".")[0]) - 1
+            self.text = "\n".join(self.text.split("\n")[drop:])
+
+    def see(self, index):
+        pass
+
+
+def make_pump(**options):
+    root, text = FakeRoot(), FakeText()
+    bars = {"load": {"value": 0}}
+    pump = app.LogPump(root, text, bars, **options)
+    return pump, root, text, bars
+
+
+def test_messages_are_inserted_in_batches():
+    pump, root, text, _ = make_pump(batch_size=3)
+    output = pump.new_output()
+    for i in range(5):
+        output.insert(None, f"Zeile {i}\n")
+    root.run()
+    assert (text.text, text.inserts) == ("Zeile 0\nZeile 1\nZeile 2\n", 1)
+    root.run()
+    assert text.text.endswith("Zeile 4\n")
+    assert text.inserts == 2
+    assert len(root.callbacks) == 1  # der Pump plant sich selbst neu ein
+
+
+def test_scrollback_is_trimmed_to_max_lines():
+    pump, root, text, _ = make_pump(max_lines=10)
+    output = pump.new_output()
+    for i in range(25):
+        output.insert(None, f"Zeile {i}\n")
+    root.run()
+    lines = text.text.split("\n")
+    assert len(lines) == 10
+    assert lines[0] == "Zeile 16" and lines[-2] == "Zeile 24"
+
+
+def test_clear_progress_and_finished():
+    finished = []
+    pump, root, text, bars = make_pump(on_finished=lambda: finished.append(True))
+    output = pump.new_output()
+    output.insert(None, "alt\n")
+    output.delete(1.0, app.tk.END)
+    output.insert(None, "neu\n")
+    output.progress("load", 1, 4)
+    output.progress("unbekannt", 1)
+    output.finished()
+    root.run()
+    assert text.text == "neu\n"
+    assert bars["load"]["value"] == 25.0
+    assert finished == [True]
+
+
+def test_call_in_ui_runs_in_the_pump_thread_and_returns_the_result():
+    pump, root, _, _ = make_pump()
+    output = pump.new_output()
+    results = {}
+
+    def worker():
+        results["value"] = output.call_in_ui(lambda a, b=0: (threading.current_thread().name, a + b), 1, b=2)
+        try:
+            output.call_in_ui(lambda: 1 / 0)
+        except ZeroDivisionError as e:
+            results["error"] = e
+
+    thread = threading.Thread(target=worker, name="worker")
+    thread.start()
+    while thread.is_alive():
+        root.run()
+        thread.join(0.01)
+    assert results["value"] == (threading.current_thread().name, 3)
+    assert isinstance(results["error"], ZeroDivisionError)
+
+
+def test_cancel_is_visible_to_the_worker():
+    pump, _, _, _ = make_pump()
+    output = pump.new_output()
+    assert not output.cancelled
+    output.cancel()
+    assert output.cancelled
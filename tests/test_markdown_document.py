@@ -0,0 +1,140 @@
+import random
+import re
+
+import html_markdown_gui_3 as app
+
+
+def reference_markdown_document(title, content, code_blocks, sections):
+    """Die frühere Implementierung von create_markdown_document (vor dem Streaming-Renderer)."""
+    markdown = "Hier findest du das vollständige Proof-of-Concept als Markdown-Dokument mit korrekt eingerücktem Code:\n\n"
+    markdown += "---\n\n"
+    markdown += f"# {title}\n\n"
+
+    description_lines = []
+    for line in content.split('\n')[:10]:
+        line = line.strip()
+        if line and len(line) > 20:
+            description_lines.append(line)
+            if len(description_lines) >= 3:
+                break
+    if description_lines:
+        markdown += " ".join(description_lines) + "\n\n"
+    markdown += "---\n\n"
+
+    if len(sections) >= 3:
+        markdown += "## Inhaltsverzeichnis\n\n"
+        for idx, (_, sec_title) in enumerate(sections):
+            clean_title = sec_title.rstrip(':')
+            anchor = re.sub(r'[^a-z0-9\-]', '', clean_title.lower().replace(' ', '-'))
+            markdown += f"{idx + 1}. [{clean_title}](#{anchor})\n"
+        markdown += "\n---\n\n"
+
+    processed_lines = []
+    lines = content.split('\n')
+    in_code = False
+    code_start = None
+    for i, line in enumerate(lines):
+        if any(i == idx for idx, _ in sections):
+            for idx, sec in sections:
+                if i == idx:
+                    processed_lines.append(f"## {sec.rstrip(':')}")
+                    processed_lines.append("")
+                    break
+            continue
+        if "click to open code" in line.lower():
+            processed_lines.append("<<<CODE_BLOCK_PLACEHOLDER>>>")
+            continue
+        if not in_code and (line.strip().startswith("def ") or
+                            line.strip().startswith("import ") or
+                            line.strip().startswith("class ")):
+            in_code = True
+            code_start = i
+            continue
+        elif in_code:
+            if not line.strip():
+                in_code = False
+                code_text = "\n".join(lines[code_start:i])
+                language = app.detect_language(code_text)
+                processed_lines.append(f"```{language}")
+                processed_lines.append(code_text)
+                processed_lines.append("```")
+                processed_lines.append("")
+                continue
+        processed_lines.append(line)
+
+    final_lines = []
+    code_idx = 0
+    for line in processed_lines:
+        if line.strip() == "<<<CODE_BLOCK_PLACEHOLDER>>>":
+            if code_idx < len(code_blocks):
+                code_text = code_blocks[code_idx]["text"]
+                language = code_blocks[code_idx]["language"]
+                final_lines.append(f"```{language}")
+                final_lines.append(code_text)
+                final_lines.append("```")
+                final_lines.append("")
+                code_idx += 1
+            else:
+                final_lines.append("`Kein Code gefunden`")
+        else:
+            final_lines.append(line)
+
+    markdown += "\n".join(final_lines)
+
+    for idx in range(code_idx, len(code_blocks)):
+        code_text = code_blocks[idx]["text"]
+        language = code_blocks[idx]["language"]
+        markdown += f"\n\n```{language}\n{code_text}\n```"
+
+    markdown += "\n\n---"
+    markdown = re.sub(r'\n{4,}', '\n\n\n', markdown)
+    return markdown
+
+
+LINES = ["", "", " ", "Kurz", "Ein ausreichend langer Satz für die Beschreibung.",
+         "def main():", "    return 1", "import os", "  class Foo:", "x = 1",
+         "Click to open code", "<<<CODE_BLOCK_PLACEHOLDER>>>", "Abschnitt:", "\t"]
+CODE_TEXTS = ["print(1)", "a\n\n\n\nb", "", "\n", "SELECT 1;\n\n"]
+
+
+def random_case(rng):
+    content = "\n".join(rng.choice(LINES) for _ in range(rng.randint(0, 30)))
+    line_count = content.count("\n") + 1
+    sections = [(rng.randrange(line_count + 2), rng.choice(["Intro", "Setup:", "A b c", "Ü"]))
+                for _ in range(rng.randint(0, 5))]
+    code_blocks = [{"text": rng.choice(CODE_TEXTS), "language": rng.choice(["", "python", "sql"])}
+                   for _ in range(rng.randint(0, 4))]
+    return rng.choice(["Titel", ""]), content, code_blocks, sections
+
+
+def test_renderer_matches_previous_implementation():
+    rng = random.Random(6)
+    for _ in range(20000):
+        case = random_case(rng)
+        assert app.create_markdown_document(*case) == reference_markdown_document(*case), case
+
+
+def test_written_file_matches_document(tmp_path):
+    rng = random.Random(7)
+    for i in range(50):
+        case = random_case(rng)
+        path = tmp_path / f"{i}.md"
+        document = app.MarkdownDocument(app.render_markdown_chunks, *case)
+        written = document.write(str(path))
+        expected = app.create_markdown_document(*case)
+        assert path.read_text(encoding="utf-8") == document.text() == expected
+        assert written == len(expected.encode("utf-8"))
+
+
+def test_preview_renders_only_the_beginning():
+    rendered = []
+
+    def render(count):
+        for i in range(count):
+            rendered.append(i)
+            yield "x" * 100
+
+    document = app.MarkdownDocument(render, 1000)
+    assert document.preview(250) == "x" * 250 + "\n...(gekürzt)"
+    assert len(rendered) == 3
+    assert app.MarkdownDocument.from_text("kurz").preview(250) == "kurz"
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+import metrics
+
+
+def record(url, spans, counters, error=None):
+    page = metrics.PageMetrics(url)
+    for name, seconds in spans.items():
+        page.add_span(name, seconds)
+    for name, value in counters.items():
+        page.count(name, value)
+    page.finish(error)
+    return page
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = metrics.MetricsCollector(str(tmp_path / "metrics.jsonl"))
+    collector.add(record("https://a", {"navigate": 0.5, "render": 0.25}, {"webdriver_calls": 3}))
+    collector.add(record("https://b", {"navigate": 1.0}, {"webdriver_calls": 4, "bytes_written": 100},
+                         error="Timeout"))
+    yield collector
+    collector.close()
+
+
+def test_prometheus_text(collector):
+    lines = collector.to_prometheus().splitlines()
+    assert lines == [
+        "# HELP runasmart_pages_total Verarbeitete Seiten.",
+        "# TYPE runasmart_pages_total counter",
+        'runasmart_pages_total{result="ok"} 1',
+        'runasmart_pages_total{result="error"} 1',
+        "# HELP runasmart_phase_seconds Dauer der Verarbeitungsphasen.",
+        "# TYPE runasmart_phase_seconds summary",
+        'runasmart_phase_seconds_sum{phase="navigate"} 1.500000',
+        'runasmart_phase_seconds_count{phase="navigate"} 2',
+        'runasmart_phase_seconds_sum{phase="render"} 0.250000',
+        'runasmart_phase_seconds_count{phase="render"} 1',
+        "# TYPE runasmart_bytes_written_total counter",
+        "runasmart_bytes_written_total 100",
+        "# TYPE runasmart_webdriver_calls_total counter",
+        "runasmart_webdriver_calls_total 7",
+    ]
+
+
+def test_prometheus_file_and_json_lines(collector, tmp_path):
+    collector.write_prometheus(str(tmp_path / "metrics.prom"))
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == collector.to_prometheus()
+    collector.close()
+    rows = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [row["url"] for row in rows] == ["https://a", "https://b"]
+    assert rows[1]["counters"] == {"webdriver_calls": 4, "bytes_written": 100}
+    assert rows[1]["error"] == "Timeout"
+
+
+def test_page_metrics_collects_spans_counts_and_errors():
+    with metrics.page_metrics("https://a") as page:
+        with metrics.span("render"):
+            metrics.count("code_blocks", 2)
+        metrics.count("code_blocks")
+    assert page.counters == {"code_blocks": 3}
+    assert set(page.spans) == {"render"} and page.total is not None
+    with pytest.raises(ValueError):
+        with metrics.page_metrics("https://b") as failed:
+            raise ValueError("kaputt")
+    assert failed.error == "kaputt"
+    assert metrics.current() is None
+    metrics.count("code_blocks")  # ohne aktive Messung wirkungslos
+
+
+def test_instrument_driver_counts_webdriver_commands():
+    class Driver:
+        def execute(self, driver_command, params=None):
+            return {"value": driver_command}
+
+    driver = metrics.instrument_driver(Driver())
+    assert metrics.instrument_driver(driver) is driver
+    with metrics.page_metrics("https://a") as page:
+        assert driver.execute("getTitle") == {"value": "getTitle"}
+        driver.execute("findElement", {"using": "css selector"})
+    driver.execute("getTitle")
+    assert page.counters == {"webdriver_calls": 2}
@@ -0,0 +1,108 @@
+import os
+import sqlite3
+
+import pytest
+
+import output_store
+from output_store import OutputStore, extract_code_blocks
+
+DOC_A = "# A\n\nText über Installation.\n\n```python\nprint(1)\n```\n"
+DOC_B = "# B\n\nAnderer Inhalt.\n\n  ```sql\n  SELECT 1;\n  ```\n"
+
+
+def document_count(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def test_pages_are_buffered_until_the_batch_is_full(tmp_path):
+    path = str(tmp_path / "pages.db")
+    with OutputStore(path, batch_size=3) as store:
+        store.store("https://example.test/1", "A", DOC_A)
+        store.store("https://example.test/2", "A", DOC_A)
+        assert document_count(path) == 0
+        store.store("https://example.test/3", "B", DOC_B)
+        assert document_count(path) == 2
+    with OutputStore(path) as store:
+        assert store.get("https://example.test/2") == ("A", DOC_A)
+        assert store.get("https://example.test/4") is None
+
+
+def test_identical_documents_are_stored_once_and_replaced_documents_dropped(tmp_path):
+    with OutputStore(str(tmp_path / "pages.db")) as store:
+        store.store("https://example.test/1", "A", DOC_A)
+        store.store("https://example.test/2", "A", DOC_A)
+        store.store("https://example.test/3", "B", DOC_B)
+        assert store.stats()["pages"] == 3
+        assert store.stats()["documents"] == 2
+        store.store("https://example.test/3", "A", DOC_A)
+        stats = store.stats()
+        assert (stats["pages"], stats["documents"]) == (3, 1)
+        assert stats["markdown_bytes"] == len(DOC_A.encode("utf-8"))
+
+
+def test_code_blocks_are_extracted():
+    assert extract_code_blocks(DOC_A + DOC_B) == [
+        {"language": "python", "text": "print(1)"}, {"language": "sql", "text": "SELECT 1;"}]
+
+
+def test_code_blocks_per_url(tmp_path):
+    with OutputStore(str(tmp_path / "pages.db")) as store:
+        store.store("https://example.test/b", "B", DOC_B)
+        assert store.code_blocks("https://example.test/b") == [{"language": "sql", "text": "SELECT 1;"}]
+        assert store.code_blocks("https://example.test/x") == []
+
+
+def test_full_text_search_follows_replacements(tmp_path):
+    with OutputStore(str(tmp_path / "pages.db")) as store:
+        if not store.full_text:
+            pytest.skip("SQLite ohne FTS5")
+        store.store("https://example.test/1", "A", DOC_A)
+        store.store("https://example.test/2", "B", DOC_B)
+        assert [row[:2] for row in store.search("Installation")] == [("https://example.test/1", "A")]
+        store.store("https://example.test/1", "B", DOC_B)
+        assert store.search("Installation") == []
+        assert sorted(row[0] for row in store.search("Inhalt")) == ["https://example.test/1", "https://example.test/2"]
+
+
+def test_export_writes_one_file_per_url(tmp_path):
+    with OutputStore(str(tmp_path / "pages.db")) as store:
+        store.store("https://example.test/a?x=1", "A", DOC_A)
+        store.store("https://example.test/a?x=2", "B", DOC_B)
+        assert store.export(str(tmp_path / "export")) == 2
+    files = sorted(os.listdir(tmp_path / "export"))
+    assert len(files) == 2
+    contents = {(tmp_path / "export" / name).read_text(encoding="utf-8") for name in files}
+    assert contents == {DOC_A, DOC_B}
+
+
+def test_cli_reports_stats(tmp_path, capsys):
+    path = str(tmp_path / "pages.db")
+    with OutputStore(path) as store:
+        store.store("https://example.test/1", "A", DOC_A)
+    assert output_store.main([path, "stats"]) == 0
+    assert "Seiten:      1" in capsys.readouterr().out
+    assert output_store.main([str(tmp_path / "fehlt.db"), "stats"]) == 1
+
+
+def test_failed_flush_keeps_the_batch(tmp_path, monkeypatch):
+    path = str(tmp_path / "pages.db")
+    with OutputStore(path, batch_size=100) as store:
+        store.store("https://example.test/1", "A", DOC_A)
+        store.store("https://example.test/2", "B", DOC_B)
+        write = store._write
+        calls = []
+
+        def failing_write(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise sqlite3.OperationalError("database or disk is full")
+            write(*args)
+
+        monkeypatch.setattr(store, "_write", failing_write)
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+        assert document_count(path) == 0
+        monkeypatch.setattr(store, "_write", write)
+        store.flush()
+        assert store.stats()["pages"] == 2
@@ -0,0 +1,106 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import page_cache
+from html_markdown_gui_3 import ConsoleOutput
+from page_cache import PageCache, snapshot_hash
+from static_fetch import convert_static
+
+PAGE = "<html><head><title>Seite</title></head><body><main><h1>Seite</h1><p>{}</p>" + "<p>Weiterer Text.</p>" * 20 + "</main></body></html>"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def test_store_and_reuse(tmp_path):
+    cache = PageCache(str(tmp_path))
+    assert cache.reuse("https://example.test/") is None
+    cache.store("https://example.test/", "Titel", "# Text\n", "abc", source="static", etag='"1"',
+                last_modified="Sun, 18 Oct 2026 08:00:00 GMT")
+    assert cache.reuse("https://example.test/") == ("Titel", "# Text\n")
+    assert cache.conditional_headers("https://example.test/") == {
+        "If-None-Match": '"1"', "If-Modified-Since": "Sun, 18 Oct 2026 08:00:00 GMT"}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bytes_saved"], stats["entries"]) == (1, 1, 7, 1)
+
+
+def test_browser_results_are_not_fetched_conditionally(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store("https://example.test/", "Titel", "# Text\n", "abc", source="browser", etag='"1"')
+    assert cache.conditional_headers("https://example.test/") == {}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(page_cache.time, "time", lambda: next(clock))
+    cache = PageCache(str(tmp_path), max_bytes=25)
+    for name in "abc":
+        cache.store(f"https://example.test/{name}", name, "x" * 10, None, source="static")
+    assert cache.reuse("https://example.test/a") is None
+    assert cache.reuse("https://example.test/b") == ("b", "x" * 10)
+    cache.store("https://example.test/d", "d", "x" * 10, None, source="static")
+    assert cache.entry("https://example.test/c") is None
+    assert cache.entry("https://example.test/b") is not None
+    assert cache.stats()["evictions"] == 2
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".md")]) == 2
+
+
+def test_access_order_survives_restart(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(page_cache.time, "time", lambda: next(clock))
+    cache = PageCache(str(tmp_path), max_bytes=30)
+    for name in "abc":
+        cache.store(f"https://example.test/{name}", name, "x" * 10, None, source="static")
+    cache.reuse("https://example.test/a")
+    cache.save()
+    reloaded = PageCache(str(tmp_path), max_bytes=30)
+    reloaded.store("https://example.test/d", "d", "x" * 10, None, source="static")
+    assert reloaded.entry("https://example.test/b") is None
+    assert reloaded.entry("https://example.test/a") is not None
+
+
+def test_index_survives_restart(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store("https://example.test/", "Titel", "# Text\n", "abc", source="static")
+    cache.save()
+    reloaded = PageCache(str(tmp_path))
+    assert reloaded.entry("https://example.test/")["snapshot_hash"] == "abc"
+    assert reloaded.stats()["size_bytes"] == 7
+
+
+def test_snapshot_hash_depends_on_content_only():
+    blocks = [{"text": "print(1)", "language": "python"}]
+    digest = snapshot_hash("T", "Inhalt", blocks)
+    assert digest == snapshot_hash("T", "Inhalt", [{"text": "print(1)", "language": ""}])
+    assert digest != snapshot_hash("T", "Anderer Inhalt", blocks)
+
+
+def test_unchanged_page_is_served_from_the_cache(tmp_path, capsys):
+    site = tmp_path / "site"
+    site.mkdir()
+    page = site / "seite.html"
+    page.write_text(PAGE.format("Erste Fassung eines ausreichend langen Absatzes."), encoding="utf-8")
+    cache = PageCache(str(tmp_path / "cache"))
+    output = ConsoleOutput()
+    handler = functools.partial(QuietHandler, directory=str(site))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/seite.html"
+        first = convert_static(url, output, cache=cache)
+        assert first is not None
+        assert convert_static(url, output, cache=cache)[1].text() == first[1].text()
+        assert "(304)" in capsys.readouterr().out  # If-Modified-Since
+        assert cache.stats()["hits"] == 1
+        page.write_text(PAGE.format("Zweite Fassung eines ausreichend langen Absatzes."), encoding="utf-8")
+        stat = page.stat()
+        os.utime(page, (stat.st_atime, stat.st_mtime + 10))
+        second = convert_static(url, output, cache=cache)
+        assert "Zweite Fassung" in second[1].text()
+        assert cache.stats()["misses"] == 2
+    finally:
+        server.shutdown()
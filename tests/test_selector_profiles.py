@@ -0,0 +1,66 @@
+from html_markdown_gui_3 import CODE_SELECTORS, CONTENT_SELECTORS, ConsoleOutput
+from selector_profiles import SelectorProfiles
+from static_fetch import extract_from_html
+
+URL = "https://docs.example.test/seite"
+PLAIN_PAGE = "<html><body><article><p>Nur Text, kein Code.</p></article></body></html>"
+CODE_PAGE = "<html><body><article><p>Beispiel:</p><pre>pip install x</pre></article></body></html>"
+MAIN_PAGE = "<html><body><main><p>Andere Vorlage</p></main></body></html>"
+
+
+def convert(profiles, html, url=URL):
+    selectors = profiles.selectors(url)
+    _, _, code_blocks = extract_from_html(html, ConsoleOutput(verbose=False), selectors)
+    profiles.record(url, selectors)
+    return selectors, code_blocks
+
+
+def test_learns_content_and_code_selectors(tmp_path):
+    profiles = SelectorProfiles(str(tmp_path / "profile.json"))
+    for _ in range(3):
+        convert(profiles, CODE_PAGE)
+    selectors, code_blocks = convert(profiles, CODE_PAGE)
+    assert selectors.learned == {"content", "code"}
+    assert selectors.content[0] == "article"
+    assert sorted(selectors.content) == sorted(CONTENT_SELECTORS)
+    assert selectors.code == ["pre"]
+    assert [block["text"] for block in code_blocks] == ["pip install x"]
+
+
+def test_pages_without_code_do_not_learn_an_empty_code_list(tmp_path):
+    profiles = SelectorProfiles(str(tmp_path / "profile.json"))
+    for _ in range(3):
+        convert(profiles, PLAIN_PAGE)
+    selectors, code_blocks = convert(profiles, CODE_PAGE)
+    assert "code" not in selectors.learned
+    assert selectors.code == CODE_SELECTORS
+    assert [block["text"] for block in code_blocks] == ["pip install x"]
+
+
+def test_content_miss_triggers_relearning(tmp_path):
+    profiles = SelectorProfiles(str(tmp_path / "profile.json"))
+    for _ in range(3):
+        convert(profiles, PLAIN_PAGE)
+    convert(profiles, MAIN_PAGE)
+    assert profiles.stats()["relearned"] == 1
+    assert profiles.selectors(URL).learned == set()
+
+
+def test_verification_page_relearns_unknown_code_selector(tmp_path):
+    profiles = SelectorProfiles(str(tmp_path / "profile.json"), verify_every=5)
+    for _ in range(4):
+        convert(profiles, CODE_PAGE)
+    verified, _ = convert(profiles, '<article><div class="hljs">print(1)</div></article>')
+    assert verified.verify
+    assert profiles.stats()["relearned"] == 1
+
+
+def test_profiles_are_persisted_per_domain(tmp_path):
+    path = str(tmp_path / "profile.json")
+    profiles = SelectorProfiles(path)
+    for _ in range(3):
+        convert(profiles, CODE_PAGE)
+    profiles.save()
+    reloaded = SelectorProfiles(path)
+    assert reloaded.selectors(URL).learned == {"content", "code"}
+    assert reloaded.selectors("https://other.example.test/").learned == set()
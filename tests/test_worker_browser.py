@@ -0,0 +1,150 @@
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+import batch_runner
+import html_markdown_gui_3 as app
+from batch_runner import PageDeadlineExceeded, WorkerBrowser
+
+
+class FakeDriver:
+    """Ein Driver, hinter dem ein echter (schlafender) Prozess steht."""
+
+    def __init__(self):
+        self.process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        self.service = types.SimpleNamespace(process=self.process)
+
+    def alive(self):
+        return self.process.poll() is None
+
+    @property
+    def current_url(self):
+        if not self.alive():
+            raise ConnectionRefusedError("chromedriver beendet")
+        return "about:blank"
+
+    def quit(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class FakeWorkerBrowser(WorkerBrowser):
+    def __init__(self, **options):
+        super().__init__(backoff=0.01, **options)
+        self.started = []
+
+    def get(self):
+        with self._lock:
+            if self.driver is None or not self.driver.alive():
+                self.driver = FakeDriver()
+                self.started.append(self.driver)
+            return self.driver
+
+    def _quit(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+@pytest.fixture
+def output():
+    return app.ConsoleOutput(verbose=False)
+
+
+def test_stuck_page_is_killed_and_retried_with_a_fresh_browser(output):
+    browser = FakeWorkerBrowser(page_deadline=0.3)
+    attempts = []
+
+    def work(driver):
+        attempts.append(driver)
+        if len(attempts) == 1:
+            while driver.alive():  # hängt, bis die Zeitgrenze den Browser beendet
+                time.sleep(0.02)
+            raise ConnectionError("Verbindung abgelehnt")
+        return "ok"
+
+    try:
+        assert browser.run("https://example.test/", work, output) == "ok"
+        assert len(browser.started) == 2
+        assert not attempts[0].alive()
+    finally:
+        browser.quit()
+
+
+def test_deadline_error_after_last_retry(output):
+    browser = FakeWorkerBrowser(page_deadline=0.2, retries=0)
+
+    def work(driver):
+        while driver.alive():
+            time.sleep(0.02)
+        raise ConnectionError("Verbindung abgelehnt")
+
+    try:
+        with pytest.raises(PageDeadlineExceeded):
+            browser.run("https://example.test/", work, output)
+    finally:
+        browser.quit()
+
+
+def test_content_errors_fail_without_retry(output):
+    browser = FakeWorkerBrowser(page_deadline=5)
+    attempts = []
+
+    def work(driver):
+        attempts.append(driver)
+        raise Exception("Kein Textinhalt gefunden.")
+
+    try:
+        with pytest.raises(Exception, match="Kein Textinhalt"):
+            browser.run("https://example.test/", work, output)
+        assert len(attempts) == 1
+        assert len(browser.started) == 1
+    finally:
+        browser.quit()
+
+
+def test_webdriver_errors_are_retried(output):
+    from selenium.common.exceptions import WebDriverException
+
+    browser = FakeWorkerBrowser(page_deadline=5)
+    attempts = []
+
+    def work(driver):
+        attempts.append(driver)
+        if len(attempts) == 1:
+            raise WebDriverException("unknown error: session deleted because of page crash")
+        return "ok"
+
+    try:
+        assert browser.run("https://example.test/", work, output) == "ok"
+        assert len(browser.started) == 2
+    finally:
+        browser.quit()
+
+
+def test_browser_is_recycled_after_max_pages(output):
+    browser = FakeWorkerBrowser(max_pages=2, max_rss_mb=0)
+    try:
+        for _ in range(5):
+            browser.run("https://example.test/", lambda driver: None, output)
+        assert len(browser.started) == 3
+    finally:
+        browser.quit()
+
+
+def test_default_deadline_covers_the_phase_bounds():
+    for expansion in app.EXPANSION_MODES:
+        deadline = WorkerBrowser(expansion=expansion).page_deadline
+        assert deadline > app.page_time_bound(expansion)
+    # load_page: 30 s Laden, je 15 s jQuery und body, 10 s DOM-Ruhe; expand_page: 10 Runden
+    assert WorkerBrowser().page_deadline >= 30 + 70 + 10 * 15
+
+
+def test_missing_psutil_is_reported(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    assert batch_runner.warn_without_psutil() is False
+    assert "psutil" in capsys.readouterr().out
+    assert app.browser_rss(FakeDriver) is None